@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Click Audit Log
+An append-only record of every fired click: clicker id, scheduled and
+actual time, coordinates, backend latency and the number of clicks sent.
+
+The click path only appends a tuple to a deque. A writer thread drains
+it every FLUSH_INTERVAL_S (or sooner once BATCH records are waiting) and
+writes each batch with a single write() call. The log is split into
+numbered segments, rotated by size and/or age; older segments are never
+rewritten:
+
+    clicks.clkaud -> clicks.000001.clkaud, clicks.000002.clkaud, ...
+
+Segments are compact fixed-width binary records behind a small header
+(like sequence files), or JSON lines with format="jsonl". Times are on
+the engine's clock (time.monotonic_ns); each segment's header also holds
+the wall-clock time it was opened at, to map them to dates.
+"""
+
+import collections
+import glob
+import json
+import os
+import re
+import struct
+import threading
+import time
+
+MAGIC = b"CLKAUD"
+VERSION = 1
+EXTENSION = ".clkaud"
+FORMATS = ("binary", "jsonl")
+# never: leave it to the OS; rotate: when a segment is closed; batch: after every write
+FSYNC_POLICIES = ("never", "rotate", "batch")
+# magic, version, header size, record size, wall-clock ns and engine-clock ns at open
+HEADER = struct.Struct("<6sHHHqq")
+# scheduled ns, actual ns, backend latency ns, x, y, clicker id, clicks
+RECORD = struct.Struct("<qqqiiHH")
+FIELDS = ("scheduled_ns", "actual_ns", "latency_ns", "x", "y", "clicker", "clicks")
+# x/y of a click at wherever the pointer was (not looked up on the click path)
+NO_POSITION = -2 ** 31
+
+# Writer wake-up period and the queue length that wakes it early
+FLUSH_INTERVAL_S = 0.25
+BATCH = 4096
+
+
+class AuditFormatError(ValueError):
+    """Raised when a file is not a readable audit log segment."""
+
+
+def segment_path(path, number):
+    """Path of segment `number` of the log at path."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{number:06d}{ext or EXTENSION}"
+
+
+def _segments(path):
+    """(number, path) of each existing segment of the log at path, oldest first."""
+    stem, ext = os.path.splitext(path)
+    ext = ext or EXTENSION
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r"\.(\d{6})" + re.escape(ext) + "$")
+    found = []
+    for candidate in glob.glob(glob.escape(stem) + ".*" + glob.escape(ext)):
+        match = pattern.match(os.path.basename(candidate))
+        if match:
+            found.append((int(match.group(1)), candidate))
+    return sorted(found)
+
+
+def segment_paths(path):
+    """Existing segments of the log at path, oldest first."""
+    return [candidate for _, candidate in _segments(path)]
+
+
+class AuditLog:
+    """Buffered, rotating audit log of fired clicks.
+
+    record() may be called from any thread and never blocks or touches
+    the file. A segment is rotated before the batch that would take it
+    past max_bytes, or once it is max_age seconds old; keep limits how
+    many segments are left on disk. close() writes what is queued.
+    """
+
+    def __init__(self, path, format="binary", max_bytes=None, max_age=None, fsync="rotate", keep=None,
+                 flush_interval=FLUSH_INTERVAL_S, batch=BATCH, clock=time.monotonic_ns):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown audit format: {format!r} (choose from {', '.join(FORMATS)})")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync!r} (choose from {', '.join(FSYNC_POLICIES)})")
+        if (max_bytes is not None and max_bytes <= 0) or (max_age is not None and max_age <= 0):
+            raise ValueError("Audit rotation size and age must be greater than 0")
+        if keep is not None and keep < 1:
+            raise ValueError("Audit logs must keep at least one segment")
+        self.path = path
+        self.format = format
+        self.max_bytes = max_bytes
+        self.max_age_ns = None if max_age is None else int(max_age * 1e9)
+        self.fsync = fsync
+        self.keep = keep
+        self.flush_interval = flush_interval
+        self.batch = batch
+        self.clock = clock
+        self.records = 0
+        self.writes = 0
+        self.segments = 0
+        self.error = None
+        self._pending = collections.deque()
+        self._wake = threading.Event()
+        self._closing = False
+        # Continue after the newest existing segment; old ones are never reopened
+        existing = _segments(path)
+        self._number = existing[-1][0] if existing else 0
+        self._file = None
+        self._open_segment()
+        self._writer = threading.Thread(target=self._write_loop, name="click-audit", daemon=True)
+        self._writer.start()
+
+    def record(self, clicker, scheduled_ns, actual_ns, x, y, latency_ns, clicks=1):
+        """Queue one fired click (any thread); x/y None means the pointer's position."""
+        pending = self._pending
+        pending.append((scheduled_ns, actual_ns, latency_ns, NO_POSITION if x is None else x,
+                        NO_POSITION if y is None else y, clicker, clicks))
+        if len(pending) >= self.batch:
+            self._wake.set()
+
+    def _open_segment(self):
+        """Start the next segment and write its header."""
+        self._number += 1
+        self.segment = segment_path(self.path, self._number)
+        self._file = open(self.segment, "xb")
+        self._opened_ns = self.clock()
+        wall_ns = time.time_ns()
+        if self.format == "binary":
+            header = HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.size, wall_ns, self._opened_ns)
+        else:
+            header = json.dumps({"format": "clkaud", "version": VERSION, "wall_ns": wall_ns,
+                                 "clock_ns": self._opened_ns}).encode() + b"\n"
+        self._file.write(header)
+        self._size = self._header_size = len(header)
+        self.segments += 1
+        if self.keep is not None:
+            for old in segment_paths(self.path)[:-self.keep]:
+                os.remove(old)
+
+    def _close_segment(self):
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def _encode(self, records):
+        if self.format == "binary":
+            pack = RECORD.pack
+            return b"".join([pack(*r) for r in records])
+        lines = []
+        for scheduled_ns, actual_ns, latency_ns, x, y, clicker, clicks in records:
+            if x == NO_POSITION:
+                x = y = "null"
+            lines.append(f'{{"clicker":{clicker},"scheduled_ns":{scheduled_ns},"actual_ns":{actual_ns},'
+                         f'"x":{x},"y":{y},"latency_ns":{latency_ns},"clicks":{clicks}}}\n')
+        return "".join(lines).encode()
+
+    def _flush(self):
+        """Write everything queued as one batch (writer thread)."""
+        pending = self._pending
+        records = [pending.popleft() for _ in range(len(pending))]
+        if not records:
+            return
+        data = self._encode(records)
+        try:
+            age_ns = self.clock() - self._opened_ns
+            if self._size > self._header_size and (
+                    (self.max_bytes is not None and self._size + len(data) > self.max_bytes)
+                    or (self.max_age_ns is not None and age_ns >= self.max_age_ns)):
+                self._close_segment()
+                self._open_segment()
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync == "batch":
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            self.error = e
+            return
+        self._size += len(data)
+        self.records += len(records)
+        self.writes += 1
+
+    def _write_loop(self):
+        while not self._closing:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+    def close(self):
+        """Write the queued records and close the current segment (idempotent)."""
+        if self._closing:
+            return
+        self._closing = True
+        self._wake.set()
+        self._writer.join()
+        self._flush()
+        self._close_segment()
+
+    def stats(self):
+        """Records and batches written, segments opened and queue depth."""
+        return {"records": self.records, "writes": self.writes, "segments": self.segments,
+                "pending": len(self._pending), "error": None if self.error is None else str(self.error)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_audit_log(spec, clock=time.monotonic_ns):
+    """An AuditLog from a path or a config dict (path, format, max_bytes, max_age, fsync, keep)."""
+    if isinstance(spec, str):
+        spec = {"path": spec}
+    spec = dict(spec)
+    unknown = set(spec) - {"path", "format", "max_bytes", "max_age", "fsync", "keep"}
+    if unknown:
+        raise ValueError(f"Unknown audit setting(s): {', '.join(sorted(unknown))}")
+    if "path" not in spec:
+        raise ValueError("An audit log needs a path")
+    return AuditLog(clock=clock, **spec)
+
+
+def read_header(f):
+    """(format, header dict) of an open segment, leaving f at the first record."""
+    start = f.read(len(MAGIC))
+    if start == MAGIC:
+        rest = f.read(HEADER.size - len(MAGIC))
+        if len(rest) < HEADER.size - len(MAGIC):
+            raise AuditFormatError("truncated audit header")
+        _, version, header_size, record_size, wall_ns, clock_ns = HEADER.unpack(start + rest)
+        if version != VERSION or record_size != RECORD.size:
+            raise AuditFormatError(f"unsupported audit version {version}")
+        f.seek(header_size)
+        return "binary", {"wall_ns": wall_ns, "clock_ns": clock_ns}
+    try:
+        header = json.loads(start + f.readline())
+    except ValueError:
+        raise AuditFormatError("not a click audit log") from None
+    if not isinstance(header, dict) or header.get("format") != "clkaud":
+        raise AuditFormatError("not a click audit log")
+    return "jsonl", header
+
+
+def read_audit(path, block_records=BATCH):
+    """Stream the FIELDS tuples of one segment; a torn last record is ignored."""
+    with open(path, "rb") as f:
+        fmt, _ = read_header(f)
+        if fmt == "binary":
+            while True:
+                block = f.read(block_records * RECORD.size)
+                usable = len(block) - len(block) % RECORD.size
+                yield from RECORD.iter_unpack(memoryview(block)[:usable])
+                if len(block) < block_records * RECORD.size:
+                    return
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                return  # torn last line
+            x = NO_POSITION if obj["x"] is None else obj["x"]
+            y = NO_POSITION if obj["y"] is None else obj["y"]
+            yield obj["scheduled_ns"], obj["actual_ns"], obj["latency_ns"], x, y, obj["clicker"], obj["clicks"]
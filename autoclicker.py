@@ -2,40 +2,87 @@
 """
 Simple Autoclicker for Ubuntu
 A terminal-based autoclicker with primary and optional secondary clickers.
-Uses F1 to toggle primary clicker and F2 to toggle secondary clicker.
+Uses F1 to toggle primary clicker and F2 to toggle secondary clicker
+(rebindable with --hotkeys).
+
+With --headless it takes its clickers from arguments or a JSON config file,
+starts clicking immediately without prompts or hotkeys, and runs until
+SIGINT/SIGTERM (suitable for systemd). Headless mode never imports tkinter
+or pynput.
 """
 
 import time
+PROCESS_START_NS = time.monotonic_ns()
+
+import argparse
+import json
+import secrets
+import signal
+import sys
 import threading
-from pynput import keyboard
-import pyautogui
+from audit_log import build_audit_log
+from bursts import parse_burst
+from click_backends import BACKENDS, create_backend
+from clicker_engine import FLAG_HIGH_RATE, MODE_FIXED, MODE_TRACK, ClickerEngine
+from control import ControlServer, Controller
+from high_rate import RateMeter, is_high_rate, parse_interval, parse_offset, parse_rate
+from hotkeys import HotkeyMap, load_bindings
+from jitter import build_jitter
+from scheduler import ClickScheduler, VirtualClock, seconds_to_ns
+from triggers import build_trigger
+
+# Headless mode warns when the first click takes longer than this after start
+FIRST_CLICK_BUDGET_MS = 250
 
-# Configure pyautogui
-pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.01
+# pynput.keyboard, imported by the interactive mode only
+keyboard = None
+
+# Clicker ids in the interactive engine table
+PRIMARY, SECONDARY = 0, 1
+
+# Interactive hotkeys; --hotkeys FILE replaces them
+DEFAULT_HOTKEYS = {"f1": "toggle_clicker:0", "f2": "toggle_clicker:1"}
 
 # Global variables
-first_clicker_active = False
-second_clicker_active = False
-start_time = None
 mouse_x, mouse_y = 0, 0
 primary_interval = 0
 secondary_interval = None
+high_rate = False
+rate_meter = None
+engine = None
+backend = None
 
 def get_user_input():
     """Collect user input for intervals and secondary clicker preference."""
-    global primary_interval, secondary_interval
+    global primary_interval, secondary_interval, high_rate
     
     print("=== Simple Autoclicker for Ubuntu ===")
-    print("Press F1 to toggle primary clicker, F2 to toggle secondary clicker")
     print("Move mouse to top-left corner to stop the application")
     print()
     
+    # High-rate mode replaces the minutes/seconds prompts with a click rate
+    while True:
+        choice = input("Enable high-rate mode? (y/n): ").lower().strip()
+        if choice in ['y', 'yes']:
+            while True:
+                try:
+                    primary_interval = parse_rate(input("Enter clicks per second (e.g. 500 or 2ms): "))
+                    break
+                except ValueError as e:
+                    print(e)
+            high_rate = True
+            secondary_interval = None
+            return
+        elif choice in ['n', 'no']:
+            break
+        else:
+            print("Please enter 'y' or 'n'.")
+    
     # Get primary clicker interval
     while True:
         try:
             minutes = int(input("Enter minutes for primary clicker: "))
-            seconds = int(input("Enter seconds for primary clicker: "))
+            seconds = float(input("Enter seconds for primary clicker: "))
             if minutes < 0 or seconds < 0:
                 print("Please enter non-negative numbers.")
                 continue
@@ -54,7 +101,7 @@ def get_user_input():
             while True:
                 try:
                     minutes = int(input("Enter minutes for secondary clicker: "))
-                    seconds = int(input("Enter seconds for secondary clicker: "))
+                    seconds = float(input("Enter seconds for secondary clicker: "))
                     if minutes < 0 or seconds < 0:
                         print("Please enter non-negative numbers.")
                         continue
@@ -72,106 +119,315 @@ def get_user_input():
         else:
             print("Please enter 'y' or 'n'.")
 
-def primary_click_thread():
-    """Thread function for primary autoclicker."""
-    global first_clicker_active, start_time
-    last_click_time = 0
-    while True:
-        if first_clicker_active and start_time is not None:
-            current_time = time.time()
-            elapsed = current_time - start_time
-            # Only click if enough time has passed since last click
-            if elapsed % primary_interval < 0.1 and elapsed - last_click_time >= primary_interval * 0.9:
-                # Get current mouse position instead of using stored position
-                current_x, current_y = pyautogui.position()
-                pyautogui.click(current_x, current_y)
-                last_click_time = elapsed
-                print(f"Primary click at {elapsed:.1f}s at position ({current_x}, {current_y})")
-        time.sleep(0.01)
-
-def secondary_click_thread():
-    """Thread function for secondary autoclicker."""
-    global second_clicker_active, start_time
-    last_click_time = 0
-    while True:
-        if second_clicker_active and start_time is not None:
-            current_time = time.time()
-            elapsed = current_time - start_time
-            # Only click if enough time has passed since last click
-            if elapsed % secondary_interval < 0.1 and elapsed - last_click_time >= secondary_interval * 0.9:
-                # Get current mouse position instead of using stored position
-                current_x, current_y = pyautogui.position()
-                pyautogui.click(current_x, current_y)
-                last_click_time = elapsed
-                print(f"Secondary click at {elapsed:.1f}s at position ({current_x}, {current_y})")
-        time.sleep(0.01)
-
-def on_key_press(key):
-    """Handle key press events."""
-    global first_clicker_active, second_clicker_active, start_time
+def report_click(index, x, y, lateness_ns):
+    """Engine callback: print each click, or the achieved rate once per second in high-rate mode."""
+    if high_rate:
+        rate = rate_meter.tick()
+        if rate is not None:
+            print(f"Achieved rate: {rate_meter.report(rate)}, missed {engine.table.missed[index]}")
+        return
+    print(f"{engine.table.names[index]} click at {engine.elapsed(index):.1f}s at position ({x}, {y}) "
+          f"[+{lateness_ns / 1e6:.2f} ms]")
+
+def start_primary():
+    """Start the primary clicker, re-anchoring a running secondary so both stay in sync."""
+    global mouse_x, mouse_y, rate_meter
+    if high_rate:
+        # High-rate mode clicks where the mouse was when F1 was pressed
+        mouse_x, mouse_y = backend.position()
+        engine.configure(PRIMARY, x=mouse_x, y=mouse_y)
+        rate_meter = RateMeter(primary_interval)
+    engine.start(PRIMARY, reanchor=True)
+
+def toggle_clicker(index):
+    """Hotkey action: toggle a clicker on/off."""
+    if index >= len(engine.table):
+        return
+    name = engine.table.names[index]
+    if not engine.is_active(index):
+        if index == PRIMARY:
+            start_primary()
+        else:
+            engine.start(index)
+        print(f"{name} clicker: ON")
+    else:
+        engine.stop(index)
+        print(f"{name} clicker: OFF")
+        if index == PRIMARY and high_rate and rate_meter is not None:
+            print(f"Overall rate: {rate_meter.report(rate_meter.overall_rate())}")
+
+def stop_all_clickers():
+    """Hotkey action: stop every clicker."""
+    engine.stop_all()
+    print("All clickers: OFF")
+
+def parse_clicker(spec):
+    """Parse a --clicker spec INTERVAL[@X,Y][+OFFSET] into a clicker dict."""
+    clicker = {}
+    rest = spec
+    if "+" in rest:
+        rest, offset = rest.split("+", 1)
+        clicker["offset"] = offset
+    if "@" in rest:
+        rest, coords = rest.split("@", 1)
+        try:
+            x, y = coords.split(",")
+            clicker["x"], clicker["y"] = int(x), int(y)
+        except ValueError:
+            raise ValueError(f"Invalid coordinates in clicker spec: {spec!r}")
+    clicker["interval"] = rest
+    return clicker
+
+def load_config(path):
+    """Load a headless JSON config file."""
+    with open(path) as f:
+        return json.load(f)
+
+def normalize_config(config):
+    """Validate a headless config and convert intervals/offsets to seconds."""
+    clickers = config.get("clickers") or []
+    if not clickers:
+        raise ValueError("At least one clicker is required")
+    normalized = []
+    for i, clicker in enumerate(clickers):
+        entry = dict(clicker)
+        # A triggered clicker fires on detections; its interval is unused
+        entry["interval"] = parse_interval(entry.get("interval", 1) if "trigger" in entry else entry["interval"])
+        entry["offset"] = parse_offset(entry.get("offset") or 0)
+        if ("x" in entry) != ("y" in entry):
+            raise ValueError(f"Clicker {i + 1}: x and y must be given together")
+        entry.setdefault("name", f"clicker{i + 1}")
+        normalized.append(entry)
+    return dict(config, clickers=normalized)
+
+def run_headless(config, backend=None, stop_event=None, clock=None):
+    """Run clickers from a config with no prompts until stopped or `duration` elapses.
     
-    # Debug: Print what key was pressed
-    print(f"Key pressed: {key}")
+    With a VirtualClock the schedule is simulated on this thread for the
+    whole `duration` instead of waiting in real time.
+    Returns a summary dict with time-to-first-click and per-clicker statistics.
+    """
+    config = normalize_config(config)
+    clickers = config["clickers"]
+    quiet = config.get("quiet", False)
+    budget_ms = config.get("first_click_budget_ms", FIRST_CLICK_BUDGET_MS)
+    own_backend = backend is None
+    if own_backend:
+        backend = create_backend(config.get("backend", "auto"), failsafe=config.get("failsafe", False))
+    
+    stop_event = stop_event or threading.Event()
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, lambda signum, frame: stop_event.set())
+    
+    virtual = isinstance(clock, VirtualClock)
+    clock = clock or time.monotonic_ns
+    start_ns = PROCESS_START_NS if not virtual else clock()
+    first_click_ns = []
+    def on_click(index, x, y, lateness_ns):
+        if not first_click_ns:
+            first_click_ns.append(clock())
+        if not quiet and not engine.table.flags[index] & FLAG_HIGH_RATE:
+            where = f"({x}, {y})" if engine.table.mode[index] == MODE_FIXED else "mouse position"
+            print(f"{engine.table.names[index]} click at {engine.elapsed(index):.1f}s at {where} "
+                  f"[+{lateness_ns / 1e6:.2f} ms]")
+    
+    engine = ClickerEngine(lambda: backend, on_click=on_click,
+                           scheduler=ClickScheduler(clock=clock, manual=virtual))
+    audit = None
+    if config.get("audit"):
+        audit = build_audit_log(config["audit"], clock=clock)
+        engine.set_audit(audit)
+        print(f"Audit log at {audit.segment}")
+    # One seed for every jittered clicker, so a run can be replayed from it
+    seed = config.get("seed")
+    if seed is None and any("jitter" in clicker for clicker in clickers):
+        seed = secrets.randbits(32)
+    for clicker in clickers:
+        fixed = "x" in clicker
+        engine.add_clicker(clicker["name"], clicker["interval"], clicker["offset"],
+                           x=clicker.get("x", 0), y=clicker.get("y", 0),
+                           mode=MODE_FIXED if fixed else MODE_TRACK,
+                           flags=FLAG_HIGH_RATE if is_high_rate(clicker["interval"]) else 0)
+        if "trigger" in clicker:
+            engine.attach_trigger(len(engine.table) - 1, build_trigger(clicker["trigger"]))
+        if "burst" in clicker:
+            engine.set_burst(len(engine.table) - 1, parse_burst(clicker["burst"]))
+        if "jitter" in clicker:
+            index = len(engine.table) - 1
+            engine.set_jitter(index, build_jitter(clicker["jitter"], stream=index, seed=seed))
+    metrics_server = None
+    if config.get("metrics"):
+        from metrics import MetricsServer
+        metrics_server = MetricsServer(engine.enable_metrics(), config["metrics"])
+        print(f"Metrics at {metrics_server.url}")
+    control_server = None
+    if config.get("control"):
+        controller = Controller(engine)
+        control_server = ControlServer(controller, config["control"])
+        print(f"Control socket at {config['control']}")
+    # Every clicker shares the start time set by the first one and fires at once
+    for index in range(len(engine.table)):
+        engine.start(index, immediate=True)
+    print(f"Headless autoclicker running {len(engine.table)} clicker(s) on {backend.name} backend")
+    for index, jitter in engine.jitters.items():
+        print(f"{engine.table.names[index]} jitter: {jitter.describe()}")
     
     try:
-        if key == keyboard.Key.f1:
-            first_clicker_active = not first_clicker_active
-            if first_clicker_active:
-                start_time = time.time()
-                print("Primary clicker: ON")
-            else:
-                print("Primary clicker: OFF")
-                # Reset start_time when turning off to ensure clean restart
-                start_time = None
-                
-        elif key == keyboard.Key.f2 and secondary_interval is not None:
-            second_clicker_active = not second_clicker_active
-            if second_clicker_active:
-                if start_time is None:
-                    start_time = time.time()
-                print("Secondary clicker: ON")
-            else:
-                print("Secondary clicker: OFF")
-                # Reset start_time when turning off to ensure clean restart
-                if not first_clicker_active:
-                    start_time = None
-                
-    except AttributeError:
-        pass
-
-def main():
-    """Main function."""
-    global mouse_x, mouse_y, start_time
+        if virtual:
+            engine.scheduler.run_until(start_ns + seconds_to_ns(config.get("duration") or 0))
+        else:
+            stop_event.wait(config.get("duration"))
+    finally:
+        engine.shutdown()
+        if control_server is not None:
+            control_server.close()
+            controller.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        if audit is not None:
+            audit.close()
+        if own_backend:
+            backend.close()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+    
+    summary = {"first_click_ms": None, "clickers": [], "seed": seed}
+    if first_click_ns:
+        summary["first_click_ms"] = (first_click_ns[0] - start_ns) / 1e6
+        print(f"Time to first click: {summary['first_click_ms']:.1f} ms")
+        if summary["first_click_ms"] > budget_ms:
+            print(f"Warning: first click exceeded the {budget_ms} ms budget", file=sys.stderr)
+    if audit is not None:
+        summary["audit"] = audit.stats()
+        print(f"Audit log: {audit.records} clicks in {audit.writes} writes, {audit.segments} segment(s)")
+        if audit.error is not None:
+            print(f"Warning: audit log write failed: {audit.error}", file=sys.stderr)
+    for index in range(len(engine.table)):
+        row = engine.table.row(index)
+        stats = {key: row[key] for key in ("name", "fires", "missed", "skipped",
+                                           "max_lateness_ms", "mean_lateness_ms")}
+        summary["clickers"].append(stats)
+        print(f"{row['name']}: {row['fires']} clicks, {row['missed']} missed, "
+              f"lateness mean {stats['mean_lateness_ms']:.2f} ms / max {stats['max_lateness_ms']:.2f} ms")
+        trigger = engine.triggers.get(index)
+        if trigger is not None:
+            stats["trigger"] = trigger.stats()
+            print(f"  {trigger.kind} trigger: {stats['trigger']['checks']} checks in "
+                  f"{stats['trigger']['polls']} polls, {stats['trigger']['matches']} matches, "
+                  f"check mean {stats['trigger']['mean_check_ms']:.2f} ms")
+    return summary
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Simple Autoclicker for Ubuntu")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without prompts or hotkeys, clicking immediately")
+    parser.add_argument("--config", help="JSON config file for headless mode")
+    parser.add_argument("--clicker", action="append", default=[], metavar="INTERVAL[@X,Y][+OFFSET]",
+                        help="add a clicker, e.g. 5, 2ms@100,200 or 30@10,10+1.5 (repeatable)")
+    parser.add_argument("--backend", choices=["auto"] + list(BACKENDS), help="click backend")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--quiet", action="store_true", help="do not print every click")
+    parser.add_argument("--metrics", metavar="PORT|HOST:PORT|SOCKET",
+                        help="serve Prometheus metrics on a local port or Unix socket")
+    parser.add_argument("--control", metavar="SOCKET", help="accept commands on this Unix socket")
+    parser.add_argument("--hotkeys", metavar="FILE",
+                        help="JSON hotkey bindings, e.g. {\"ctrl+f1\": \"toggle_clicker:0\"}")
+    parser.add_argument("--audit-log", metavar="PATH", help="record every click in an audit log")
+    return parser.parse_args(argv)
+
+def headless_main(args):
+    """Build the headless config from a config file and arguments, then run it."""
+    try:
+        config = load_config(args.config) if args.config else {}
+        if args.clicker:
+            config["clickers"] = [parse_clicker(spec) for spec in args.clicker]
+        for key in ("backend", "duration", "metrics", "control"):
+            if getattr(args, key) is not None:
+                config[key] = getattr(args, key)
+        if args.audit_log is not None:
+            config["audit"] = args.audit_log
+        if args.quiet:
+            config["quiet"] = True
+        run_headless(config)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+def interactive_main(backend_name="auto", metrics_address=None, control_path=None, hotkeys_path=None,
+                     audit_path=None):
+    """Interactive mode: prompt for intervals, then toggle clickers with hotkeys."""
+    global mouse_x, mouse_y, engine, backend, keyboard
+    bindings = load_bindings(hotkeys_path) if hotkeys_path else DEFAULT_HOTKEYS
+    hotkeys = HotkeyMap(bindings, {"toggle_clicker": toggle_clicker, "stop_all": stop_all_clickers})
+    from pynput import keyboard
+    
+    # Open the click backend (XTest when available, pyautogui otherwise)
+    backend = create_backend(backend_name, failsafe=True)
+    print(f"Click backend: {backend.name}")
     
     # Get initial mouse position
-    mouse_x, mouse_y = pyautogui.position()
+    mouse_x, mouse_y = backend.position()
     print(f"Mouse position captured: ({mouse_x}, {mouse_y})")
     
     # Get user input
     get_user_input()
     
-    # Create and start threads
-    primary_thread = threading.Thread(target=primary_click_thread, daemon=True)
-    primary_thread.start()
-    
-    secondary_thread = None
+    # Build the clicker table; the engine's scheduler sleeps until a clicker is toggled on
+    engine = ClickerEngine(lambda: backend, on_click=report_click)
+    if high_rate:
+        engine.add_clicker("Primary", primary_interval, mode=MODE_FIXED, flags=FLAG_HIGH_RATE)
+        print(f"High-rate mode: {1 / primary_interval:.1f} clicks per second")
+    else:
+        engine.add_clicker("Primary", primary_interval)
     if secondary_interval is not None:
-        secondary_thread = threading.Thread(target=secondary_click_thread, daemon=True)
-        secondary_thread.start()
+        engine.add_clicker("Secondary", secondary_interval)
+    metrics_server = None
+    if metrics_address:
+        from metrics import MetricsServer
+        metrics_server = MetricsServer(engine.enable_metrics(), metrics_address)
+        print(f"Metrics at {metrics_server.url}")
+    control_server = None
+    if control_path:
+        control_server = ControlServer(Controller(engine), control_path)
+        print(f"Control socket at {control_path}")
+    audit = None
+    if audit_path:
+        audit = build_audit_log(audit_path)
+        engine.set_audit(audit)
+        print(f"Audit log at {audit.segment}")
     
     # Start keyboard listener
-    with keyboard.Listener(on_press=on_key_press) as listener:
-        print("\nAutoclicker ready! Press F1 to start primary clicker.")
-        if secondary_interval is not None:
-            print("Press F2 to start secondary clicker.")
+    with keyboard.Listener(on_press=hotkeys.on_press, on_release=hotkeys.on_release) as listener:
+        print(f"\nAutoclicker ready! Hotkeys: {hotkeys.describe()}")
         print("Press Ctrl+C to exit.")
         
         try:
             listener.join()
         except KeyboardInterrupt:
             print("\nExiting...")
-            first_clicker_active = False
-            second_clicker_active = False
+            engine.shutdown()
+            if metrics_server is not None:
+                metrics_server.close()
+            if control_server is not None:
+                control_server.close()
+            if audit is not None:
+                audit.close()
+
+def main(argv=None):
+    """Main function."""
+    args = parse_args(argv)
+    if args.headless or args.config:
+        return headless_main(args)
+    try:
+        interactive_main(args.backend or "auto", args.metrics, args.control, args.hotkeys, args.audit_log)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,23 +2,59 @@
 """
 Simple Autoclicker GUI for Ubuntu
 A modern GUI interface for the autoclicker with tkinter.
+pynput and the click backend are imported on first use so the window
+appears without paying for them.
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 import time
 import sys
 import platform
-from pynput import keyboard
-import pyautogui
+import shutil
+from audit_log import AuditLog
+from bursts import parse_burst
+from click_backends import create_backend
+from click_recorder import BUTTON_NAMES, EVENT_CODES, MOVE, ClickRecorder, button_code
+from clicker_engine import FLAG_FOLLOW, FLAG_HIGH_RATE, MODE_FIXED, MODE_TRACK, ClickerEngine
+from control import ControlServer, Controller
+from dashboard import COLUMNS, DASHBOARD_HZ, Dashboard, format_playback
+from log_pipeline import LogRing, format_batch
+from high_rate import RateMeter, parse_interval, parse_offset, parse_rate
+from hotkeys import HotkeyMap, load_bindings
+from motion_path import MOVE_RATE, PATH_TOLERANCE, PathSimplifier
+from playback import SequencePlayer
+from sequence_file import EXTENSION, SequenceFile, SequenceFormatError, save_recording
+from sequence_view import SequenceView, format_event, parse_region
+from triggers import PixelTrigger
 
-# Configure pyautogui
-pyautogui.FAILSAFE = False  # Disable failsafe to prevent interruptions
-pyautogui.PAUSE = 0.01
+# Status log: lines kept in the widget, drain period and ring capacity
+LOG_MAX_LINES = 500
+LOG_DRAIN_MS = 100
+LOG_RING_CAPACITY = 2000
+# Dashboard frame period
+DASHBOARD_MS = 1000 // DASHBOARD_HZ
+
+# Recorder: status refresh period, rows shown by the sequence view and the
+# pause between filter scan batches
+RECORDING_STATUS_MS = 250
+SEQUENCE_PAGE_ROWS = 8
+SEQUENCE_SCAN_MS = 10
+
+# Clickers created at startup as (name, seconds). The first has its own
+# interval; the others fire with the same period at a delta after it.
+DEFAULT_CLICKERS = (("Primary", 5), ("Secondary", 1), ("Tertiary", 2))
+# Colour a pixel trigger waits for until another is entered
+DEFAULT_TRIGGER_COLOR = "#00ff00"
+# Hotkeys toggling the first clickers, in table order
+DEFAULT_HOTKEYS = {"f1": "toggle_clicker:0", "f2": "toggle_clicker:1", "f3": "toggle_clicker:2",
+                   "f4": "toggle_recording", "f5": "toggle_playback"}
 
 class AutoclickerGUI:
-    def __init__(self, root):
+    def __init__(self, root, backend=None, log_max_lines=LOG_MAX_LINES, scheduler=None,
+                 metrics_address=None, control_path=None, hotkeys=None, audit_path=None):
         self.root = root
         self.root.title("Simple Autoclicker for Ubuntu")
         self.root.geometry("550x550")
@@ -33,40 +69,81 @@ class AutoclickerGUI:
             self.root.title("Simple Autoclicker (Windows)")
         
         # Variables
-        self.primary_active = False
-        self.secondary_active = False
-        self.tertiary_active = False
-        self.start_time = None
-        self.primary_interval = 5  # seconds
-        self.secondary_interval = 30  # seconds
-        self.tertiary_interval = 60  # seconds
-        self.primary_thread = None
-        self.secondary_thread = None
-        self.tertiary_thread = None
         self.keyboard_listener = None
         
-        # Coordinate settings
-        self.primary_use_coordinates = False
-        self.secondary_use_coordinates = False
-        self.tertiary_use_coordinates = False
-        self.primary_click_x = 0
-        self.primary_click_y = 0
-        self.secondary_click_x = 0
-        self.secondary_click_y = 0
-        self.tertiary_click_x = 0
-        self.tertiary_click_y = 0
+        # Click backend (XTest when available, pyautogui otherwise; failsafe off
+        # to prevent interruptions), opened on first use
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        
+        # Hotkeys fire on the pynput thread; every action runs on the Tk thread
+        actions = {"toggle_clicker": self.hotkey_toggle_clicker, "stop_all": self.stop_all,
+                   "toggle_recording": self.toggle_recording, "toggle_playback": self.toggle_playback}
+        actions = {name: self.on_tk_thread(action) for name, action in actions.items()}
+        try:
+            self.hotkeys = HotkeyMap(hotkeys or DEFAULT_HOTKEYS, actions)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid hotkeys, using the defaults: {e}")
+            self.hotkeys = HotkeyMap(DEFAULT_HOTKEYS, actions)
+        
+        # Clicker table; one engine scheduler thread serves every clicker and
+        # sleeps while idle
+        self.engine = ClickerEngine(lambda: self.backend, on_click=self.on_engine_click, scheduler=scheduler)
+        primary_interval = DEFAULT_CLICKERS[0][1]
+        for index, (name, seconds) in enumerate(DEFAULT_CLICKERS):
+            if index == 0:
+                self.engine.add_clicker(name, seconds)
+            else:
+                self.engine.add_clicker(name, primary_interval, offset=seconds, flags=FLAG_FOLLOW)
+        self.clicker_controls = []  # per clicker: Tk variables and widgets
+        self.rate_meters = {}
+        
+        # Status log pipeline: any thread pushes, the Tk loop drains in batches
+        self.log_ring = LogRing(LOG_RING_CAPACITY)
+        self.log_max_lines = log_max_lines
+        
+        # Optional Prometheus endpoint for the engine and the log queue
+        self.metrics_server = None
+        if metrics_address:
+            from metrics import MetricsServer
+            registry = self.engine.enable_metrics()
+            registry.gauge("autoclicker_log_queue_depth", "Status messages waiting to be shown",
+                           lambda: len(self.log_ring))
+            registry.gauge("autoclicker_log_dropped", "Status messages dropped by the log ring",
+                           lambda: self.log_ring.dropped)
+            self.metrics_server = MetricsServer(registry, metrics_address)
+        
+        # Optional audit trail of every clicker click
+        self.audit = None
+        if audit_path:
+            self.audit = AuditLog(audit_path)
+            self.engine.set_audit(self.audit)
+            self.log_message(f"Audit log at {self.audit.segment}")
         
         # Create GUI
         self.create_widgets()
-        self.setup_keyboard_listener()
+        # Start hotkeys once the window is up; pynput import is not on the startup path
+        self.root.after_idle(self.setup_keyboard_listener)
+        self.root.after(LOG_DRAIN_MS, self.drain_log)
+        self.root.after(DASHBOARD_MS, self.refresh_dashboard)
         
         # Recorder variables
         self.recording = False
         self.playing = False
-        self.recorded_clicks = []
+        self.recorder = None  # ClickRecorder while recording
+        self.sequence = None  # playable sequence: the last recording or a loaded SequenceFile
+        self.sequence_view = None  # SequenceView paging the sequence display
+        self.sequence_top = 0  # view row at the top of the display
+        self.click_listener = None
         self.replay_count = 1
-        self.current_replay = 0
         self.recorder_thread = None
+        self.player = None
+        
+        # Optional control socket; commands are applied on the Tk thread
+        self.control_server = None
+        if control_path:
+            self.control_server = ControlServer(GUIController(self), control_path)
+            self.log_message(f"Control socket at {control_path}")
         
     def create_widgets(self):
         """Create and layout GUI widgets."""
@@ -92,69 +169,12 @@ class AutoclickerGUI:
                                font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
         
-        # Clicker Controls (Compact)
-        controls_frame = ttk.LabelFrame(main_frame, text="Clicker Controls", padding="10")
-        controls_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
-        controls_frame.columnconfigure(1, weight=1)
-        
-        # Primary Clicker (Always visible)
-        primary_row = ttk.Frame(controls_frame)
-        primary_row.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 5))
-        primary_row.columnconfigure(1, weight=1)
-        
-        # Primary interval
-        ttk.Label(primary_row, text="Interval (seconds):").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.primary_interval_var = tk.StringVar(value="5")
-        primary_spinbox = ttk.Spinbox(primary_row, from_=1, to=3600, width=10, 
-                                    textvariable=self.primary_interval_var)
-        primary_spinbox.grid(row=0, column=1, sticky=tk.W)
-        
-        # Primary coordinate settings
-        coord_frame = ttk.Frame(primary_row)
-        coord_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
-        
-        self.primary_coord_var = tk.BooleanVar()
-        coord_check = ttk.Checkbutton(coord_frame, text="Use fixed coordinates",
-                                     variable=self.primary_coord_var, command=self.toggle_primary_coords)
-        coord_check.grid(row=0, column=0, sticky=tk.W)
-        
-        self.primary_coord_button = ttk.Button(coord_frame, text="Set Coordinates", 
-                                             command=self.set_primary_coordinates, state="disabled")
-        self.primary_coord_button.grid(row=0, column=1, sticky=tk.E, padx=(10, 0))
-        
-        self.primary_coord_label = ttk.Label(coord_frame, text="Coordinates: Not set", 
-                                           font=("Arial", 9), foreground="gray")
-        self.primary_coord_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
-        
-        # Primary status and control
-        self.primary_status_var = tk.StringVar(value="OFF")
-        self.primary_status_label = ttk.Label(primary_row, textvariable=self.primary_status_var, 
-                                              font=("Arial", 12, "bold"))
-        self.primary_status_label.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
-        
-        self.primary_button = ttk.Button(primary_row, text="Start Primary", 
-                                        command=self.toggle_primary)
-        self.primary_button.grid(row=2, column=1, sticky=tk.E, pady=(5, 0))
-        
-        # Secondary Clicker (Collapsible)
-        self.secondary_enabled_var = tk.BooleanVar()
-        self.secondary_check = ttk.Checkbutton(controls_frame, text="Enable Secondary Clicker",
-                                             variable=self.secondary_enabled_var,
-                                             command=self.toggle_secondary_enable)
-        self.secondary_check.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
-        
-        # Secondary controls (hidden by default)
-        self.secondary_controls_frame = ttk.Frame(controls_frame)
-        
-        # Tertiary Clicker (Collapsible)
-        self.tertiary_enabled_var = tk.BooleanVar()
-        self.tertiary_check = ttk.Checkbutton(controls_frame, text="Enable Tertiary Clicker",
-                                            variable=self.tertiary_enabled_var,
-                                            command=self.toggle_tertiary_enable)
-        self.tertiary_check.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
-        
-        # Tertiary controls (hidden by default)
-        self.tertiary_controls_frame = ttk.Frame(controls_frame)
+        # Clicker Controls (Compact), one row per clicker in the engine table
+        self.controls_frame = ttk.LabelFrame(main_frame, text="Clicker Controls", padding="10")
+        self.controls_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.controls_frame.columnconfigure(1, weight=1)
+        for index in range(len(self.engine.table)):
+            self.create_clicker_controls(index)
         
         # Control Section
         control_frame = ttk.Frame(main_frame)
@@ -165,6 +185,22 @@ class AutoclickerGUI:
                                          command=self.stop_all, state="disabled")
         self.stop_all_button.pack(side=tk.LEFT)
         
+        # Add clicker button
+        add_button = ttk.Button(control_frame, text="Add Clicker", command=self.add_clicker)
+        add_button.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Dashboard: one row per clicker, redrawn at DASHBOARD_HZ from an engine snapshot
+        dashboard_frame = ttk.LabelFrame(main_frame, text="Dashboard", padding="10")
+        dashboard_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(20, 0))
+        dashboard_frame.columnconfigure(0, weight=1)
+        self.dashboard = Dashboard()
+        self.dashboard_rows = {}  # clicker id -> values shown
+        self.dashboard_tree = ttk.Treeview(dashboard_frame, columns=COLUMNS, show="headings", height=4)
+        for column in COLUMNS:
+            self.dashboard_tree.heading(column, text=column.title())
+            self.dashboard_tree.column(column, width=70, anchor=tk.W if column == "clicker" else tk.E)
+        self.dashboard_tree.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
         # Status Section
         status_frame = ttk.LabelFrame(main_frame, text="Status", padding="10")
         status_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(20, 0))
@@ -181,7 +217,7 @@ class AutoclickerGUI:
         # Initial status message
         self.log_message("Autoclicker GUI ready!")
         self.log_message(f"Platform: {self.platform.title()}")
-        self.log_message("Press F1 to toggle primary clicker, F2 to toggle secondary clicker")
+        self.log_message(f"Hotkeys: {self.hotkeys.describe()}")
         if self.platform == "linux":
             self.log_message("Move mouse to top-left corner for emergency stop")
         else:
@@ -222,19 +258,62 @@ class AutoclickerGUI:
                                       command=self.clear_sequence, state="disabled")
         self.clear_button.grid(row=0, column=2, sticky=tk.E)
         
+        # Save / load sequence files
+        file_frame = ttk.Frame(record_frame)
+        file_frame.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        self.save_button = ttk.Button(file_frame, text="Save Sequence...",
+                                      command=self.save_sequence, state="disabled")
+        self.save_button.pack(side=tk.LEFT)
+        self.load_button = ttk.Button(file_frame, text="Load Sequence...", command=self.load_sequence)
+        self.load_button.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Optional motion capture, simplified to within a pixel tolerance
+        motion_frame = ttk.Frame(record_frame)
+        motion_frame.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        self.record_motion_var = tk.BooleanVar()
+        ttk.Checkbutton(motion_frame, text="Record mouse movement",
+                        variable=self.record_motion_var).pack(side=tk.LEFT)
+        ttk.Label(motion_frame, text="Tolerance (px):").pack(side=tk.LEFT, padx=(10, 5))
+        self.path_tolerance_var = tk.StringVar(value=f"{PATH_TOLERANCE:g}")
+        ttk.Spinbox(motion_frame, from_=0, to=100, width=5,
+                    textvariable=self.path_tolerance_var).pack(side=tk.LEFT)
         
         # Sequence display
         seq_frame = ttk.LabelFrame(recorder_frame, text="Recorded Sequence", padding="10")
         seq_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         seq_frame.columnconfigure(0, weight=1)
         
-        self.sequence_text = tk.Text(seq_frame, height=8, width=60, wrap=tk.WORD, state="disabled")
-        self.sequence_text.grid(row=0, column=0, sticky=(tk.W, tk.E))
-        
-        # Scrollbar for sequence text
-        seq_scrollbar = ttk.Scrollbar(seq_frame, orient=tk.VERTICAL, command=self.sequence_text.yview)
-        seq_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.sequence_text.configure(yscrollcommand=seq_scrollbar.set)
+        # Jump and filter controls; the view lists only the rows on screen
+        view_frame = ttk.Frame(seq_frame)
+        view_frame.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Label(view_frame, text="Go to #").pack(side=tk.LEFT)
+        self.sequence_jump_var = tk.StringVar()
+        jump_entry = ttk.Entry(view_frame, width=8, textvariable=self.sequence_jump_var)
+        jump_entry.pack(side=tk.LEFT, padx=(5, 0))
+        jump_entry.bind("<Return>", lambda e: self.jump_to_sequence_index())
+        ttk.Button(view_frame, text="Go", width=4,
+                   command=self.jump_to_sequence_index).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Label(view_frame, text="Button:").pack(side=tk.LEFT)
+        self.sequence_button_var = tk.StringVar(value="all")
+        ttk.Combobox(view_frame, width=7, state="readonly", textvariable=self.sequence_button_var,
+                     values=("all",) + tuple(EVENT_CODES)).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Label(view_frame, text="Region (x,y,w,h):").pack(side=tk.LEFT)
+        self.sequence_region_var = tk.StringVar()
+        ttk.Entry(view_frame, width=14, textvariable=self.sequence_region_var).pack(side=tk.LEFT, padx=(5, 5))
+        ttk.Button(view_frame, text="Filter", command=self.apply_sequence_filter).pack(side=tk.LEFT)
+        
+        self.sequence_text = tk.Text(seq_frame, height=SEQUENCE_PAGE_ROWS, width=60, wrap=tk.NONE,
+                                     state="disabled")
+        self.sequence_text.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.sequence_text.bind(sequence, self.on_sequence_wheel)
+        
+        # Scrollbar for sequence text: positions the page, not the widget
+        self.sequence_scrollbar = ttk.Scrollbar(seq_frame, orient=tk.VERTICAL, command=self.scroll_sequence)
+        self.sequence_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        
+        self.sequence_info_var = tk.StringVar()
+        ttk.Label(seq_frame, textvariable=self.sequence_info_var).grid(row=2, column=0, sticky=tk.W)
         
         # Playback Section
         playback_frame = ttk.LabelFrame(recorder_frame, text="Playback", padding="10")
@@ -255,6 +334,32 @@ class AutoclickerGUI:
                                             textvariable=self.replay_interval_var)
         replay_interval_spinbox.grid(row=1, column=1, sticky=tk.W, pady=(5, 0))
         
+        # Playback speed multiplier
+        ttk.Label(playback_frame, text="Speed (x):").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.speed_var = tk.StringVar(value="1")
+        speed_spinbox = ttk.Spinbox(playback_frame, from_=0.1, to=100, increment=0.5, width=10,
+                                    textvariable=self.speed_var)
+        speed_spinbox.grid(row=2, column=1, sticky=tk.W, pady=(5, 0))
+        
+        # Idle gap clamp (0 keeps the recorded gaps)
+        ttk.Label(playback_frame, text="Max idle gap (seconds, 0 = off):").grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.max_gap_var = tk.StringVar(value="0")
+        max_gap_spinbox = ttk.Spinbox(playback_frame, from_=0, to=3600, width=10,
+                                      textvariable=self.max_gap_var)
+        max_gap_spinbox.grid(row=3, column=1, sticky=tk.W, pady=(5, 0))
+        
+        # Interpolated moves per second along recorded paths
+        ttk.Label(playback_frame, text="Move rate (per second):").grid(row=4, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.move_rate_var = tk.StringVar(value=str(MOVE_RATE))
+        move_rate_spinbox = ttk.Spinbox(playback_frame, from_=10, to=1000, width=10,
+                                        textvariable=self.move_rate_var)
+        move_rate_spinbox.grid(row=4, column=1, sticky=tk.W, pady=(5, 0))
+        
+        # Clicks per recorded click: "1", "double", "triple" or "5x20ms"
+        ttk.Label(playback_frame, text="Clicks per step:").grid(row=5, column=0, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.step_burst_var = tk.StringVar(value="1")
+        ttk.Entry(playback_frame, width=10, textvariable=self.step_burst_var).grid(row=5, column=1, sticky=tk.W, pady=(5, 0))
+        
         # Play button
         self.play_button = ttk.Button(playback_frame, text="Play Sequence", 
                                     command=self.toggle_playback, state="disabled")
@@ -264,13 +369,13 @@ class AutoclickerGUI:
         self.playback_status_var = tk.StringVar(value="Ready")
         self.playback_status_label = ttk.Label(playback_frame, textvariable=self.playback_status_var,
                                              font=("Arial", 12, "bold"))
-        self.playback_status_label.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        self.playback_status_label.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
         
         # Progress bar
         self.progress_var = tk.StringVar(value="")
         self.progress_label = ttk.Label(playback_frame, textvariable=self.progress_var,
                                       font=("Arial", 10))
-        self.progress_label.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        self.progress_label.grid(row=7, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
         
         # Instructions
         instructions_frame = ttk.Frame(recorder_frame)
@@ -283,319 +388,302 @@ class AutoclickerGUI:
         
         # Hotkey info
         hotkey_text = ttk.Label(instructions_frame, 
-                               text="Hotkeys: F1=Primary, F2=Secondary, F3=Tertiary, F4=Recording, F5=Playback (Ubuntu optimized)",
+                               text=f"Hotkeys: {self.hotkeys.describe()}",
                                font=("Arial", 9), foreground="blue")
         hotkey_text.pack()
         
+    @property
+    def backend(self):
+        """Click backend, opened on first use (thread-safe)."""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = create_backend("auto")
+                    self.log_message(f"Click backend: {self._backend.name}")
+        return self._backend
+    
     def setup_keyboard_listener(self):
-        """Setup keyboard listener for F1/F2 hotkeys."""
+        """Setup keyboard listener for the hotkeys."""
         try:
-            self.keyboard_listener = keyboard.Listener(on_press=self.on_key_press)
+            from pynput import keyboard
+            self.keyboard_listener = keyboard.Listener(on_press=self.hotkeys.on_press,
+                                                       on_release=self.hotkeys.on_release)
             self.keyboard_listener.start()
-            self.log_message("Keyboard listener started - F1/F2 hotkeys active")
+            self.log_message("Keyboard listener started - hotkeys active")
         except Exception as e:
             self.log_message(f"Warning: Could not start keyboard listener: {e}")
             self.log_message("Hotkeys may not work - use GUI buttons instead")
     
-    def on_key_press(self, key):
-        """Handle key press events."""
-        try:
-            if key == keyboard.Key.f1:
-                self.root.after(0, self.toggle_primary)
-            elif key == keyboard.Key.f2 and self.secondary_enabled_var.get():
-                self.root.after(0, self.toggle_secondary)
-            elif key == keyboard.Key.f3 and self.tertiary_enabled_var.get():
-                self.root.after(0, self.toggle_tertiary)
-            elif key == keyboard.Key.f4:
-                self.root.after(0, self.toggle_recording)
-            elif key == keyboard.Key.f5:
-                self.root.after(0, self.toggle_playback)
-        except AttributeError:
-            pass
-    
-    def toggle_primary(self):
-        """Toggle primary clicker on/off."""
-        if not self.primary_active:
-            self.start_primary()
-        else:
-            self.stop_primary()
-    
-    def start_primary(self):
-        """Start primary clicker."""
-        try:
-            self.primary_interval = int(self.primary_interval_var.get())
-            if self.primary_interval <= 0:
-                messagebox.showerror("Error", "Interval must be greater than 0")
-                return
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid number for interval")
-            return
-        
-        self.primary_active = True
-        self.start_time = time.time()
-        self.primary_status_var.set("ON")
-        self.primary_status_label.configure(foreground="green")
-        self.primary_button.configure(text="Stop Primary")
-        
-        # Start master timer thread
-        self.master_thread = threading.Thread(target=self.master_timer_thread, daemon=True)
-        self.master_thread.start()
-        
-        self.log_message("Primary clicker started")
-        self.update_stop_all_button()
+    def on_tk_thread(self, action):
+        """Wrap action so that calling it from any thread queues it on the Tk loop."""
+        return lambda *args: self.root.after(0, action, *args)
     
-    def stop_primary(self):
-        """Stop primary clicker."""
-        self.primary_active = False
-        self.primary_status_var.set("OFF")
-        self.primary_status_label.configure(foreground="red")
-        self.primary_button.configure(text="Start Primary")
-        
-        # Reset start_time if no clickers are active
-        if not self.secondary_active:
-            self.start_time = None
-        
-        self.log_message("Primary clicker stopped")
-        self.update_stop_all_button()
+    def hotkey_toggle_clicker(self, index):
+        """Hotkey action: toggle a clicker whose controls are shown."""
+        if index < len(self.clicker_controls) and self.clicker_enabled(index):
+            self.toggle_clicker(index)
     
-    def toggle_secondary(self):
-        """Toggle secondary clicker on/off."""
-        if not self.secondary_active:
-            self.start_secondary()
+    def create_clicker_controls(self, index):
+        """Build the controls for one clicker of the engine table.
+        
+        The first clicker is always visible; the others sit behind an
+        "Enable" checkbox and take a delta from the first clicker.
+        """
+        table = self.engine.table
+        name = table.names[index]
+        controls = {}
+        if index == 0:
+            row = ttk.Frame(self.controls_frame)
+            row.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 5))
+            label_text = "Interval (seconds):"
+            value = table.interval_ns[index] / 1e9
         else:
-            self.stop_secondary()
-    
-    def start_secondary(self):
-        """Start secondary clicker."""
-        try:
-            self.secondary_interval = int(self.secondary_interval_var.get())
-            if self.secondary_interval <= 0:
-                messagebox.showerror("Error", "Interval must be greater than 0")
-                return
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid number for interval")
-            return
+            controls["enabled_var"] = tk.BooleanVar()
+            check = ttk.Checkbutton(self.controls_frame, text=f"Enable {name} Clicker",
+                                    variable=controls["enabled_var"],
+                                    command=lambda: self.toggle_clicker_enable(index))
+            check.grid(row=2 * index - 1, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+            # Shown by toggle_clicker_enable
+            row = ttk.Frame(self.controls_frame)
+            label_text = f"Delta from {table.names[0]} (seconds):"
+            value = table.offset_ns[index] / 1e9
+        row.columnconfigure(1, weight=1)
+        controls["frame"] = row
+        
+        # Interval (or delta)
+        controls["interval_label"] = ttk.Label(row, text=label_text)
+        controls["interval_label"].grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        controls["interval_var"] = tk.StringVar(value=f"{value:g}")
+        spinbox = ttk.Spinbox(row, from_=1, to=3600, width=10, textvariable=controls["interval_var"])
+        spinbox.grid(row=0, column=1, sticky=tk.W)
+        
+        if index == 0:
+            # High-rate mode: the interval field takes clicks/sec or milliseconds
+            controls["high_rate_var"] = tk.BooleanVar()
+            high_rate_check = ttk.Checkbutton(row, text="High-rate mode",
+                                              variable=controls["high_rate_var"],
+                                              command=self.toggle_primary_high_rate)
+            high_rate_check.grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        
+        # Coordinate settings
+        coord_frame = ttk.Frame(row)
+        coord_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
         
-        self.secondary_active = True
-        if self.start_time is None:
-            self.start_time = time.time()
-        self.secondary_status_var.set("ON")
-        self.secondary_status_label.configure(foreground="green")
-        self.secondary_button.configure(text="Stop Secondary")
+        controls["coord_var"] = tk.BooleanVar()
+        coord_check = ttk.Checkbutton(coord_frame, text="Use fixed coordinates",
+                                      variable=controls["coord_var"],
+                                      command=lambda: self.toggle_clicker_coords(index))
+        coord_check.grid(row=0, column=0, sticky=tk.W)
         
-        # Master timer thread already running, no need to start new thread
+        controls["coord_button"] = ttk.Button(coord_frame, text="Set Coordinates", state="disabled",
+                                              command=lambda: self.set_clicker_coordinates(index))
+        controls["coord_button"].grid(row=0, column=1, sticky=tk.E, padx=(10, 0))
         
-        self.log_message("Secondary clicker started")
-        self.update_stop_all_button()
-    
-    def stop_secondary(self):
-        """Stop secondary clicker."""
-        self.secondary_active = False
-        self.secondary_status_var.set("OFF")
-        self.secondary_status_label.configure(foreground="red")
-        self.secondary_button.configure(text="Start Secondary")
+        controls["coord_label"] = ttk.Label(coord_frame, text="Coordinates: Not set", 
+                                            font=("Arial", 9), foreground="gray")
+        controls["coord_label"].grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
+        
+        # Pixel trigger: fire when the watched pixels turn a colour instead of on the interval
+        trigger_frame = ttk.Frame(coord_frame)
+        trigger_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        controls["pixel_var"] = tk.BooleanVar()
+        controls["pixels"] = []
+        pixel_check = ttk.Checkbutton(trigger_frame, text="Fire when pixel turns",
+                                      variable=controls["pixel_var"],
+                                      command=lambda: self.toggle_clicker_pixel_trigger(index))
+        pixel_check.grid(row=0, column=0, sticky=tk.W)
+        controls["color_var"] = tk.StringVar(value=DEFAULT_TRIGGER_COLOR)
+        ttk.Entry(trigger_frame, width=8, textvariable=controls["color_var"]).grid(row=0, column=1, padx=(5, 0))
+        controls["pixel_button"] = ttk.Button(trigger_frame, text="Add Pixel", state="disabled",
+                                              command=lambda: self.add_watch_pixel(index))
+        controls["pixel_button"].grid(row=0, column=2, padx=(10, 0))
+        controls["pixel_clear_button"] = ttk.Button(trigger_frame, text="Clear", state="disabled",
+                                                    command=lambda: self.clear_watch_pixels(index))
+        controls["pixel_clear_button"].grid(row=0, column=3, padx=(5, 0))
+        controls["pixel_label"] = ttk.Label(trigger_frame, text="Pixels: None",
+                                            font=("Arial", 9), foreground="gray")
+        controls["pixel_label"].grid(row=1, column=0, columnspan=4, sticky=tk.W, pady=(2, 0))
+        
+        # Clicks per fire: "1", "double", "triple" or "5x20ms", with the left button
+        burst_frame = ttk.Frame(coord_frame)
+        burst_frame.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        ttk.Label(burst_frame, text="Clicks per fire:").grid(row=0, column=0, sticky=tk.W)
+        controls["burst_var"] = tk.StringVar(value="1")
+        ttk.Entry(burst_frame, width=10, textvariable=controls["burst_var"]).grid(row=0, column=1, padx=(5, 0))
+        
+        # Status and control
+        controls["status_var"] = tk.StringVar(value="OFF")
+        controls["status_label"] = ttk.Label(row, textvariable=controls["status_var"], 
+                                             font=("Arial", 12, "bold"))
+        controls["status_label"].grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
         
-        # Reset start_time if no clickers are active
-        if not self.primary_active:
-            self.start_time = None
+        controls["button"] = ttk.Button(row, text=f"Start {name}",
+                                        command=lambda: self.toggle_clicker(index))
+        controls["button"].grid(row=2, column=1, sticky=tk.E, pady=(5, 0))
         
-        self.log_message("Secondary clicker stopped")
-        self.update_stop_all_button()
+        self.clicker_controls.append(controls)
+    
+    def add_clicker(self):
+        """Append a delta clicker to the table and show its controls."""
+        index = len(self.engine.table)
+        name = f"Extra {index + 1}"
+        self.engine.add_clicker(name, self.engine.table.interval_ns[0] / 1e9, offset=index,
+                                flags=FLAG_FOLLOW)
+        self.create_clicker_controls(index)
+        self.clicker_controls[index]["enabled_var"].set(True)
+        self.toggle_clicker_enable(index)
     
-    def toggle_tertiary(self):
-        """Toggle tertiary clicker on/off."""
-        if not self.tertiary_active:
-            self.start_tertiary()
+    def clicker_enabled(self, index):
+        """True when the clicker's controls are shown."""
+        return index == 0 or self.clicker_controls[index]["enabled_var"].get()
+    
+    def toggle_clicker(self, index):
+        """Toggle a clicker on/off."""
+        if not self.engine.is_active(index):
+            self.start_clicker(index)
         else:
-            self.stop_tertiary()
+            self.stop_clicker(index)
     
-    def start_tertiary(self):
-        """Start tertiary clicker."""
+    def start_clicker(self, index):
+        """Read a clicker's settings from its controls and start it.
+        
+        Starting the first clicker re-anchors the shared start time, so the
+        running delta clickers stay in step with it.
+        """
+        engine = self.engine
+        controls = self.clicker_controls[index]
+        name = engine.table.names[index]
+        high_rate = index == 0 and controls["high_rate_var"].get()
+        if high_rate and engine.any_active():
+            messagebox.showerror("Error", "Stop the other clickers before using high-rate mode")
+            return
+        if index > 0 and engine.is_active(0) and engine.table.flags[0] & FLAG_HIGH_RATE:
+            messagebox.showerror("Error", f"{name} clicker is not available in high-rate mode")
+            return
         try:
-            self.tertiary_interval = int(self.tertiary_interval_var.get())
-            if self.tertiary_interval <= 0:
-                messagebox.showerror("Error", "Interval must be greater than 0")
-                return
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid number for interval")
+            if high_rate:
+                interval = parse_rate(controls["interval_var"].get())
+            else:
+                interval = float(controls["interval_var"].get())
+                if interval <= 0:
+                    messagebox.showerror("Error", "Interval must be greater than 0")
+                    return
+        except ValueError as e:
+            messagebox.showerror("Error", str(e) if high_rate else "Please enter a valid number for interval")
             return
+        try:
+            burst = parse_burst(controls["burst_var"].get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        trigger = None
+        if controls["pixel_var"].get():
+            if high_rate:
+                messagebox.showerror("Error", "High-rate mode cannot fire on a pixel trigger")
+                return
+            if not controls["pixels"]:
+                messagebox.showerror("Error", "Add a pixel to watch first")
+                return
+            try:
+                trigger = PixelTrigger(controls["pixels"], controls["color_var"].get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+        engine.attach_trigger(index, trigger)
+        engine.set_burst(index, burst if burst.count > 1 else None)
+        
+        if index == 0:
+            engine.configure(0, interval=interval, flags=FLAG_HIGH_RATE if high_rate else 0)
+            if high_rate:
+                self.rate_meters[0] = RateMeter(interval)
+            engine.start(0, reanchor=True)
+        else:
+            engine.configure(index, offset=interval)
+            engine.start(index)
         
-        self.tertiary_active = True
-        if self.start_time is None:
-            self.start_time = time.time()
-        self.tertiary_status_var.set("ON")
-        self.tertiary_status_label.configure(foreground="green")
-        self.tertiary_button.configure(text="Stop Tertiary")
-        
-        # Master timer thread already running, no need to start new thread
-        
-        self.log_message("Tertiary clicker started")
+        self.update_clicker_status(index)
+        self.log_message(f"{name} clicker started")
         self.update_stop_all_button()
     
-    def stop_tertiary(self):
-        """Stop tertiary clicker."""
-        self.tertiary_active = False
-        self.tertiary_status_var.set("OFF")
-        self.tertiary_status_label.configure(foreground="red")
-        self.tertiary_button.configure(text="Start Tertiary")
-        
-        # Reset start_time if no clickers are active
-        if not self.primary_active and not self.secondary_active:
-            self.start_time = None
-        
-        self.log_message("Tertiary clicker stopped")
+    def stop_clicker(self, index):
+        """Stop a clicker."""
+        engine = self.engine
+        name = engine.table.names[index]
+        engine.stop(index)
+        meter = self.rate_meters.pop(index, None)
+        if meter is not None:
+            self.log_message(f"{name} overall rate: {meter.report(meter.overall_rate())}")
+        if index in engine.triggers and engine.table.fires[index]:
+            row = engine.table.row(index)
+            self.log_message(f"{name} detection-to-click: mean {row['mean_lateness_ms']:.2f} ms, "
+                             f"max {row['max_lateness_ms']:.2f} ms over {row['fires']} clicks")
+        self.update_clicker_status(index)
+        self.log_message(f"{name} clicker stopped")
         self.update_stop_all_button()
     
-    def toggle_secondary_enable(self):
-        """Enable/disable secondary clicker controls."""
-        if self.secondary_enabled_var.get():
-            self.create_secondary_controls()
-            self.log_message("Secondary clicker enabled")
-        else:
-            if self.secondary_active:
-                self.stop_secondary()
-            self.hide_secondary_controls()
-            self.log_message("Secondary clicker disabled")
-    
-    def toggle_tertiary_enable(self):
-        """Enable/disable tertiary clicker controls."""
-        if self.tertiary_enabled_var.get():
-            self.create_tertiary_controls()
-            self.log_message("Tertiary clicker enabled")
+    def update_clicker_status(self, index):
+        """Show a clicker's running state on its status label and button."""
+        controls = self.clicker_controls[index]
+        name = self.engine.table.names[index]
+        if self.engine.is_active(index):
+            controls["status_var"].set("ON")
+            controls["status_label"].configure(foreground="green")
+            controls["button"].configure(text=f"Stop {name}")
         else:
-            if self.tertiary_active:
-                self.stop_tertiary()
-            self.hide_tertiary_controls()
-            self.log_message("Tertiary clicker disabled")
-    
-    def create_secondary_controls(self):
-        """Create secondary clicker controls."""
-        self.secondary_controls_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
-        self.secondary_controls_frame.columnconfigure(1, weight=1)
-        
-        # Secondary interval
-        ttk.Label(self.secondary_controls_frame, text="Delta from Primary (seconds):").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.secondary_interval_var = tk.StringVar(value="1")
-        self.secondary_spinbox = ttk.Spinbox(self.secondary_controls_frame, from_=1, to=3600, width=10,
-                                           textvariable=self.secondary_interval_var)
-        self.secondary_spinbox.grid(row=0, column=1, sticky=tk.W)
-        
-        # Secondary coordinate settings
-        sec_coord_frame = ttk.Frame(self.secondary_controls_frame)
-        sec_coord_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
-        
-        self.secondary_coord_var = tk.BooleanVar()
-        sec_coord_check = ttk.Checkbutton(sec_coord_frame, text="Use fixed coordinates",
-                                        variable=self.secondary_coord_var, command=self.toggle_secondary_coords)
-        sec_coord_check.grid(row=0, column=0, sticky=tk.W)
-        
-        self.secondary_coord_button = ttk.Button(sec_coord_frame, text="Set Coordinates", 
-                                               command=self.set_secondary_coordinates, state="disabled")
-        self.secondary_coord_button.grid(row=0, column=1, sticky=tk.E, padx=(10, 0))
-        
-        self.secondary_coord_label = ttk.Label(sec_coord_frame, text="Coordinates: Not set", 
-                                             font=("Arial", 9), foreground="gray")
-        self.secondary_coord_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
-        
-        # Secondary status and control
-        self.secondary_status_var = tk.StringVar(value="OFF")
-        self.secondary_status_label = ttk.Label(self.secondary_controls_frame, textvariable=self.secondary_status_var,
-                                               font=("Arial", 12, "bold"))
-        self.secondary_status_label.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
-        
-        self.secondary_button = ttk.Button(self.secondary_controls_frame, text="Start Secondary",
-                                         command=self.toggle_secondary)
-        self.secondary_button.grid(row=2, column=1, sticky=tk.E, pady=(5, 0))
-    
-    def create_tertiary_controls(self):
-        """Create tertiary clicker controls."""
-        self.tertiary_controls_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
-        self.tertiary_controls_frame.columnconfigure(1, weight=1)
-        
-        # Tertiary interval
-        ttk.Label(self.tertiary_controls_frame, text="Delta from Primary (seconds):").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.tertiary_interval_var = tk.StringVar(value="2")
-        self.tertiary_spinbox = ttk.Spinbox(self.tertiary_controls_frame, from_=1, to=3600, width=10,
-                                          textvariable=self.tertiary_interval_var)
-        self.tertiary_spinbox.grid(row=0, column=1, sticky=tk.W)
-        
-        # Tertiary coordinate settings
-        tert_coord_frame = ttk.Frame(self.tertiary_controls_frame)
-        tert_coord_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
-        
-        self.tertiary_coord_var = tk.BooleanVar()
-        tert_coord_check = ttk.Checkbutton(tert_coord_frame, text="Use fixed coordinates",
-                                         variable=self.tertiary_coord_var, command=self.toggle_tertiary_coords)
-        tert_coord_check.grid(row=0, column=0, sticky=tk.W)
-        
-        self.tertiary_coord_button = ttk.Button(tert_coord_frame, text="Set Coordinates", 
-                                              command=self.set_tertiary_coordinates, state="disabled")
-        self.tertiary_coord_button.grid(row=0, column=1, sticky=tk.E, padx=(10, 0))
-        
-        self.tertiary_coord_label = ttk.Label(tert_coord_frame, text="Coordinates: Not set", 
-                                            font=("Arial", 9), foreground="gray")
-        self.tertiary_coord_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
-        
-        # Tertiary status and control
-        self.tertiary_status_var = tk.StringVar(value="OFF")
-        self.tertiary_status_label = ttk.Label(self.tertiary_controls_frame, textvariable=self.tertiary_status_var,
-                                              font=("Arial", 12, "bold"))
-        self.tertiary_status_label.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
-        
-        self.tertiary_button = ttk.Button(self.tertiary_controls_frame, text="Start Tertiary",
-                                        command=self.toggle_tertiary)
-        self.tertiary_button.grid(row=2, column=1, sticky=tk.E, pady=(5, 0))
-    
-    def hide_secondary_controls(self):
-        """Hide secondary clicker controls."""
-        self.secondary_controls_frame.grid_remove()
-    
-    def hide_tertiary_controls(self):
-        """Hide tertiary clicker controls."""
-        self.tertiary_controls_frame.grid_remove()
-    
-    def toggle_primary_coords(self):
-        """Toggle primary coordinate mode."""
-        self.primary_use_coordinates = self.primary_coord_var.get()
-        if self.primary_use_coordinates:
-            self.primary_coord_button.configure(state="normal")
-            self.log_message("Primary clicker: Coordinate mode enabled")
+            controls["status_var"].set("OFF")
+            controls["status_label"].configure(foreground="red")
+            controls["button"].configure(text=f"Start {name}")
+    
+    def toggle_clicker_enable(self, index):
+        """Show or hide a delta clicker's controls."""
+        controls = self.clicker_controls[index]
+        name = self.engine.table.names[index]
+        if controls["enabled_var"].get():
+            controls["frame"].grid(row=2 * index, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(5, 0))
+            self.log_message(f"{name} clicker enabled")
         else:
-            self.primary_coord_button.configure(state="disabled")
-            self.log_message("Primary clicker: Mouse tracking mode")
-    
-    def toggle_secondary_coords(self):
-        """Toggle secondary coordinate mode."""
-        self.secondary_use_coordinates = self.secondary_coord_var.get()
-        if self.secondary_use_coordinates:
-            self.secondary_coord_button.configure(state="normal")
-            self.log_message("Secondary clicker: Coordinate mode enabled")
+            if self.engine.is_active(index):
+                self.stop_clicker(index)
+            controls["frame"].grid_remove()
+            self.log_message(f"{name} clicker disabled")
+    
+    def toggle_primary_high_rate(self):
+        """Switch the primary interval field between seconds and a click rate."""
+        controls = self.clicker_controls[0]
+        if controls["high_rate_var"].get():
+            controls["interval_label"].configure(text="Rate (clicks/sec or ms):")
+            controls["interval_var"].set("100")
+            self.log_message("Primary clicker: High-rate mode (e.g. 500 or 2ms)")
         else:
-            self.secondary_coord_button.configure(state="disabled")
-            self.log_message("Secondary clicker: Mouse tracking mode")
-    
-    def toggle_tertiary_coords(self):
-        """Toggle tertiary coordinate mode."""
-        self.tertiary_use_coordinates = self.tertiary_coord_var.get()
-        if self.tertiary_use_coordinates:
-            self.tertiary_coord_button.configure(state="normal")
-            self.log_message("Tertiary clicker: Coordinate mode enabled")
+            controls["interval_label"].configure(text="Interval (seconds):")
+            controls["interval_var"].set("5")
+            self.log_message("Primary clicker: Normal mode")
+    
+    def toggle_clicker_coords(self, index):
+        """Toggle a clicker between fixed coordinates and mouse tracking."""
+        controls = self.clicker_controls[index]
+        name = self.engine.table.names[index]
+        if controls["coord_var"].get():
+            self.engine.configure(index, mode=MODE_FIXED)
+            controls["coord_button"].configure(state="normal")
+            self.log_message(f"{name} clicker: Coordinate mode enabled")
         else:
-            self.tertiary_coord_button.configure(state="disabled")
-            self.log_message("Tertiary clicker: Mouse tracking mode")
+            self.engine.configure(index, mode=MODE_TRACK)
+            controls["coord_button"].configure(state="disabled")
+            self.log_message(f"{name} clicker: Mouse tracking mode")
     
-    def set_primary_coordinates(self):
-        """Set primary clicker coordinates by clicking."""
+    def set_clicker_coordinates(self, index):
+        """Set a clicker's coordinates by clicking."""
+        name = self.engine.table.names[index]
         self.root.withdraw()  # Hide window
-        self.log_message("Click anywhere to set primary coordinates...")
+        self.log_message(f"Click anywhere to set {name.lower()} coordinates...")
         
         def on_click(x, y, button, pressed):
             if pressed:
-                self.primary_click_x = x
-                self.primary_click_y = y
-                self.primary_coord_label.configure(text=f"Coordinates: ({x}, {y})", foreground="green")
-                self.log_message(f"Primary coordinates set to ({x}, {y})")
-                self.log_message(f"DEBUG: Stored coordinates are now ({self.primary_click_x}, {self.primary_click_y})")
+                self.engine.configure(index, x=x, y=y)
+                self.clicker_controls[index]["coord_label"].configure(
+                    text=f"Coordinates: ({x}, {y})", foreground="green")
+                self.log_message(f"{name} coordinates set to ({x}, {y})")
                 self.root.deiconify()  # Show window again
                 return False  # Stop listener
         
@@ -604,122 +692,149 @@ class AutoclickerGUI:
         listener = mouse.Listener(on_click=on_click)
         listener.start()
     
-    def set_secondary_coordinates(self):
-        """Set secondary clicker coordinates by clicking."""
-        self.root.withdraw()  # Hide window
-        self.log_message("Click anywhere to set secondary coordinates...")
-        
-        def on_click(x, y, button, pressed):
-            if pressed:
-                self.secondary_click_x = x
-                self.secondary_click_y = y
-                self.secondary_coord_label.configure(text=f"Coordinates: ({x}, {y})", foreground="green")
-                self.log_message(f"Secondary coordinates set to ({x}, {y})")
-                self.root.deiconify()  # Show window again
-                return False  # Stop listener
-        
-        # Start mouse listener
-        from pynput import mouse
-        listener = mouse.Listener(on_click=on_click)
-        listener.start()
+    def toggle_clicker_pixel_trigger(self, index):
+        """Switch a clicker between its interval and a pixel trigger (from its next start)."""
+        controls = self.clicker_controls[index]
+        name = self.engine.table.names[index]
+        state = "normal" if controls["pixel_var"].get() else "disabled"
+        controls["pixel_button"].configure(state=state)
+        controls["pixel_clear_button"].configure(state=state)
+        if controls["pixel_var"].get():
+            self.log_message(f"{name} clicker: fires when the watched pixels turn "
+                             f"{controls['color_var'].get()} (applies on start)")
+        else:
+            self.log_message(f"{name} clicker: fires on its interval (applies on start)")
     
-    def set_tertiary_coordinates(self):
-        """Set tertiary clicker coordinates by clicking."""
+    def add_watch_pixel(self, index):
+        """Add a pixel for a clicker's trigger to watch by clicking it."""
+        name = self.engine.table.names[index]
+        controls = self.clicker_controls[index]
         self.root.withdraw()  # Hide window
-        self.log_message("Click anywhere to set tertiary coordinates...")
+        self.log_message(f"Click the pixel {name.lower()} should watch...")
         
         def on_click(x, y, button, pressed):
             if pressed:
-                self.tertiary_click_x = x
-                self.tertiary_click_y = y
-                self.tertiary_coord_label.configure(text=f"Coordinates: ({x}, {y})", foreground="green")
-                self.log_message(f"Tertiary coordinates set to ({x}, {y})")
+                controls["pixels"].append((x, y))
+                controls["pixel_label"].configure(
+                    text="Pixels: " + ", ".join(f"({px}, {py})" for px, py in controls["pixels"]),
+                    foreground="green")
+                try:
+                    data = self.backend.grab(x, y, 1, 1)[2]
+                    self.log_message(f"{name} watches ({x}, {y}), now #{data[2]:02x}{data[1]:02x}{data[0]:02x}")
+                except Exception:
+                    self.log_message(f"{name} watches ({x}, {y})")
                 self.root.deiconify()  # Show window again
                 return False  # Stop listener
         
-        # Start mouse listener
         from pynput import mouse
         listener = mouse.Listener(on_click=on_click)
         listener.start()
     
+    def clear_watch_pixels(self, index):
+        """Forget a clicker's watched pixels."""
+        controls = self.clicker_controls[index]
+        controls["pixels"].clear()
+        controls["pixel_label"].configure(text="Pixels: None", foreground="gray")
+    
+    def apply_clicker_settings(self, index, interval=None, offset=None, x=None, y=None, burst=None):
+        """Put settings into a clicker's controls (and the engine while it runs).
+        
+        The first clicker's field is its interval; the others show their delta.
+        """
+        controls = self.clicker_controls[index]
+        if index > 0 and offset is not None:
+            interval = offset
+        if interval is not None:
+            controls["interval_var"].set(f"{interval:g}")
+            if self.engine.is_active(index):
+                if index == 0:
+                    self.engine.configure(0, interval=interval)
+                else:
+                    self.engine.configure(index, offset=interval)
+        if x is not None:
+            self.engine.configure(index, x=x, y=y, mode=MODE_FIXED)
+            controls["coord_var"].set(True)
+            controls["coord_button"].configure(state="normal")
+            controls["coord_label"].configure(text=f"Coordinates: ({x}, {y})", foreground="green")
+        if burst is not None:
+            controls["burst_var"].set(str(burst))
+            if self.engine.is_active(index):
+                burst = parse_burst(burst)
+                self.engine.set_burst(index, burst if burst.count > 1 else None)
+        self.log_message(f"{self.engine.table.names[index]} settings changed by control socket")
+    
     def stop_all(self):
         """Stop all clickers."""
-        if self.primary_active:
-            self.stop_primary()
-        if self.secondary_active:
-            self.stop_secondary()
-        if self.tertiary_active:
-            self.stop_tertiary()
+        for index in range(len(self.engine.table)):
+            if self.engine.is_active(index):
+                self.stop_clicker(index)
         self.log_message("All clickers stopped")
     
-    
-    def master_timer_thread(self):
-        """Master timer thread that handles all clickers."""
-        last_primary_click = 0
-        last_secondary_click = 0
-        last_tertiary_click = 0
-        
-        while self.primary_active or self.secondary_active or self.tertiary_active:
-            if self.start_time is not None:
-                current_time = time.time()
-                elapsed = current_time - self.start_time
-                
-                # Primary clicker (master timing)
-                if self.primary_active:
-                    if elapsed % self.primary_interval < 0.1 and elapsed - last_primary_click >= self.primary_interval * 0.9:
-                        if self.primary_use_coordinates:
-                            pyautogui.click(self.primary_click_x, self.primary_click_y)
-                            self.root.after(0, lambda: self.log_message(f"Primary click at {elapsed:.1f}s at fixed coordinates ({self.primary_click_x}, {self.primary_click_y})"))
-                        else:
-                            current_x, current_y = pyautogui.position()
-                            pyautogui.click(current_x, current_y)
-                            self.root.after(0, lambda: self.log_message(f"Primary click at {elapsed:.1f}s at mouse position ({current_x}, {current_y})"))
-                        last_primary_click = elapsed
-                
-                # Secondary clicker (delta from primary)
-                if self.secondary_active:
-                    secondary_trigger_time = (elapsed % self.primary_interval) - self.secondary_interval
-                    if abs(secondary_trigger_time) < 0.1 and elapsed - last_secondary_click >= self.primary_interval * 0.9:
-                        if self.secondary_use_coordinates:
-                            pyautogui.click(self.secondary_click_x, self.secondary_click_y)
-                            self.root.after(0, lambda: self.log_message(f"Secondary click at {elapsed:.1f}s at fixed coordinates ({self.secondary_click_x}, {self.secondary_click_y})"))
-                        else:
-                            current_x, current_y = pyautogui.position()
-                            pyautogui.click(current_x, current_y)
-                            self.root.after(0, lambda: self.log_message(f"Secondary click at {elapsed:.1f}s at mouse position ({current_x}, {current_y})"))
-                        last_secondary_click = elapsed
-                
-                # Tertiary clicker (delta from primary)
-                if self.tertiary_active:
-                    tertiary_trigger_time = (elapsed % self.primary_interval) - self.tertiary_interval
-                    if abs(tertiary_trigger_time) < 0.1 and elapsed - last_tertiary_click >= self.primary_interval * 0.9:
-                        if self.tertiary_use_coordinates:
-                            pyautogui.click(self.tertiary_click_x, self.tertiary_click_y)
-                            self.root.after(0, lambda: self.log_message(f"Tertiary click at {elapsed:.1f}s at fixed coordinates ({self.tertiary_click_x}, {self.tertiary_click_y})"))
-                        else:
-                            current_x, current_y = pyautogui.position()
-                            pyautogui.click(current_x, current_y)
-                            self.root.after(0, lambda: self.log_message(f"Tertiary click at {elapsed:.1f}s at mouse position ({current_x}, {current_y})"))
-                        last_tertiary_click = elapsed
-            time.sleep(0.01)
-    
+    def on_engine_click(self, index, x, y, lateness_ns):
+        """Engine callback: log each click, or the achieved rate once per second in high-rate mode."""
+        table = self.engine.table
+        name = table.names[index]
+        if table.flags[index] & FLAG_HIGH_RATE:
+            meter = self.rate_meters.get(index)
+            rate = meter.tick() if meter is not None else None
+            if rate is not None:
+                self.log_message(f"{name} rate: {meter.report(rate)}, missed {table.missed[index]}")
+            return
+        if index in self.engine.triggers:
+            self.log_message(f"{name} triggered click at ({x}, {y}), "
+                             f"detection-to-click {lateness_ns / 1e6:.2f} ms")
+            return
+        where = "fixed coordinates" if table.mode[index] == MODE_FIXED else "mouse position"
+        self.log_message(f"{name} click at {self.engine.elapsed(index):.1f}s at {where} ({x}, {y}) "
+                         f"[+{lateness_ns / 1e6:.2f} ms]")
     
     def update_stop_all_button(self):
         """Update stop all button state."""
-        if self.primary_active or self.secondary_active or self.tertiary_active:
+        if self.engine.any_active():
             self.stop_all_button.configure(state="normal")
         else:
             self.stop_all_button.configure(state="disabled")
     
     def log_message(self, message):
-        """Add message to status log."""
+        """Queue a message for the status log (safe to call from any thread)."""
+        self.log_ring.push(message)
+    
+    def drain_log(self):
+        """Flush queued log messages into the status widget as one batch."""
+        records, dropped = self.log_ring.drain()
+        if records or dropped:
+            try:
+                self.status_text.insert(tk.END, format_batch(records, dropped))
+                # Trim the widget to the configured number of lines
+                lines = int(self.status_text.index("end-1c").split(".")[0])
+                if lines > self.log_max_lines:
+                    self.status_text.delete("1.0", f"{lines - self.log_max_lines}.0")
+                self.status_text.see(tk.END)
+            except tk.TclError:
+                # GUI might be destroyed, ignore logging errors
+                return
+        self.root.after(LOG_DRAIN_MS, self.drain_log)
+    
+    def refresh_dashboard(self):
+        """Redraw the dashboard and playback progress from one snapshot, DASHBOARD_HZ times a second."""
         try:
-            timestamp = time.strftime("%H:%M:%S")
-            self.status_text.insert(tk.END, f"[{timestamp}] {message}\n")
-            self.status_text.see(tk.END)
-        except:
-            # GUI might be destroyed, ignore logging errors
-            pass
+            for index, values in enumerate(self.dashboard.update(self.engine.snapshot())):
+                if self.dashboard_rows.get(index) == values:
+                    continue
+                if index in self.dashboard_rows:
+                    self.dashboard_tree.item(index, values=values)
+                else:
+                    self.dashboard_tree.insert("", tk.END, iid=index, values=values)
+                self.dashboard_rows[index] = values
+            player = self.player
+            if self.playing and player is not None:
+                status, progress = format_playback(player.progress, self.replay_count)
+                self.playback_status_var.set(status)
+                self.progress_var.set(progress)
+        except tk.TclError:
+            # GUI is being destroyed
+            return
+        self.root.after(DASHBOARD_MS, self.refresh_dashboard)
     
     def toggle_recording(self):
         """Toggle recording on/off."""
@@ -730,79 +845,241 @@ class AutoclickerGUI:
     
     def start_recording(self):
         """Start recording clicks."""
+        self.close_sequence()
+        self.recorder = ClickRecorder()
         self.recording = True
-        self.recorded_clicks = []
         self.recording_status_var.set("Recording...")
         self.recording_status_label.configure(foreground="red")
         self.record_button.configure(text="Stop Recording")
         self.clear_button.configure(state="disabled")
         self.play_button.configure(state="disabled")
+        self.save_button.configure(state="disabled")
         
-        # Clear sequence display
-        self.sequence_text.configure(state="normal")
-        self.sequence_text.delete(1.0, tk.END)
-        self.sequence_text.insert(tk.END, "Recording... Click anywhere to record clicks.\n")
-        self.sequence_text.configure(state="disabled")
+        self.show_sequence_message("Recording... Click anywhere to record clicks.")
         
         self.log_message("Recording started - click anywhere to record")
         
         # Start mouse listener for recording
         self.start_click_listener()
+        self.root.after(RECORDING_STATUS_MS, self.update_recording_status)
     
     def stop_recording(self):
         """Stop recording clicks."""
         self.recording = False
+        if self.click_listener is not None:
+            self.click_listener.stop()
+            self.click_listener = None
+        self.recorder.finish()
+        self.sequence = self.recorder
         self.recording_status_var.set("Recording Stopped")
         self.recording_status_label.configure(foreground="green")
         self.record_button.configure(text="Start Recording")
         self.clear_button.configure(state="normal")
         
-        if self.recorded_clicks:
+        if len(self.recorder):
             self.play_button.configure(state="normal")
+            self.save_button.configure(state="normal")
             self.update_sequence_display()
-            self.log_message(f"Recording stopped - {len(self.recorded_clicks)} clicks recorded")
+            self.log_message(f"Recording stopped - {len(self.recorder)} clicks recorded")
         else:
             self.log_message("Recording stopped - no clicks recorded")
     
+    def update_recording_status(self):
+        """Show the running click count while recording."""
+        if not self.recording:
+            return
+        self.recording_status_var.set(f"Recording... ({len(self.recorder)} events)")
+        self.root.after(RECORDING_STATUS_MS, self.update_recording_status)
+    
     def start_click_listener(self):
-        """Start listening for clicks to record."""
+        """Start listening for clicks (and moves, if enabled) to record.
+        
+        The callbacks run on the pynput thread and only store the event;
+        the count is shown by update_recording_status. Moves pass through a
+        PathSimplifier, which is flushed before each click so the path ends
+        where the click happens.
+        """
+        recorder = self.recorder
+        record = recorder.record
+        on_move = None
+        if self.record_motion_var.get():
+            try:
+                tolerance = max(float(self.path_tolerance_var.get()), 0.0)
+            except ValueError:
+                tolerance = PATH_TOLERANCE
+            clock = recorder.clock
+            path = PathSimplifier(lambda t_ns, x, y: record(x, y, MOVE, t_ns), tolerance)
+            
+            def on_move(x, y):
+                if self.recording:
+                    path.add(clock(), x, y)
+        
         def on_click(x, y, button, pressed):
             if pressed and self.recording:
-                click_time = time.time()
-                self.recorded_clicks.append({
-                    'x': x, 'y': y, 'button': str(button), 'time': click_time
-                })
-                self.log_message(f"Recorded click at ({x}, {y})")
+                if on_move is not None:
+                    path.flush()
+                record(x, y, button_code(button))
         
         from pynput import mouse
-        self.click_listener = mouse.Listener(on_click=on_click)
+        self.click_listener = mouse.Listener(on_click=on_click, on_move=on_move)
         self.click_listener.start()
         self.log_message("Click listener started successfully")
     
     def update_sequence_display(self):
-        """Update the sequence display."""
+        """Show the current sequence from its first event, unfiltered."""
+        self.sequence_view = SequenceView(self.sequence) if self.sequence is not None else None
+        self.sequence_top = 0
+        self.sequence_button_var.set("all")
+        self.sequence_region_var.set("")
+        if self.sequence_view is None or not self.sequence_view.total:
+            self.show_sequence_message("No clicks recorded.")
+        else:
+            self.render_sequence_page()
+    
+    def show_sequence_message(self, message):
+        """Replace the sequence view with a message."""
+        self.sequence_view = None
         self.sequence_text.configure(state="normal")
         self.sequence_text.delete(1.0, tk.END)
-        
-        if not self.recorded_clicks:
-            self.sequence_text.insert(tk.END, "No clicks recorded.")
-        else:
-            self.sequence_text.insert(tk.END, f"Recorded {len(self.recorded_clicks)} clicks:\n\n")
-            for i, click in enumerate(self.recorded_clicks):
-                self.sequence_text.insert(tk.END, f"{i+1}. Click at ({click['x']}, {click['y']}) - {click['button']}\n")
-        
+        self.sequence_text.insert(tk.END, message)
         self.sequence_text.configure(state="disabled")
+        self.sequence_scrollbar.set(0, 1)
+        self.sequence_info_var.set("")
     
-    def clear_sequence(self):
-        """Clear the recorded sequence."""
-        self.recorded_clicks = []
+    def render_sequence_page(self):
+        """Draw the rows on screen; reads SEQUENCE_PAGE_ROWS events whatever the length."""
+        view = self.sequence_view
+        rows = len(view)
+        self.sequence_top = max(0, min(self.sequence_top, rows - SEQUENCE_PAGE_ROWS))
+        page = view.rows(self.sequence_top, SEQUENCE_PAGE_ROWS)
         self.sequence_text.configure(state="normal")
         self.sequence_text.delete(1.0, tk.END)
-        self.sequence_text.insert(tk.END, "Sequence cleared.")
+        self.sequence_text.insert(tk.END, "\n".join(format_event(i, event) for i, event in page))
         self.sequence_text.configure(state="disabled")
+        if rows:
+            self.sequence_scrollbar.set(self.sequence_top / rows, (self.sequence_top + len(page)) / rows)
+            shown = f"Rows {self.sequence_top + 1}-{self.sequence_top + len(page)} of {rows}"
+        else:
+            self.sequence_scrollbar.set(0, 1)
+            shown = "No matching events"
+        if view.filtered:
+            shown += f" matching ({view.scanned} of {view.total} events scanned)"
+        else:
+            shown += " events"
+        self.sequence_info_var.set(shown)
+    
+    def scroll_sequence(self, action, amount, unit=None):
+        """Scrollbar command: move the page to a fraction or by rows/pages."""
+        if self.sequence_view is None:
+            return
+        if action == "moveto":
+            self.sequence_top = int(float(amount) * len(self.sequence_view))
+        else:
+            step = SEQUENCE_PAGE_ROWS if unit == "pages" else 1
+            self.sequence_top += int(amount) * step
+        self.render_sequence_page()
+    
+    def on_sequence_wheel(self, event):
+        """Scroll the sequence view three rows per wheel notch."""
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_sequence("scroll", -3, "units")
+        else:
+            self.scroll_sequence("scroll", 3, "units")
+        return "break"
+    
+    def jump_to_sequence_index(self):
+        """Show the event numbered in the Go to entry (or the next match)."""
+        if self.sequence_view is None:
+            return
+        try:
+            number = int(self.sequence_jump_var.get())
+        except ValueError:
+            messagebox.showerror("Error", "Enter an event number to go to")
+            return
+        self.sequence_top = self.sequence_view.row_of(number - 1)
+        self.render_sequence_page()
+    
+    def apply_sequence_filter(self):
+        """Filter the view by button and region, scanning in batches between redraws."""
+        if self.sequence_view is None:
+            return
+        button = self.sequence_button_var.get()
+        try:
+            self.sequence_view.set_filter(None if button == "all" else button,
+                                          parse_region(self.sequence_region_var.get()))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.sequence_top = 0
+        self.scan_sequence_filter(self.sequence_view)
+    
+    def scan_sequence_filter(self, view):
+        """Scan one batch for the filter and redraw; repeats until the view is complete."""
+        if view is not self.sequence_view:
+            return  # the sequence was replaced or cleared
+        done = view.scan()
+        self.render_sequence_page()
+        if not done:
+            self.root.after(SEQUENCE_SCAN_MS, self.scan_sequence_filter, view)
+    
+    def clear_sequence(self):
+        """Clear the recorded sequence."""
+        self.close_sequence()
+        self.show_sequence_message("Sequence cleared.")
         self.play_button.configure(state="disabled")
+        self.save_button.configure(state="disabled")
         self.log_message("Sequence cleared")
     
+    def close_sequence(self):
+        """Release the current sequence (spill file or file mapping)."""
+        self.sequence_view = None
+        if self.sequence is not None:
+            self.sequence.close()
+            self.sequence = None
+        self.recorder = None
+    
+    def save_sequence(self):
+        """Save the current sequence to a binary sequence file."""
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(defaultextension=EXTENSION,
+                                            filetypes=[("Click sequences", f"*{EXTENSION}")])
+        if not path:
+            return
+        try:
+            if isinstance(self.sequence, SequenceFile):
+                count = len(self.sequence)
+                shutil.copyfile(self.sequence.path, path)
+            else:
+                count = save_recording(self.sequence, path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save sequence: {e}")
+            return
+        self.log_message(f"Saved {count} clicks to {path}")
+    
+    def load_sequence(self):
+        """Load a binary sequence file for playback (memory-mapped, not read)."""
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(filetypes=[("Click sequences", f"*{EXTENSION}"),
+                                                     ("All files", "*")])
+        if not path:
+            return
+        try:
+            sequence = SequenceFile(path)
+        except (OSError, SequenceFormatError) as e:
+            messagebox.showerror("Error", f"Could not load sequence: {e}")
+            return
+        self.show_sequence(sequence, path)
+    
+    def show_sequence(self, sequence, path):
+        """Make an opened SequenceFile the playable sequence."""
+        self.close_sequence()
+        self.sequence = sequence
+        self.update_sequence_display()
+        self.play_button.configure(state="normal" if len(sequence) else "disabled")
+        self.save_button.configure(state="normal")
+        self.clear_button.configure(state="normal")
+        self.log_message(f"Loaded {len(sequence)} clicks from {path}")
+    
     
     def toggle_playback(self):
         """Toggle playback on/off."""
@@ -813,19 +1090,35 @@ class AutoclickerGUI:
     
     def start_playback(self):
         """Start playing the recorded sequence."""
-        if not self.recorded_clicks:
+        if self.sequence is None or not len(self.sequence):
             messagebox.showerror("Error", "No sequence recorded to play!")
             return
         
         try:
             self.replay_count = int(self.repeat_var.get())
-            self.replay_interval = int(self.replay_interval_var.get())
+            self.replay_interval = float(self.replay_interval_var.get())
+            speed = float(self.speed_var.get())
+            max_gap = float(self.max_gap_var.get())
+            move_rate = float(self.move_rate_var.get())
         except ValueError:
-            messagebox.showerror("Error", "Please enter valid numbers for repeat count and interval!")
+            messagebox.showerror("Error", "Please enter valid numbers for repeat count, interval, speed and gap!")
+            return
+        try:
+            burst = parse_burst(self.step_burst_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
+        if speed <= 0 or move_rate <= 0 or max_gap < 0 or self.replay_interval < 0:
+            messagebox.showerror("Error", "Speed and move rate must be greater than 0; interval and gap cannot be negative")
+            return
+        self.player = SequencePlayer(self.sequence, self.play_click, speed=speed,
+                                     max_gap=max_gap or None, repeat=self.replay_count,
+                                     repeat_interval=self.replay_interval, move_rate=move_rate,
+                                     on_click=self.on_playback_click, on_report=self.on_playback_report,
+                                     click_batch=self.play_click_batch,
+                                     burst=burst if burst.count > 1 else None)
         
         self.playing = True
-        self.current_replay = 0
         self.play_button.configure(text="Stop Playback")
         self.record_button.configure(state="disabled")
         self.clear_button.configure(state="disabled")
@@ -836,9 +1129,21 @@ class AutoclickerGUI:
         self.recorder_thread = threading.Thread(target=self.playback_thread, daemon=True)
         self.recorder_thread.start()
     
+    def play_with_settings(self, settings):
+        """Fill in the playback fields given in settings, then start playback."""
+        for key, var in (("repeat", self.repeat_var), ("repeat_interval", self.replay_interval_var),
+                         ("speed", self.speed_var), ("max_gap", self.max_gap_var),
+                         ("move_rate", self.move_rate_var), ("burst", self.step_burst_var)):
+            if settings.get(key) is not None:
+                var.set(str(settings[key]))
+        if not self.playing:
+            self.start_playback()
+    
     def stop_playback(self):
         """Stop playing the recorded sequence."""
         self.playing = False
+        if self.player is not None:
+            self.player.stop()
         self.play_button.configure(text="Play Sequence")
         self.record_button.configure(state="normal")
         self.clear_button.configure(state="normal")
@@ -847,55 +1152,159 @@ class AutoclickerGUI:
         self.log_message("Playback stopped")
     
     def playback_thread(self):
-        """Thread function for playing back recorded sequence."""
-        for replay in range(self.replay_count):
-            if not self.playing:
-                break
-            
-            self.current_replay = replay + 1
-            self.root.after(0, lambda: self.playback_status_var.set(f"Playing... ({self.current_replay}/{self.replay_count})"))
-            self.root.after(0, lambda: self.progress_var.set(f"Replay {self.current_replay} of {self.replay_count}"))
-            
-            # Play the sequence
-            for i, click in enumerate(self.recorded_clicks):
-                if not self.playing:
-                    break
-                
-                # Wait for the timing (if not first click)
-                if i > 0:
-                    time_diff = click['time'] - self.recorded_clicks[i-1]['time']
-                    if time_diff > 0:
-                        time.sleep(time_diff)
-                
-                # Perform the click
-                pyautogui.click(click['x'], click['y'])
-                self.root.after(0, lambda i=i: self.log_message(f"Playback click {i+1} at ({self.recorded_clicks[i]['x']}, {self.recorded_clicks[i]['y']})"))
-            
-            # Wait between repetitions (if not last)
-            if replay < self.replay_count - 1 and self.replay_interval > 0:
-                time.sleep(self.replay_interval)
-        
-        # Playback finished
-        self.root.after(0, self.stop_playback)
-        self.root.after(0, lambda: self.log_message("Playback completed"))
+        """Thread function for playing back the sequence on absolute deadlines."""
+        player = self.player
+        player.run()
+        
+        # A stop from the user has already reset the controls
+        if not player.stop_event.is_set():
+            self.log_message("Playback completed")
+            self.root.after(0, self.playback_finished, player)
+    
+    def playback_finished(self, player):
+        """Reset the playback controls after a player ran to its end."""
+        if self.player is player and self.playing:
+            self.stop_playback()
+    
+    def play_click(self, x, y, button):
+        """Player callback: perform one click or move."""
+        if button == MOVE:
+            self.backend.move(x, y)
+        else:
+            self.backend.click(x, y, BUTTON_NAMES.get(button, "left"))
+    
+    def play_click_batch(self, events):
+        """Player callback: send coalesced clicks and moves in one backend call."""
+        self.backend.click_batch([(x, y, BUTTON_NAMES.get(button, "left")) for x, y, button in events])
+    
+    def on_playback_click(self, index, x, y, button):
+        """Player callback after each event (progress is shown by the dashboard)."""
+        if button != MOVE:
+            self.log_message(f"Playback click {index+1} at ({x}, {y})")
+    
+    def on_playback_report(self, report):
+        """Player callback with the drift/jitter report of each replay."""
+        self.log_message(report.summary())
     
     def on_closing(self):
         """Handle window closing."""
         self.stop_all()
+        self.engine.shutdown()
         if self.recording:
             self.stop_recording()
         if self.playing:
             self.stop_playback()
         if self.keyboard_listener:
             self.keyboard_listener.stop()
-        if hasattr(self, 'click_listener') and self.click_listener:
-            self.click_listener.stop()
+        self.close_sequence()
+        if self.control_server is not None:
+            self.control_server.close()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        if self.audit is not None:
+            self.audit.close()
+        if self._backend is not None:
+            self._backend.close()
         self.root.destroy()
 
-def main():
+class GUIController(Controller):
+    """Control socket commands routed through the GUI.
+    
+    Changes are queued onto the Tk thread with root.after and answered with
+    {"queued": true}, so the widgets stay in step; queries read the engine
+    directly.
+    """
+    
+    def __init__(self, app):
+        Controller.__init__(self, app.engine)
+        self.app = app
+    
+    def _queue(self, method, *args):
+        self.app.root.after(0, method, *args)
+        return {"queued": True}
+    
+    def is_playing(self):
+        """True while the GUI is playing a sequence."""
+        return self.app.playing
+    
+    def cmd_state(self):
+        """Every clicker row plus the GUI's sequence and playback state."""
+        state = Controller.cmd_state(self)
+        sequence = self.app.sequence
+        if sequence is not None:
+            state["sequence"] = {"path": getattr(sequence, "path", None), "events": len(sequence)}
+        return state
+    
+    def cmd_add(self):
+        """Add a delta clicker, like the Add Clicker button."""
+        return self._queue(self.app.add_clicker)
+    
+    def cmd_start(self, clicker):
+        """Start a clicker with the settings in its controls."""
+        index = self.clicker_index(clicker)
+        return self._queue(lambda: self.engine.is_active(index) or self.app.start_clicker(index))
+    
+    def cmd_stop(self, clicker):
+        """Stop a clicker."""
+        index = self.clicker_index(clicker)
+        return self._queue(lambda: self.engine.is_active(index) and self.app.stop_clicker(index))
+    
+    def cmd_stop_all(self):
+        """Stop every clicker."""
+        return self._queue(self.app.stop_all)
+    
+    def cmd_set(self, clicker, interval=None, offset=None, x=None, y=None, burst=None):
+        """Change a clicker's interval (delta for extra clickers), position or clicks per fire."""
+        index = self.clicker_index(clicker)
+        if (x is None) != (y is None):
+            raise ValueError("x and y must be given together")
+        if index > 0 and interval is not None:
+            raise ValueError(f"{self.engine.table.names[index]} follows the first clicker; set its offset")
+        interval = None if interval is None else parse_interval(interval)
+        offset = None if offset is None else parse_offset(offset)
+        if burst is not None:
+            if isinstance(burst, dict):
+                raise ValueError('The GUI takes clicks per fire as text, e.g. "double" or "5x20ms"')
+            parse_burst(burst)  # reject bad bursts before queueing
+        return self._queue(self.app.apply_clicker_settings, index, interval, offset, x, y, burst)
+    
+    def cmd_load(self, path):
+        """Load a sequence file into the Recorder tab."""
+        if self.app.playing:
+            raise ValueError("Stop playback before loading a sequence")
+        sequence = SequenceFile(path)
+        self._queue(self.app.show_sequence, sequence, path)
+        return {"path": path, "events": len(sequence)}
+    
+    def cmd_play(self, speed=None, repeat=None, repeat_interval=None, max_gap=None, move_rate=None,
+                 burst=None):
+        """Play the sequence; given settings replace the Recorder tab's fields."""
+        if self.app.sequence is None:
+            raise ValueError("No sequence loaded")
+        return self._queue(self.app.play_with_settings,
+                           {"speed": speed, "repeat": repeat, "repeat_interval": repeat_interval,
+                            "max_gap": max_gap, "move_rate": move_rate, "burst": burst})
+    
+    def cmd_stop_playback(self):
+        """Stop the running playback."""
+        return self._queue(lambda: self.app.playing and self.app.stop_playback())
+
+def main(argv=None):
     """Main function."""
+    parser = argparse.ArgumentParser(description="Simple Autoclicker GUI")
+    parser.add_argument("--metrics", metavar="PORT|HOST:PORT|SOCKET",
+                        help="serve Prometheus metrics on a local port or Unix socket")
+    parser.add_argument("--control", metavar="SOCKET", help="accept commands on this Unix socket")
+    parser.add_argument("--hotkeys", metavar="FILE", help="JSON hotkey bindings")
+    parser.add_argument("--audit-log", metavar="PATH", help="record every click in an audit log")
+    args = parser.parse_args(argv)
+    try:
+        hotkeys = load_bindings(args.hotkeys) if args.hotkeys else None
+    except (OSError, ValueError) as e:
+        parser.error(f"Could not load hotkeys: {e}")
     root = tk.Tk()
-    app = AutoclickerGUI(root)
+    app = AutoclickerGUI(root, metrics_address=args.metrics, control_path=args.control, hotkeys=hotkeys,
+                         audit_path=args.audit_log)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
 
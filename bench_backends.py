@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Click Backend Latency Benchmark
+Compares per-click latency of the XTest backend against the pyautogui path
+(with and without its PAUSE sleep). Runs on the current DISPLAY, or starts
+a private Xvfb server with --xvfb so it can be checked on a headless box:
+
+    python3 bench_backends.py --xvfb --clicks 2000
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+
+def start_xvfb(display=":99"):
+    """Start Xvfb on the given display and point DISPLAY at it."""
+    if shutil.which("Xvfb") is None:
+        print("Error: Xvfb not found (sudo apt install xvfb)")
+        sys.exit(1)
+    proc = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    # Wait until the server accepts connections
+    for _ in range(50):
+        if os.path.exists(f"/tmp/.X11-unix/X{display.lstrip(':')}"):
+            break
+        time.sleep(0.1)
+    return proc
+
+
+def measure(click, clicks):
+    """Time `clicks` calls to click(); return per-click latencies in microseconds."""
+    latencies = []
+    for i in range(clicks):
+        x, y = 100 + i % 500, 100 + i % 300
+        start = time.perf_counter_ns()
+        click(x, y)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    return latencies
+
+
+def report(name, latencies):
+    """Print one summary line for a backend."""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:<22} median {statistics.median(ordered):9.1f} us   "
+          f"p99 {p99:9.1f} us   max {ordered[-1]:9.1f} us   "
+          f"-> {1_000_000 / statistics.mean(ordered):8.0f} clicks/s")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compare click backend latency")
+    parser.add_argument("--clicks", type=int, default=1000, help="clicks per backend")
+    parser.add_argument("--xvfb", action="store_true", help="run against a private Xvfb server")
+    parser.add_argument("--pause-clicks", type=int, default=100,
+                        help="clicks for the slow pyautogui+PAUSE path")
+    args = parser.parse_args()
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        from click_backends import PyAutoGUIBackend, XTestBackend
+        import pyautogui
+
+        print(f"=== Click backend latency on DISPLAY={os.environ.get('DISPLAY')} ===")
+        xtest = XTestBackend()
+        report("xtest", measure(xtest.click, args.clicks))
+        xtest.close()
+
+        fallback = PyAutoGUIBackend()
+        report("pyautogui (no pause)", measure(fallback.click, args.clicks))
+
+        # The previous click path: pyautogui.click with its PAUSE sleep
+        pyautogui.PAUSE = 0.01
+        report("pyautogui (PAUSE)", measure(pyautogui.click, args.pause_clicks))
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+
+if __name__ == "__main__":
+    main()
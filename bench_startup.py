@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures import time, time-to-window and time-to-first-click for each
+launch mode in fresh interpreters. Intended for CI on a headless box:
+
+    python3 bench_startup.py --xvfb --runs 5 --json startup.json
+
+Modes:
+  terminal  import autoclicker (interactive mode waits for prompts after this)
+  headless  import autoclicker and run headless until the first click
+  gui       import autoclicker_gui, map the window, then send one click
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = ("terminal", "headless", "gui")
+
+
+class FirstClickBackend:
+    """Wraps a real backend and records when the first click was sent."""
+
+    def __init__(self, backend, on_first_click):
+        self.name = backend.name
+        self._backend = backend
+        self._on_first_click = on_first_click
+
+    def position(self):
+        return self._backend.position()
+
+    def click(self, x=None, y=None, button="left"):
+        self._backend.click(x, y, button)
+        if self._on_first_click is not None:
+            self._on_first_click()
+            self._on_first_click = None
+
+    def close(self):
+        self._backend.close()
+
+
+def run_child(mode, backend_name):
+    """Measure one startup in this process and print the result as JSON."""
+    start = time.perf_counter()
+    result = {"mode": mode}
+
+    def ms():
+        return (time.perf_counter() - start) * 1000
+
+    if mode in ("terminal", "headless"):
+        import autoclicker
+        result["import_ms"] = ms()
+        if mode == "headless":
+            import threading
+            from click_backends import create_backend
+            done = threading.Event()
+
+            def first_click():
+                result["first_click_ms"] = ms()
+                done.set()
+
+            backend = FirstClickBackend(create_backend(backend_name), first_click)
+            autoclicker.run_headless({"clickers": [{"interval": "1", "x": 10, "y": 10}], "quiet": True},
+                                     backend=backend, stop_event=done)
+            backend.close()
+    elif mode == "gui":
+        import tkinter as tk
+        import autoclicker_gui
+        from click_backends import create_backend
+        result["import_ms"] = ms()
+        root = tk.Tk()
+        app = autoclicker_gui.AutoclickerGUI(root)
+        root.update()
+        while not root.winfo_viewable():
+            root.update()
+        result["window_ms"] = ms()
+        app._backend = FirstClickBackend(create_backend(backend_name), None)
+        app.backend.click(10, 10)
+        result["first_click_ms"] = ms()
+        app.on_closing()
+    print(json.dumps(result))
+
+
+def run_mode(mode, backend_name):
+    """Run one measurement in a fresh interpreter; return its result dict."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, __file__, "--child", mode, "--backend", backend_name],
+                          capture_output=True, text=True)
+    total_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = total_ms
+    return result
+
+
+def summarize(results):
+    """Median of every metric over repeated runs."""
+    keys = sorted({k for r in results for k in r if k != "mode"})
+    return {k: statistics.median(r[k] for r in results if k in r) for k in keys}
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure autoclicker startup time")
+    parser.add_argument("--runs", type=int, default=3, help="runs per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated modes")
+    parser.add_argument("--backend", default="auto", help="click backend for first-click timing")
+    parser.add_argument("--xvfb", action="store_true", help="run against a private Xvfb server")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.backend)
+        return 0
+
+    xvfb = None
+    if args.xvfb:
+        from bench_backends import start_xvfb
+        xvfb = start_xvfb()
+    try:
+        report = {}
+        print(f"{'mode':<10} {'import':>10} {'window':>10} {'1st click':>10} {'process':>10}  (median ms)")
+        for mode in args.modes.split(","):
+            medians = summarize([run_mode(mode, args.backend) for _ in range(args.runs)])
+            report[mode] = medians
+
+            def cell(key):
+                return f"{medians[key]:10.1f}" if key in medians else f"{'-':>10}"
+            print(f"{mode:<10} {cell('import_ms')} {cell('window_ms')} "
+                  f"{cell('first_click_ms')} {cell('process_ms')}")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Timing Benchmark
+Drives the real clicker engine, sequence player and status log pipeline
+against an in-memory backend and reports:
+
+  scheduler  fire-time error (p50/p99/max), click dispatch latency and
+             CPU seconds per scheduled hour
+  playback   per-click error against the recorded offsets
+  log        status log throughput (push -> drain -> format)
+  burst      click events per second sent one call per click vs batched
+             with click_batch() (--burst-backend xtest measures real flushes)
+
+Results can be saved as JSON and compared against an earlier run:
+
+    python3 bench_timing.py --json timing.json
+    python3 bench_timing.py --compare timing.json
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+from click_backends import create_backend
+from clicker_engine import MODE_FIXED, ClickerEngine
+from log_pipeline import LogRing, format_batch
+from playback import SequencePlayer
+
+# Result keys that are measurements (the rest describe the run)
+METRIC_SUFFIXES = ("_us", "_per_s", "_per_hour")
+
+
+class TimingBackend:
+    """Backend that only timestamps clicks."""
+
+    name = "timing"
+
+    def __init__(self):
+        self.clicks = 0
+        self.last_click_ns = 0
+
+    def position(self):
+        return 0, 0
+
+    def click(self, x=None, y=None, button="left"):
+        self.last_click_ns = time.monotonic_ns()
+        self.clicks += 1
+
+    def move(self, x, y):
+        self.last_click_ns = time.monotonic_ns()
+
+    def click_batch(self, events):
+        self.last_click_ns = time.monotonic_ns()
+        self.clicks += len(events)
+
+    def close(self):
+        pass
+
+
+def percentiles(values_ns):
+    """p50/p99/max of nanosecond samples, in microseconds."""
+    if not values_ns:
+        return {"p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+    ordered = sorted(values_ns)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {"p50_us": ordered[len(ordered) // 2] / 1000, "p99_us": p99 / 1000, "max_us": ordered[-1] / 1000}
+
+
+def bench_scheduler(clickers, interval, duration):
+    """Run `clickers` fixed-position clickers for `duration` seconds."""
+    backend = TimingBackend()
+    lateness = []
+    dispatch = []
+
+    def on_click(index, x, y, lateness_ns):
+        lateness.append(lateness_ns)
+        # The scheduler woke at deadline + lateness; the click followed
+        dispatch.append(backend.last_click_ns - engine.table.last_fire_ns[index])
+
+    engine = ClickerEngine(lambda: backend, on_click=on_click)
+    for i in range(clickers):
+        engine.add_clicker(f"clicker{i}", interval, offset=interval * i / clickers, mode=MODE_FIXED)
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    for i in range(clickers):
+        engine.start(i)
+    time.sleep(duration)
+    engine.shutdown()
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - start
+    return {
+        "clickers": clickers,
+        "interval_s": interval,
+        "fires": len(lateness),
+        "fire_error": percentiles(lateness),
+        "dispatch": percentiles(dispatch),
+        "cpu_s_per_hour": cpu / wall * 3600,
+    }
+
+
+def bench_playback(clicks, gap):
+    """Play a synthetic sequence of `clicks` clicks `gap` seconds apart."""
+    sequence = [(int(i * gap * 1e9), i % 100, i % 100, 1) for i in range(clicks)]
+    times = []
+    player = SequencePlayer(sequence, lambda x, y, button: times.append(time.monotonic_ns()))
+    report = player.run()[0]
+    # Error of each click against its recorded offset from the first click
+    errors = [abs((t - times[0]) - (offset - sequence[0][0]))
+              for t, (offset, _, _, _) in zip(times, sequence)]
+    return {"clicks": clicks, "gap_s": gap, "click_error": percentiles(errors),
+            "jitter_us": report.jitter_ns() / 1000}
+
+
+def bench_burst(backend, events, batch):
+    """Send `events` clicks one call each, then in click_batch() calls of `batch`."""
+    start = time.perf_counter()
+    for _ in range(events):
+        backend.click(10, 10)
+    single = events / (time.perf_counter() - start)
+    clicks = [(10, 10, "left")] * batch
+    start = time.perf_counter()
+    for _ in range(events // batch):
+        backend.click_batch(clicks)
+    batched = events // batch * batch / (time.perf_counter() - start)
+    return {"backend": backend.name, "events": events, "batch": batch,
+            "single_per_s": single, "batched_per_s": batched}
+
+
+def bench_log(messages, producers):
+    """Push `messages` through the log ring from several threads while one thread drains."""
+    ring = LogRing(capacity=2000)
+    stop = threading.Event()
+    drained = [0]
+
+    def consumer():
+        while not stop.is_set() or len(ring):
+            records, dropped = ring.drain(limit=1000)
+            format_batch(records, dropped)
+            drained[0] += len(records)
+
+    def producer(count):
+        for i in range(count):
+            ring.push(f"Clicker click at {i}")
+
+    drainer = threading.Thread(target=consumer)
+    threads = [threading.Thread(target=producer, args=(messages // producers,)) for _ in range(producers)]
+    start = time.perf_counter()
+    drainer.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    drainer.join()
+    elapsed = time.perf_counter() - start
+    return {"messages": messages, "drained": drained[0], "dropped": ring.dropped,
+            "pushed_per_s": messages / elapsed, "drained_per_s": drained[0] / elapsed}
+
+
+def flatten(results, prefix=""):
+    """Flatten nested result dicts into {"a.b.c": number}."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, results):
+    """Print every measured metric next to its baseline value and the change."""
+    old, new = flatten(baseline), flatten(results)
+    print(f"\n{'metric':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key in sorted(new):
+        if key not in old or not key.endswith(METRIC_SUFFIXES):
+            continue
+        change = f"{(new[key] - old[key]) / old[key] * 100:+7.1f}%" if old[key] else f"{'-':>8}"
+        print(f"{key:<36} {old[key]:12.2f} {new[key]:12.2f} {change}")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark scheduler, playback and log timing")
+    parser.add_argument("--clickers", type=int, default=50, help="clickers in the scheduler run")
+    parser.add_argument("--interval", type=float, default=0.05, help="clicker interval in seconds")
+    parser.add_argument("--duration", type=float, default=3.0, help="scheduler run length in seconds")
+    parser.add_argument("--playback-clicks", type=int, default=500, help="clicks in the playback run")
+    parser.add_argument("--playback-gap", type=float, default=0.004, help="seconds between played clicks")
+    parser.add_argument("--log-messages", type=int, default=200_000, help="messages in the log run")
+    parser.add_argument("--burst-events", type=int, default=30_000, help="clicks in the burst run")
+    parser.add_argument("--burst-batch", type=int, default=10, help="clicks per batch in the burst run")
+    parser.add_argument("--burst-backend", help="click backend for the burst run (default: in-memory)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="compare against results saved with --json")
+    args = parser.parse_args()
+
+    results = {"python": sys.version.split()[0]}
+    print("=== Timing benchmark ===")
+    results["scheduler"] = s = bench_scheduler(args.clickers, args.interval, args.duration)
+    print(f"scheduler  {s['fires']} fires: error p50 {s['fire_error']['p50_us']:.1f} us, "
+          f"p99 {s['fire_error']['p99_us']:.1f} us, max {s['fire_error']['max_us']:.1f} us; "
+          f"dispatch p50 {s['dispatch']['p50_us']:.1f} us; "
+          f"CPU {s['cpu_s_per_hour']:.1f} s per scheduled hour")
+    results["playback"] = p = bench_playback(args.playback_clicks, args.playback_gap)
+    print(f"playback   {p['clicks']} clicks: error p50 {p['click_error']['p50_us']:.1f} us, "
+          f"p99 {p['click_error']['p99_us']:.1f} us, max {p['click_error']['max_us']:.1f} us")
+    results["log"] = lg = bench_log(args.log_messages, producers=4)
+    print(f"log        {lg['pushed_per_s']:.0f} messages/s pushed, {lg['drained_per_s']:.0f} drained "
+          f"({lg['dropped']} dropped)")
+    backend = create_backend(args.burst_backend) if args.burst_backend else TimingBackend()
+    try:
+        results["burst"] = b = bench_burst(backend, args.burst_events, args.burst_batch)
+    finally:
+        backend.close()
+    print(f"burst      {b['backend']}: {b['single_per_s']:.0f} events/s one call each, "
+          f"{b['batched_per_s']:.0f} events/s in batches of {b['batch']}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
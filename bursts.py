@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Click Bursts
+Several clicks per fire or per recorded step: double and triple clicks,
+N clicks with a spacing between them, with any button.
+
+Clicks due within the same COALESCE_NS window are sent to the backend as
+one click_batch() call, which the XTest backend submits with a single
+flush. A burst's windows are worked out once when it is created; the
+engine sends the first window at the fire and schedules the rest.
+"""
+
+import heapq
+
+from click_backends import BUTTON_CODES
+from click_recorder import MOVE
+from high_rate import parse_duration
+from scheduler import seconds_to_ns
+
+# Clicks due within this window of the first are sent together
+COALESCE_NS = 1_000_000
+
+NAMED_BURSTS = {"single": 1, "double": 2, "triple": 3}
+
+
+class Burst:
+    """count clicks of `button`, `spacing` seconds apart (0 sends them all at once).
+
+    groups holds (offset_ns, clicks) per coalesced window, the first at
+    offset 0.
+    """
+
+    def __init__(self, count=1, button="left", spacing=0.0):
+        if count < 1:
+            raise ValueError("A burst needs at least one click")
+        if button not in BUTTON_CODES:
+            raise ValueError(f"Unknown button: {button!r} (choose from {', '.join(BUTTON_CODES)})")
+        if spacing < 0:
+            raise ValueError("Burst spacing must not be negative")
+        self.count = int(count)
+        self.button = button
+        self.spacing = spacing
+        spacing_ns = seconds_to_ns(spacing)
+        self.groups = []
+        for offset in (k * spacing_ns for k in range(self.count)):
+            if self.groups and offset - self.groups[-1][0] < COALESCE_NS:
+                self.groups[-1][1] += 1
+            else:
+                self.groups.append([offset, 1])
+        self.groups = [tuple(group) for group in self.groups]
+
+    def describe(self):
+        """e.g. "3x left, 20 ms apart"."""
+        spacing = f", {self.spacing * 1000:g} ms apart" if self.spacing and self.count > 1 else ""
+        return f"{self.count}x {self.button}{spacing}"
+
+
+def parse_spacing(spacing):
+    """Burst spacing in seconds: text in ms unless it has a unit ("20", "0", "0.5s"), numbers in seconds."""
+    return parse_duration(spacing, bare_unit="ms") if isinstance(spacing, str) else float(spacing)
+
+
+def parse_burst(spec):
+    """A Burst from "double", "triple", "5", "5x20" (ms), "5x0.1s", a dict of Burst arguments, or a Burst."""
+    if isinstance(spec, Burst):
+        return spec
+    if isinstance(spec, dict):
+        spec = dict(spec)
+        if "spacing" in spec:
+            spec["spacing"] = parse_spacing(spec["spacing"])
+        return Burst(**spec)
+    text = str(spec).strip().lower()
+    if text in NAMED_BURSTS:
+        return Burst(NAMED_BURSTS[text])
+    count, _, spacing = text.partition("x")
+    try:
+        return Burst(int(count), spacing=parse_spacing(spacing) if spacing else 0.0)
+    except ValueError as e:
+        raise ValueError(f"Invalid burst: {spec!r} ({e})") from None
+
+
+def expand_bursts(events, burst):
+    """Turn each click of a time-ordered (offset_ns, x, y, button) stream into a burst.
+
+    The burst's count and spacing apply; each step keeps its own button.
+    Moves pass through; the output stays in time order.
+    """
+    pending = []  # (offset_ns, sequence, x, y, button) of later clicks
+    sequence = 0
+    for offset, x, y, button in events:
+        while pending and pending[0][0] <= offset:
+            due, _, px, py, pbutton = heapq.heappop(pending)
+            yield due, px, py, pbutton
+        if button == MOVE:
+            yield offset, x, y, button
+            continue
+        for group_offset, clicks in burst.groups:
+            for _ in range(clicks):
+                if group_offset:
+                    heapq.heappush(pending, (offset + group_offset, sequence, x, y, button))
+                    sequence += 1
+                else:
+                    yield offset, x, y, button
+    while pending:
+        due, _, x, y, button = heapq.heappop(pending)
+        yield due, x, y, button
+
+
+def coalesce(events, window_ns=COALESCE_NS):
+    """Group a time-ordered (offset_ns, x, y, button) stream into lists due within window_ns of their first."""
+    group = []
+    for event in events:
+        if group and event[0] - group[0][0] >= window_ns:
+            yield group
+            group = []
+        group.append(event)
+    if group:
+        yield group
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Click Backends
+Pluggable mouse backends for the autoclicker. The XTest backend keeps one
+Xlib display connection open and sends each click as a press/release pair
+with a single flush; pyautogui remains the portable fallback.
+
+click_batch() sends several clicks and moves at once: the XTest backend
+queues them all and flushes once, other backends fall back to one call
+per event.
+
+Backends can also grab a small screen region for triggers. Grabs are
+returned as (width, height, data) with 4 bytes per pixel in B, G, R, X
+order, the X server's native layout, so XTest grabs need no conversion.
+"""
+
+import threading
+import time
+
+BUTTON_CODES = {"left": 1, "middle": 2, "right": 3}
+
+
+class FailSafeError(RuntimeError):
+    """Raised when the mouse sits in the top-left corner and failsafe is on."""
+
+
+class ClickBackend:
+    """Interface every click backend implements."""
+
+    name = "base"
+
+    def position(self):
+        """Return the current mouse position as (x, y)."""
+        raise NotImplementedError
+
+    def click(self, x=None, y=None, button="left"):
+        """Click at (x, y), or at the current position when x/y are None."""
+        raise NotImplementedError
+
+    def move(self, x, y):
+        """Move the pointer to (x, y) without clicking."""
+        raise NotImplementedError
+
+    def click_batch(self, events):
+        """Send (x, y, button) events in order; button "move" moves the pointer."""
+        for x, y, button in events:
+            if button == "move":
+                self.move(x, y)
+            else:
+                self.click(x, y, button)
+
+    def grab(self, x, y, width, height):
+        """Return the pixels of a screen region as (width, height, BGRX bytes)."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class PyAutoGUIBackend(ClickBackend):
+    """Backend built on pyautogui, without its per-call PAUSE sleep."""
+
+    name = "pyautogui"
+
+    def __init__(self, failsafe=False):
+        import pyautogui
+        pyautogui.FAILSAFE = failsafe
+        self._pyautogui = pyautogui
+
+    def position(self):
+        """Return the current mouse position as (x, y)."""
+        x, y = self._pyautogui.position()
+        return x, y
+
+    def click(self, x=None, y=None, button="left"):
+        """Click at (x, y), or at the current position when x/y are None."""
+        self._pyautogui.click(x, y, button=button, _pause=False)
+
+    def move(self, x, y):
+        """Move the pointer to (x, y) without clicking."""
+        self._pyautogui.moveTo(x, y, _pause=False)
+
+    def grab(self, x, y, width, height):
+        """Return the pixels of a screen region as (width, height, BGRX bytes)."""
+        image = self._pyautogui.screenshot(region=(x, y, width, height)).convert("RGBX")
+        return image.width, image.height, image.tobytes("raw", "BGRX")
+
+
+class XTestBackend(ClickBackend):
+    """Backend that talks XTest over one persistent Xlib display connection."""
+
+    name = "xtest"
+
+    def __init__(self, display_name=None, failsafe=False):
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self._X = X
+        self._xtest = xtest
+        self._display = display.Display(display_name)
+        if not self._display.has_extension("XTEST"):
+            self._display.close()
+            raise RuntimeError("X server does not support the XTEST extension")
+        self._root = self._display.screen().root
+        # Xlib connections are not thread-safe; clicks may come from several threads
+        self._lock = threading.Lock()
+        self.failsafe = failsafe
+
+    def position(self):
+        """Return the current mouse position as (x, y)."""
+        with self._lock:
+            pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def click(self, x=None, y=None, button="left"):
+        """Click at (x, y), or at the current position when x/y are None."""
+        code = BUTTON_CODES[button]
+        X, fake_input = self._X, self._xtest.fake_input
+        with self._lock:
+            if self.failsafe:
+                pointer = self._root.query_pointer()
+                if (pointer.root_x, pointer.root_y) == (0, 0):
+                    raise FailSafeError("Mouse moved to top-left corner - failsafe triggered")
+            if x is not None and y is not None:
+                fake_input(self._display, X.MotionNotify, x=int(x), y=int(y))
+            fake_input(self._display, X.ButtonPress, code)
+            fake_input(self._display, X.ButtonRelease, code)
+            self._display.flush()
+
+    def move(self, x, y):
+        """Move the pointer to (x, y) without clicking."""
+        with self._lock:
+            self._xtest.fake_input(self._display, self._X.MotionNotify, x=int(x), y=int(y))
+            self._display.flush()
+
+    def click_batch(self, events):
+        """Send (x, y, button) events in order with one flush; button "move" moves the pointer."""
+        X, fake_input, display = self._X, self._xtest.fake_input, self._display
+        with self._lock:
+            if self.failsafe:
+                pointer = self._root.query_pointer()
+                if (pointer.root_x, pointer.root_y) == (0, 0):
+                    raise FailSafeError("Mouse moved to top-left corner - failsafe triggered")
+            for x, y, button in events:
+                if x is not None and y is not None:
+                    fake_input(display, X.MotionNotify, x=int(x), y=int(y))
+                if button != "move":
+                    code = BUTTON_CODES[button]
+                    fake_input(display, X.ButtonPress, code)
+                    fake_input(display, X.ButtonRelease, code)
+            display.flush()
+
+    def grab(self, x, y, width, height):
+        """Return the pixels of a screen region as (width, height, BGRX bytes)."""
+        with self._lock:
+            image = self._root.get_image(int(x), int(y), int(width), int(height),
+                                         self._X.ZPixmap, 0xFFFFFFFF)
+        return width, height, image.data
+
+    def close(self):
+        """Close the display connection."""
+        with self._lock:
+            self._display.close()
+
+
+class FakeBackend(ClickBackend):
+    """In-memory backend that records every event instead of sending it.
+
+    events holds (t_ns, kind, x, y, button) tuples with kind "click" or
+    "move"; clicks without coordinates land at the current fake position.
+    flushes counts backend calls, so a click_batch() counts once.
+    With failsafe on, clicks raise FailSafeError while the fake pointer
+    is at (0, 0), like the real backends.
+    The fake screen starts black and is painted with fill() and paste().
+    """
+
+    name = "fake"
+
+    def __init__(self, clock=time.monotonic_ns, position=(0, 0), failsafe=False, screen_size=(640, 480)):
+        self.clock = clock
+        self.x, self.y = position
+        self.events = []
+        self.flushes = 0
+        self.failsafe = failsafe
+        self.screen_size = screen_size
+        self._screen = None  # BGRX rows, allocated on first use
+
+    def _framebuffer(self):
+        if self._screen is None:
+            width, height = self.screen_size
+            self._screen = bytearray(width * height * 4)
+        return self._screen
+
+    def _check_failsafe(self):
+        if self.failsafe and (self.x, self.y) == (0, 0):
+            raise FailSafeError("Mouse moved to top-left corner - failsafe triggered")
+
+    def position(self):
+        """Return the current fake mouse position as (x, y)."""
+        return self.x, self.y
+
+    def click(self, x=None, y=None, button="left"):
+        """Record a click at (x, y), or at the current position when x/y are None."""
+        self._check_failsafe()
+        if x is not None and y is not None:
+            self.x, self.y = x, y
+        self.flushes += 1
+        self.events.append((self.clock(), "click", self.x, self.y, button))
+
+    def move(self, x, y):
+        """Record a pointer move to (x, y)."""
+        self.x, self.y = x, y
+        self.flushes += 1
+        self.events.append((self.clock(), "move", x, y, None))
+
+    def click_batch(self, events):
+        """Record (x, y, button) events at one time, as one flush."""
+        self._check_failsafe()
+        now = self.clock()
+        self.flushes += 1
+        for x, y, button in events:
+            if x is not None and y is not None:
+                self.x, self.y = x, y
+            if button == "move":
+                self.events.append((now, "move", self.x, self.y, None))
+            else:
+                self.events.append((now, "click", self.x, self.y, button))
+
+    def clicks(self):
+        """The recorded clicks as (t_ns, x, y, button)."""
+        return [(t, x, y, button) for t, kind, x, y, button in self.events if kind == "click"]
+
+    def fill(self, x, y, width, height, rgb):
+        """Paint a rectangle of the fake screen in one (r, g, b) colour."""
+        r, g, b = rgb
+        self.paste(x, y, width, height, bytes((b, g, r, 0)) * (width * height))
+
+    def paste(self, x, y, width, height, data):
+        """Copy BGRX pixel data onto the fake screen."""
+        screen, stride = self._framebuffer(), self.screen_size[0] * 4
+        for row in range(height):
+            start = (y + row) * stride + x * 4
+            screen[start:start + width * 4] = data[row * width * 4:(row + 1) * width * 4]
+
+    def grab(self, x, y, width, height):
+        """Return the pixels of a fake screen region as (width, height, BGRX bytes)."""
+        screen, stride = self._framebuffer(), self.screen_size[0] * 4
+        rows = [screen[(y + row) * stride + x * 4:(y + row) * stride + (x + width) * 4]
+                for row in range(height)]
+        return width, height, b"".join(rows)
+
+
+BACKENDS = {
+    "xtest": XTestBackend,
+    "pyautogui": PyAutoGUIBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_backend(name="auto", **options):
+    """Create a click backend by name.
+
+    "auto" prefers XTest and falls back to pyautogui when Xlib or the
+    extension is unavailable (e.g. on Windows or Wayland). "fake" records
+    events in memory and needs no display.
+    """
+    if name != "auto":
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown backend: {name!r} (choose from {', '.join(BACKENDS)})")
+        return BACKENDS[name](**options)
+    try:
+        return XTestBackend(**options)
+    except Exception:
+        return PyAutoGUIBackend(**options)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Click Recorder
+Records mouse clicks into preallocated typed-array chunks with
+time.monotonic_ns() timestamps. The input callback only stores four
+numbers; full chunks are handed to a writer thread that spills them to a
+temporary file, so memory stays flat however long the recording runs.
+"""
+
+import collections
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+
+from click_backends import BUTTON_CODES
+
+# Events per chunk; one chunk is 17 bytes per event
+CHUNK_SIZE = 65536
+# Event codes: the backend button code for a click, MOVE for a pointer move
+MOVE = 0
+EVENT_CODES = dict(BUTTON_CODES, move=MOVE)
+BUTTON_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+
+def button_code(button):
+    """Map a pynput button (or an event name) to its uint8 code.
+
+    Buttons the backends cannot press (e.g. side buttons) record as left.
+    """
+    return EVENT_CODES.get(getattr(button, "name", button), BUTTON_CODES["left"])
+
+
+class RecordChunk:
+    """A fixed-capacity block of events stored column by column."""
+
+    def __init__(self, capacity):
+        self.t_ns = array("q", bytes(8 * capacity))
+        self.x = array("i", bytes(4 * capacity))
+        self.y = array("i", bytes(4 * capacity))
+        self.button = array("B", bytes(capacity))
+        self.count = 0
+
+    def columns(self):
+        """The (t_ns, x, y, button) columns trimmed to the recorded events."""
+        n = self.count
+        return self.t_ns[:n], self.x[:n], self.y[:n], self.button[:n]
+
+
+class ClickRecorder:
+    """Single-producer click recorder with chunked spill to disk.
+
+    record() is called from the input listener thread only and never
+    locks or allocates; chunks move between threads through deques, whose
+    append/popleft are atomic. Call finish() before iterating.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, spill_dir=None, clock=time.monotonic_ns):
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.clock = clock
+        self.start_ns = clock()
+        self.spilled = 0
+        self._handed_off = 0
+        self._chunk = RecordChunk(chunk_size)
+        self._pos = 0
+        self._full = collections.deque()
+        self._free = collections.deque()
+        self._wake = threading.Event()
+        self._closing = False
+        self._writer = None
+        self._file = None
+        self._finished = False
+
+    def __len__(self):
+        return self._handed_off + self._pos
+
+    def record(self, x, y, button, t_ns=None):
+        """Append one click or move (producer thread only)."""
+        chunk = self._chunk
+        i = self._pos
+        chunk.t_ns[i] = self.clock() if t_ns is None else t_ns
+        chunk.x[i] = x
+        chunk.y[i] = y
+        chunk.button[i] = button
+        i += 1
+        if i == self.chunk_size:
+            chunk.count = i
+            self._hand_off(chunk)
+        else:
+            self._pos = i
+
+    def _hand_off(self, chunk):
+        """Queue a full chunk for the writer and switch to a recycled one."""
+        if self._writer is None:
+            self._file = tempfile.TemporaryFile(prefix="clicks-", dir=self.spill_dir)
+            self._writer = threading.Thread(target=self._write_loop, name="click-recorder", daemon=True)
+            self._writer.start()
+        self._full.append(chunk)
+        self._handed_off += chunk.count
+        self._chunk = self._free.popleft() if self._free else RecordChunk(self.chunk_size)
+        self._pos = 0
+        self._wake.set()
+
+    def _write_loop(self):
+        """Writer thread: spill queued chunks as [count][t_ns][x][y][button] blocks."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while self._full:
+                chunk = self._full[0]
+                n = chunk.count
+                array("q", [n]).tofile(self._file)
+                for column in (chunk.t_ns, chunk.x, chunk.y, chunk.button):
+                    self._file.write(memoryview(column)[:n])
+                self.spilled += chunk.count
+                self._full.popleft()
+                self._free.append(chunk)
+            if self._closing:
+                return
+
+    def finish(self):
+        """Stop recording: flush pending chunks and stop the writer (idempotent)."""
+        if self._finished:
+            return
+        self._finished = True
+        if self._writer is None:
+            # Never spilled; the events stay in memory
+            self._chunk.count = self._pos
+            return
+        if self._pos:
+            self._chunk.count = self._pos
+            self._full.append(self._chunk)
+            self._handed_off += self._pos
+        self._chunk = RecordChunk(0)
+        self._pos = 0
+        self._closing = True
+        self._wake.set()
+        self._writer.join()
+        self._file.flush()
+        self._free.clear()
+
+    def chunks(self):
+        """Yield (t_ns, x, y, button) column arrays, spilled chunks first.
+
+        Blocks are read at explicit offsets, so several iterations (and
+        indexed lookups) can share the spill file.
+        """
+        self.finish()
+        if self._file is not None:
+            fd = self._file.fileno()
+            offset = 0
+            while True:
+                header = os.pread(fd, 8, offset)
+                if len(header) < 8:
+                    break
+                count = array("q", header)[0]
+                offset += 8
+                columns = []
+                for typecode in "qiiB":
+                    column = array(typecode)
+                    size = count * column.itemsize
+                    column.frombytes(os.pread(fd, size, offset))
+                    offset += size
+                    columns.append(column)
+                yield tuple(columns)
+        if self._chunk.count:
+            yield self._chunk.columns()
+
+    def __iter__(self):
+        """Yield (t_ns, x, y, button) per event in recording order."""
+        for columns in self.chunks():
+            yield from zip(*columns)
+
+    def __getitem__(self, index):
+        """The (t_ns, x, y, button) event at index.
+
+        Spilled events are read in place from the spill file (every block
+        but the last holds chunk_size events), so lookups cost the same
+        however long the recording is.
+        """
+        self.finish()
+        total = len(self)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("recording index out of range")
+        if self._file is None:
+            chunk = self._chunk
+            return chunk.t_ns[index], chunk.x[index], chunk.y[index], chunk.button[index]
+        block, i = divmod(index, self.chunk_size)
+        count = min(self.chunk_size, total - block * self.chunk_size)
+        base = block * (8 + 17 * self.chunk_size) + 8
+        fd = self._file.fileno()
+        t_ns, = struct.unpack("q", os.pread(fd, 8, base + 8 * i))
+        x, = struct.unpack("i", os.pread(fd, 4, base + 8 * count + 4 * i))
+        y, = struct.unpack("i", os.pread(fd, 4, base + 12 * count + 4 * i))
+        return t_ns, x, y, os.pread(fd, 1, base + 16 * count + i)[0]
+
+    def close(self):
+        """Finish and delete the spill file."""
+        self.finish()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Clicker Engine
+Holds any number of clickers in a compact, array-backed table and drives
+them all from one ClickScheduler thread (O(log n) heap work per fire).
+Both the terminal and GUI front-ends are built on this engine.
+"""
+
+import threading
+import time
+from array import array
+
+from high_rate import HIGH_RATE_SPIN_NS, catch_up_periods
+from scheduler import ClickScheduler, NS_PER_SECOND, seconds_to_ns
+
+# Coordinate modes
+MODE_TRACK = 0  # click wherever the mouse currently is
+MODE_FIXED = 1  # click at the stored (x, y)
+
+# Flags
+FLAG_FOLLOW = 1     # period follows clicker 0 (delta clickers)
+FLAG_HIGH_RATE = 2  # spin before deadlines, catch up short stalls, no position lookup
+
+
+class ClickerTable:
+    """Column-oriented storage for clicker settings and counters.
+
+    Each column is a typed array indexed by clicker id, so hundreds of
+    clickers cost a few bytes each instead of one object per field.
+    """
+
+    def __init__(self):
+        self.names = []
+        # Settings
+        self.interval_ns = array("q")
+        self.offset_ns = array("q")
+        self.x = array("i")
+        self.y = array("i")
+        self.mode = array("B")
+        self.flags = array("B")
+        # State and counters
+        self.active = array("B")
+        self.fires = array("Q")
+        self.missed = array("Q")
+        self.skipped = array("Q")
+        self.last_fire_ns = array("q")
+        self.last_lateness_ns = array("q")
+        self.max_lateness_ns = array("q")
+        self.total_lateness_ns = array("q")
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, interval, offset=0, x=0, y=0, mode=MODE_TRACK, flags=0):
+        """Append a clicker row and return its id."""
+        self.names.append(name)
+        self.interval_ns.append(seconds_to_ns(interval))
+        self.offset_ns.append(seconds_to_ns(offset))
+        self.x.append(int(x))
+        self.y.append(int(y))
+        self.mode.append(mode)
+        self.flags.append(flags)
+        for column in (self.active, self.fires, self.missed, self.skipped, self.last_fire_ns,
+                       self.last_lateness_ns, self.max_lateness_ns, self.total_lateness_ns):
+            column.append(0)
+        return len(self.names) - 1
+
+    def reset_counters(self, index):
+        """Zero the counters of one clicker."""
+        for column in (self.fires, self.missed, self.skipped, self.last_fire_ns,
+                       self.last_lateness_ns, self.max_lateness_ns, self.total_lateness_ns):
+            column[index] = 0
+
+    def row(self, index):
+        """Snapshot one clicker as a dict."""
+        fires = self.fires[index]
+        return {
+            "id": index,
+            "name": self.names[index],
+            "interval": self.interval_ns[index] / NS_PER_SECOND,
+            "offset": self.offset_ns[index] / NS_PER_SECOND,
+            "x": self.x[index],
+            "y": self.y[index],
+            "mode": self.mode[index],
+            "flags": self.flags[index],
+            "active": bool(self.active[index]),
+            "fires": fires,
+            "missed": self.missed[index],
+            "skipped": self.skipped[index],
+            "last_lateness_ms": self.last_lateness_ns[index] / 1e6,
+            "max_lateness_ms": self.max_lateness_ns[index] / 1e6,
+            "mean_lateness_ms": self.total_lateness_ns[index] / fires / 1e6 if fires else 0.0,
+        }
+
+
+class ClickerEngine:
+    """Starts, stops and fires clickers stored in a ClickerTable.
+
+    get_backend is a zero-argument callable returning the click backend, so
+    front-ends can open it lazily. on_click(index, x, y, lateness_ns) is
+    called on the scheduler thread after every click. Times come from the
+    scheduler's clock, so a manual scheduler on a VirtualClock simulates the
+    whole table. After enable_metrics() every fire also feeds the
+    lateness and backend-latency histograms of self.metrics.
+
+    A clicker with a trigger attached (see triggers.py) is not scheduled;
+    while it runs, its trigger's thread fires it on each detection, and
+    its lateness is the detection-to-click latency.
+
+    A clicker with a Jitter (see jitter.py) has its deadlines and click
+    positions moved by the jitter's pre-drawn offsets.
+
+    A clicker with a Burst (see bursts.py) sends several clicks per fire:
+    the clicks due together go out as one click_batch(), and later ones
+    are scheduled as one-shot jobs named ("burst", id, fire time), so the
+    bursts of fires closer together than a burst lasts overlap.
+
+    With an AuditLog set (see audit_log.py) every fire is also queued for
+    the audit trail, with its scheduled time and backend latency.
+
+    snapshot() copies every clicker's counters in one step for displays;
+    fires update them under a small lock of their own, so a snapshot
+    never shows half of a fire.
+    """
+
+    def __init__(self, get_backend, on_click=None, scheduler=None):
+        self.table = ClickerTable()
+        self.get_backend = get_backend
+        self.on_click = on_click
+        self.scheduler = scheduler or ClickScheduler()
+        self.scheduler.start()
+        self.start_ns = None
+        self.metrics = None
+        self.audit = None
+        self.triggers = {}  # clicker id -> Trigger
+        self.jitters = {}  # clicker id -> Jitter
+        self.bursts = {}  # clicker id -> Burst
+        self._lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+
+    def enable_metrics(self):
+        """Create (once) and return the engine's MetricsRegistry."""
+        if self.metrics is None:
+            from metrics import MetricsRegistry
+            self.metrics = MetricsRegistry(self)
+        return self.metrics
+
+    def set_audit(self, audit):
+        """Record every fire in an AuditLog (None stops recording)."""
+        self.audit = audit
+
+    def add_clicker(self, name, interval, offset=0, x=0, y=0, mode=MODE_TRACK, flags=0):
+        """Add a clicker row; returns its id."""
+        with self._lock, self._counters_lock:
+            return self.table.add(name, interval, offset, x, y, mode, flags)
+
+    def configure(self, index, interval=None, offset=None, x=None, y=None, mode=None, flags=None):
+        """Update a clicker's settings; a running clicker is rescheduled on timing changes."""
+        table = self.table
+        with self._lock:
+            if interval is not None:
+                table.interval_ns[index] = seconds_to_ns(interval)
+            if offset is not None:
+                table.offset_ns[index] = seconds_to_ns(offset)
+            if x is not None:
+                table.x[index] = int(x)
+            if y is not None:
+                table.y[index] = int(y)
+            if mode is not None:
+                table.mode[index] = mode
+            if flags is not None:
+                table.flags[index] = flags
+            # Only timing changes move a running clicker's deadlines
+            retime = interval is not None or offset is not None or flags is not None
+            if retime and table.active[index]:
+                self._schedule(index)
+            # Delta clickers follow clicker 0's period
+            if index == 0 and interval is not None:
+                for other in range(1, len(table)):
+                    if table.active[other] and table.flags[other] & FLAG_FOLLOW:
+                        self._schedule(other)
+
+    def attach_trigger(self, index, trigger):
+        """Make a clicker fire on a trigger instead of its interval (None detaches)."""
+        with self._lock:
+            old = self.triggers.pop(index, None)
+            if old is not None:
+                old.stop()
+            if trigger is not None:
+                self.triggers[index] = trigger
+            if self.table.active[index]:
+                self._schedule(index)
+
+    def set_jitter(self, index, jitter):
+        """Give a clicker timing and position jitter (None removes it)."""
+        with self._lock:
+            if jitter is None:
+                self.jitters.pop(index, None)
+            else:
+                self.jitters[index] = jitter
+            if self.table.active[index]:
+                self._schedule(index)
+
+    def set_burst(self, index, burst):
+        """Make each fire of a clicker a burst of clicks (None for single left clicks)."""
+        with self._lock:
+            if burst is None:
+                self.bursts.pop(index, None)
+            else:
+                self.bursts[index] = burst
+
+    def period_ns(self, index):
+        """Effective period of a clicker (clicker 0's interval when following)."""
+        if self.table.flags[index] & FLAG_FOLLOW:
+            return self.table.interval_ns[0]
+        return self.table.interval_ns[index]
+
+    def elapsed(self, index):
+        """Seconds from the shared start time to the clicker's last scheduled fire."""
+        start = self.start_ns
+        if start is None:
+            return 0.0
+        table = self.table
+        return (table.last_fire_ns[index] - table.last_lateness_ns[index] - start) / NS_PER_SECOND
+
+    def is_active(self, index):
+        """True while the clicker is running."""
+        return bool(self.table.active[index])
+
+    def any_active(self):
+        """True while any clicker is running."""
+        return any(self.table.active)
+
+    def snapshot(self):
+        """Every clicker's state at one instant, as {"time_ns": ..., "clickers": [...]}.
+
+        Each clicker entry has its id, name, active flag, fires, missed,
+        last fire time and lateness, period and next_fire_ns (None while
+        it is not scheduled, e.g. when a trigger fires it).
+        """
+        table = self.table
+        with self._counters_lock:
+            time_ns = self.scheduler.clock()
+            names = list(table.names)
+            active = table.active[:]
+            fires = table.fires[:]
+            missed = table.missed[:]
+            last_fire_ns = table.last_fire_ns[:]
+            last_lateness_ns = table.last_lateness_ns[:]
+            periods = [self.period_ns(i) for i in range(len(names))]
+        deadlines = self.scheduler.deadlines()
+        return {"time_ns": time_ns, "clickers": [
+            {"id": i, "name": name, "active": bool(active[i]), "fires": fires[i], "missed": missed[i],
+             "last_fire_ns": last_fire_ns[i], "last_lateness_ms": last_lateness_ns[i] / 1e6,
+             "period_ns": periods[i], "next_fire_ns": deadlines.get(i) if active[i] else None}
+            for i, name in enumerate(names)]}
+
+    def start(self, index, reanchor=False, immediate=False):
+        """Start a clicker on the shared start time.
+
+        With reanchor the start time is reset to now and every running
+        clicker is rescheduled on it, keeping them phase-locked.
+        """
+        with self._lock:
+            if reanchor or self.start_ns is None:
+                self.start_ns = self.scheduler.clock()
+                reanchor = True
+            with self._counters_lock:
+                self.table.active[index] = 1
+                self.table.reset_counters(index)
+            if self.metrics is not None:
+                self.metrics.reset_clicker(index)
+            if reanchor:
+                for other in range(len(self.table)):
+                    if self.table.active[other]:
+                        self._schedule(other, immediate)
+            else:
+                self._schedule(index, immediate)
+
+    def stop(self, index):
+        """Stop a clicker; the start time is cleared once none are running."""
+        with self._lock:
+            self.table.active[index] = 0
+            self.scheduler.remove(index)
+            self._cancel_bursts(index)
+            trigger = self.triggers.get(index)
+            if trigger is not None:
+                trigger.stop()
+            if not any(self.table.active):
+                self.start_ns = None
+            self._update_spin()
+
+    def stop_all(self):
+        """Stop every clicker."""
+        for index in range(len(self.table)):
+            if self.table.active[index]:
+                self.stop(index)
+
+    def shutdown(self):
+        """Stop every clicker and the scheduler thread."""
+        self.stop_all()
+        self.scheduler.stop()
+
+    def _schedule(self, index, immediate=False):
+        """(Re)register a clicker with the scheduler, or start its trigger (lock held)."""
+        trigger = self.triggers.get(index)
+        if trigger is not None:
+            self.scheduler.remove(index)
+            # Retiming the clicker a trigger follows must not re-arm the trigger
+            if not trigger.is_running():
+                trigger.start(self.get_backend, lambda x, y, detected_ns: self.fire_now(index, x, y, detected_ns))
+            return
+        period = self.period_ns(index)
+        high_rate = self.table.flags[index] & FLAG_HIGH_RATE
+        catch_up = catch_up_periods(period / NS_PER_SECOND) if high_rate else 0
+        self.scheduler.add(index, period / NS_PER_SECOND, self._fire, anchor_ns=self.start_ns,
+                           offset=self.table.offset_ns[index] / NS_PER_SECOND,
+                           catch_up=catch_up, immediate=immediate, jitter=self.jitters.get(index))
+        self._update_spin()
+
+    def _update_spin(self):
+        """Spin before deadlines only while a high-rate clicker is running."""
+        table = self.table
+        high_rate = any(table.active[i] and table.flags[i] & FLAG_HIGH_RATE for i in range(len(table)))
+        self.scheduler.spin_ns = HIGH_RATE_SPIN_NS if high_rate else 0
+
+    def fire_now(self, index, x=None, y=None, detected_ns=None):
+        """Click a running clicker now (trigger callback).
+
+        Fixed-position clickers click at their own coordinates; others at
+        (x, y) when given. Lateness is measured from detected_ns.
+        """
+        if not self.table.active[index]:
+            return
+        if self.table.mode[index] == MODE_FIXED:
+            x = y = None
+        self._click(index, x, y, None, detected_ns)
+
+    def _fire(self, job, lateness_ns):
+        """Scheduler callback shared by every clicker."""
+        self._click(job.name, None, None, job.deadline_ns + lateness_ns, job.deadline_ns, job.missed)
+
+    def _click(self, index, x, y, fire_ns, due_ns=None, missed=None):
+        """Click for a clicker and update its counters.
+
+        x/y None means the clicker's own mode decides; fire_ns None means
+        the click is timed when the backend call returns.
+        """
+        table = self.table
+        backend = self.get_backend()
+        if x is None:
+            if table.mode[index] == MODE_FIXED:
+                x, y = table.x[index], table.y[index]
+            elif not table.flags[index] & FLAG_HIGH_RATE:
+                x, y = backend.position()
+        jitter = self.jitters.get(index)
+        if jitter is not None and x is not None:
+            dx, dy = jitter.next_offset()
+            x, y = x + dx, y + dy
+        burst = self.bursts.get(index)
+        metrics = self.metrics
+        audit = self.audit
+        timed = metrics is not None or audit is not None
+        if timed:
+            call_ns = time.perf_counter_ns()
+        try:
+            if burst is None:
+                backend.click(x, y)
+            else:
+                backend.click_batch([(x, y, burst.button)] * burst.groups[0][1])
+        except Exception:
+            with self._counters_lock:
+                table.skipped[index] += 1
+            raise
+        if timed:
+            backend_ns = time.perf_counter_ns() - call_ns
+        if fire_ns is None:
+            fire_ns = self.scheduler.clock()
+        lateness_ns = fire_ns - due_ns if due_ns is not None else 0
+        if metrics is not None:
+            metrics.observe_backend(backend_ns)
+            metrics.observe_fire(index, lateness_ns)
+        if audit is not None:
+            audit.record(index, fire_ns if due_ns is None else due_ns, fire_ns, x, y, backend_ns,
+                         1 if burst is None else burst.groups[0][1])
+
+        with self._counters_lock:
+            table.fires[index] += 1
+            if missed is not None:
+                table.missed[index] = missed
+            table.last_fire_ns[index] = fire_ns
+            table.last_lateness_ns[index] = lateness_ns
+            table.total_lateness_ns[index] += lateness_ns
+            if lateness_ns > table.max_lateness_ns[index]:
+                table.max_lateness_ns[index] = lateness_ns
+        if burst is not None and len(burst.groups) > 1:
+            self._continue_burst(index, burst, x, y, fire_ns if due_ns is None else due_ns, 1)
+        if self.on_click is not None:
+            self.on_click(index, x, y, lateness_ns)
+
+    def _cancel_bursts(self, index):
+        """Drop the pending windows of every burst of a clicker."""
+        for job in self.scheduler.jobs():
+            if isinstance(job.name, tuple) and job.name[:2] == ("burst", index):
+                self.scheduler.remove(job.name)
+
+    def _continue_burst(self, index, burst, x, y, start_ns, group):
+        """Schedule the clicks of a burst's next window after start_ns."""
+        offset_ns, clicks = burst.groups[group]
+
+        def send(job, lateness_ns):
+            if not self.table.active[index]:
+                return
+            call_ns = time.perf_counter_ns()
+            try:
+                self.get_backend().click_batch([(x, y, burst.button)] * clicks)
+            except Exception:
+                with self._counters_lock:
+                    self.table.skipped[index] += 1
+                raise
+            audit = self.audit
+            if audit is not None:
+                audit.record(index, job.deadline_ns, job.deadline_ns + lateness_ns, x, y,
+                             time.perf_counter_ns() - call_ns, clicks)
+            if group + 1 < len(burst.groups):
+                self._continue_burst(index, burst, x, y, start_ns, group + 1)
+
+        # One job per burst: each window replaces its own burst's last one only
+        self.scheduler.add_once(("burst", index, start_ns), start_ns + offset_ns, send)
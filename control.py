@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Control Socket
+Lets scripts drive the clickers over a local Unix domain socket.
+
+The protocol is one JSON object per line in each direction:
+
+    {"id": 1, "cmd": "set", "clicker": "Primary", "interval": "250ms"}
+    {"id": 1, "ok": true, "result": {...}}
+    {"id": 2, "ok": false, "error": "No clicker 'Nope'"}
+
+Commands: ping, state, add, start, stop, stop_all, set, load, play,
+stop_playback. One selector thread serves every client without blocking;
+commands only take the engine lock briefly, so the click scheduler never
+waits on a client.
+
+    python3 control.py /tmp/autoclicker.sock set clicker=0 interval=2
+    python3 control.py /tmp/autoclicker.sock state
+"""
+
+import json
+import os
+import selectors
+import socket
+import sys
+import threading
+
+from bursts import parse_burst
+from click_recorder import BUTTON_NAMES, MOVE
+from clicker_engine import MODE_FIXED, MODE_TRACK
+from high_rate import parse_interval, parse_offset
+from playback import SequencePlayer
+from sequence_file import SequenceFile
+
+# Requests longer than this close the connection
+MAX_REQUEST_BYTES = 65536
+
+
+class ControlError(RuntimeError):
+    """A command was rejected by the server."""
+
+
+class Controller:
+    """Commands for a ClickerEngine and a sequence player.
+
+    Every cmd_<name>(**params) method is one protocol command returning a
+    JSON-serializable result. Clickers are named by id or by name.
+    Front-ends subclass it to route commands through their own state.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sequence = None
+        self.sequence_path = None
+        self.player = None
+        self._player_thread = None
+
+    def clicker_index(self, clicker):
+        """Resolve a clicker id or name to its index."""
+        table = self.engine.table
+        if isinstance(clicker, int) and not isinstance(clicker, bool) and 0 <= clicker < len(table):
+            return clicker
+        if isinstance(clicker, str) and clicker in table.names:
+            return table.names.index(clicker)
+        raise KeyError(f"No clicker {clicker!r}")
+
+    def is_playing(self):
+        """True while a sequence is being played."""
+        return self._player_thread is not None and self._player_thread.is_alive()
+
+    def cmd_ping(self):
+        """Liveness check."""
+        return "pong"
+
+    def cmd_state(self):
+        """Every clicker row plus the loaded sequence and playback state."""
+        table = self.engine.table
+        sequence = self.sequence
+        return {
+            "clickers": [table.row(i) for i in range(len(table))],
+            "sequence": None if sequence is None else {"path": self.sequence_path, "events": len(sequence)},
+            "playing": self.is_playing(),
+        }
+
+    def cmd_add(self, name, interval, offset=0, x=None, y=None, burst=None):
+        """Add a clicker (fixed-position when x and y are given); returns its id."""
+        if name in self.engine.table.names:
+            raise ValueError(f"Clicker {name!r} already exists")
+        fixed = x is not None and y is not None
+        burst = None if burst is None else parse_burst(burst)
+        index = self.engine.add_clicker(name, parse_interval(interval), parse_offset(offset),
+                                        x=x or 0, y=y or 0, mode=MODE_FIXED if fixed else MODE_TRACK)
+        self.engine.set_burst(index, burst)
+        return index
+
+    def cmd_start(self, clicker, immediate=False):
+        """Start a clicker on the shared start time."""
+        index = self.clicker_index(clicker)
+        if not self.engine.is_active(index):
+            self.engine.start(index, immediate=immediate)
+        return self.engine.table.row(index)
+
+    def cmd_stop(self, clicker):
+        """Stop a clicker."""
+        index = self.clicker_index(clicker)
+        self.engine.stop(index)
+        return self.engine.table.row(index)
+
+    def cmd_stop_all(self):
+        """Stop every clicker."""
+        self.engine.stop_all()
+        return None
+
+    def cmd_set(self, clicker, interval=None, offset=None, x=None, y=None, burst=None):
+        """Change a clicker's timing, position or burst; a running clicker is rescheduled."""
+        index = self.clicker_index(clicker)
+        if (x is None) != (y is None):
+            raise ValueError("x and y must be given together")
+        if burst is not None:
+            self.engine.set_burst(index, parse_burst(burst))
+        self.engine.configure(index,
+                              interval=None if interval is None else parse_interval(interval),
+                              offset=None if offset is None else parse_offset(offset),
+                              x=x, y=y, mode=None if x is None else MODE_FIXED)
+        return self.engine.table.row(index)
+
+    def cmd_load(self, path):
+        """Memory-map a sequence file for playback."""
+        if self.is_playing():
+            raise ValueError("Stop playback before loading a sequence")
+        sequence = SequenceFile(path)
+        self.close()
+        self.sequence, self.sequence_path = sequence, path
+        return {"path": path, "events": len(sequence)}
+
+    def cmd_play(self, speed=1.0, repeat=1, repeat_interval=0, max_gap=None, move_rate=None, burst=None):
+        """Play the loaded sequence in the background."""
+        if self.sequence is None or not len(self.sequence):
+            raise ValueError("No sequence loaded")
+        if self.is_playing():
+            raise ValueError("Already playing")
+        self.player = SequencePlayer(self.sequence, self.play_click, speed=speed, max_gap=max_gap,
+                                     repeat=repeat, repeat_interval=repeat_interval,
+                                     move_rate=move_rate, clock=self.engine.scheduler.clock,
+                                     click_batch=self.play_click_batch,
+                                     burst=None if burst is None else parse_burst(burst))
+        self._player_thread = threading.Thread(target=self.player.run, name="control-playback",
+                                               daemon=True)
+        self._player_thread.start()
+        return {"events": len(self.sequence), "repeat": repeat}
+
+    def cmd_stop_playback(self):
+        """Stop the running playback; it ends at its next deadline check."""
+        if self.player is not None:
+            self.player.stop()
+        return None
+
+    def play_click(self, x, y, button):
+        """Player callback: perform one click or move on the engine's backend."""
+        backend = self.engine.get_backend()
+        if button == MOVE:
+            backend.move(x, y)
+        else:
+            backend.click(x, y, BUTTON_NAMES.get(button, "left"))
+
+    def play_click_batch(self, events):
+        """Player callback: send coalesced clicks and moves in one backend call."""
+        self.engine.get_backend().click_batch([(x, y, BUTTON_NAMES.get(button, "left"))
+                                               for x, y, button in events])
+
+    def close(self):
+        """Stop playback and release the loaded sequence."""
+        self.cmd_stop_playback()
+        if self._player_thread is not None:
+            # The player reads the memory-mapped sequence until it returns
+            self._player_thread.join(1)
+        if isinstance(self.sequence, SequenceFile):
+            self.sequence.close()
+        self.sequence = self.sequence_path = None
+
+
+def dispatch(controller, line):
+    """Run one request line against a controller; return the response dict."""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return {"id": None, "ok": False, "error": str(e)}
+    return run_request(controller, request)
+
+
+def run_request(controller, request):
+    """Run one decoded request dict against a controller; return the response dict."""
+    request_id = None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request = dict(request)
+        request_id = request.pop("id", None)
+        name = request.pop("cmd", None)
+        command = getattr(controller, f"cmd_{name}", None) if isinstance(name, str) else None
+        if command is None:
+            raise ValueError(f"Unknown command {name!r}")
+        result = command(**request)
+    except KeyError as e:
+        return {"id": request_id, "ok": False, "error": str(e.args[0])}
+    except Exception as e:
+        return {"id": request_id, "ok": False, "error": str(e) or type(e).__name__}
+    return {"id": request_id, "ok": True, "result": result}
+
+
+class _Connection:
+    __slots__ = ("sock", "inbox", "outbox")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbox = b""
+        self.outbox = b""
+
+
+class ControlServer:
+    """Serves a Controller on a Unix socket from one selector thread.
+
+    The socket file is created owner-only (0600) and removed by close().
+    Commands run on the selector thread, so none of them may wait on
+    another thread.
+    """
+
+    def __init__(self, controller, path):
+        self.controller = controller
+        self.path = path
+        from metrics import unlink_socket
+        unlink_socket(path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self._listener.bind(path)
+        finally:
+            os.umask(old_umask)
+        self._listener.listen(128)
+        self._listener.setblocking(False)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop serving, drop every client and remove the socket file."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake_w.send(b"\0")
+        self._thread.join(1)
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        self._wake_w.close()
+        from metrics import unlink_socket
+        try:
+            unlink_socket(self.path)
+        except FileExistsError:
+            pass  # replaced since; not ours to remove
+
+    def _run(self):
+        while self._running:
+            for key, events in self._selector.select():
+                if key.fileobj is self._listener:
+                    self._accept()
+                elif key.fileobj is self._wake_r:
+                    return
+                else:
+                    if events & selectors.EVENT_READ:
+                        self._read(key.data)
+                    if events & selectors.EVENT_WRITE and key.data.sock.fileno() >= 0:
+                        self._flush(key.data)
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        self._selector.register(sock, selectors.EVENT_READ, _Connection(sock))
+
+    def _drop(self, conn):
+        self._selector.unregister(conn.sock)
+        conn.sock.close()
+
+    def _read(self, conn):
+        try:
+            data = conn.sock.recv(MAX_REQUEST_BYTES)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(conn)
+            return
+        conn.inbox += data
+        *lines, conn.inbox = conn.inbox.split(b"\n")
+        if len(conn.inbox) > MAX_REQUEST_BYTES:
+            self._drop(conn)
+            return
+        for line in lines:
+            if line.strip():
+                response = dispatch(self.controller, line)
+                conn.outbox += json.dumps(response, default=str).encode() + b"\n"
+        if conn.outbox:
+            self._flush(conn)
+
+    def _flush(self, conn):
+        try:
+            sent = conn.sock.send(conn.outbox)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(conn)
+            return
+        conn.outbox = conn.outbox[sent:]
+        # Wait for writability only while a slow client has output pending
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbox else 0)
+        self._selector.modify(conn.sock, events, conn)
+
+
+class ControlClient:
+    """A persistent connection to a ControlServer."""
+
+    def __init__(self, path, timeout=5.0):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rb")
+        self._next_id = 0
+
+    def call(self, cmd, **params):
+        """Send one command and return its result; raises ControlError on failure."""
+        self._next_id += 1
+        request = dict(params, cmd=cmd, id=self._next_id)
+        self._sock.sendall(json.dumps(request).encode() + b"\n")
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Control socket closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise ControlError(response.get("error"))
+        return response.get("result")
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_param(text):
+    """key=value from the command line; values are JSON when they parse as JSON."""
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"Expected key=value, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def main(argv=None):
+    """Send one command: control.py SOCKET CMD [key=value ...]."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print("Usage: control.py SOCKET CMD [key=value ...]", file=sys.stderr)
+        return 2
+    try:
+        params = dict(parse_param(arg) for arg in argv[2:])
+        with ControlClient(argv[0]) as client:
+            result = client.call(argv[1], **params)
+    except (OSError, ValueError, ControlError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Live Dashboard
+Turns engine snapshots into the rows of the GUI's dashboard panel.
+
+The GUI takes one ClickerEngine.snapshot() per frame at a fixed
+DASHBOARD_HZ and redraws from it, instead of being poked from worker
+threads on every click, so the display costs the same at one click a
+minute as at 500 a second. Achieved rates come from the change in fire
+counts across the snapshots of the last RATE_WINDOW_S.
+"""
+
+import collections
+
+from scheduler import NS_PER_SECOND
+
+DASHBOARD_HZ = 10
+# Seconds of snapshots the achieved rate is averaged over
+RATE_WINDOW_S = 1.0
+
+COLUMNS = ("clicker", "state", "clicks", "rate", "next", "lateness")
+
+
+def format_countdown(ns):
+    """e.g. "4.2 s", "35 ms", or "now" once due."""
+    if ns <= 0:
+        return "now"
+    if ns < NS_PER_SECOND:
+        return f"{ns / 1e6:.0f} ms"
+    return f"{ns / NS_PER_SECOND:.1f} s"
+
+
+def format_playback(progress, repeat):
+    """Status and progress lines for a player's (replay, events, offset_ns) progress."""
+    replay, events, offset_ns = progress
+    if not replay:
+        return "Playing...", "Starting"
+    return (f"Playing... ({replay}/{repeat})",
+            f"Replay {replay} of {repeat}: {events} events, {offset_ns / NS_PER_SECOND:.1f} s in")
+
+
+class Dashboard:
+    """Display rows, one per clicker, from successive engine snapshots."""
+
+    def __init__(self, rate_window_s=RATE_WINDOW_S):
+        self.rate_window_ns = int(rate_window_s * NS_PER_SECOND)
+        self._history = collections.deque()  # (time_ns, {id: fires})
+
+    def rates(self, snapshot):
+        """Clicks per second per clicker id over the rate window, ending at snapshot."""
+        now = snapshot["time_ns"]
+        fires = {c["id"]: c["fires"] for c in snapshot["clickers"]}
+        history = self._history
+        history.append((now, fires))
+        while len(history) > 2 and now - history[1][0] >= self.rate_window_ns:
+            history.popleft()
+        then, old = history[0]
+        elapsed = (now - then) / NS_PER_SECOND
+        if elapsed <= 0:
+            return {i: 0.0 for i in fires}
+        # Counters restart from zero when a clicker is started again
+        return {i: max(count - old.get(i, 0), 0) / elapsed for i, count in fires.items()}
+
+    def update(self, snapshot):
+        """The COLUMNS values of every clicker as strings."""
+        rates = self.rates(snapshot)
+        now = snapshot["time_ns"]
+        rows = []
+        for c in snapshot["clickers"]:
+            if not c["active"]:
+                state, countdown = "OFF", "-"
+            elif c["next_fire_ns"] is None:
+                state, countdown = "ON", "on trigger"
+            else:
+                state, countdown = "ON", format_countdown(c["next_fire_ns"] - now)
+            lateness = f"{c['last_lateness_ms']:.2f} ms" if c["fires"] else "-"
+            rows.append((c["name"], state, str(c["fires"]), f"{rates[c['id']]:.1f}/s", countdown, lateness))
+        return rows
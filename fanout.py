@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Multi-Display Fan-Out
+One controller process drives clickers on many X displays. Each display
+gets a lightweight worker process with its own backend connection and
+ClickerEngine (no Tk, pynput or pyautogui unless that backend is chosen);
+the controller assigns clickers and sequences, aggregates per-display
+status and restarts workers that die, setting up their clickers and
+sequence again. Playback is not resumed after a restart. A worker that
+keeps dying is restarted with a growing delay and given up on after
+MAX_RESTARTS attempts in a row.
+
+    python3 fanout.py --config displays.json
+
+with a config such as
+
+    {"backend": "xtest", "status_interval": 10,
+     "displays": {":1": {"clickers": [{"interval": "5", "x": 100, "y": 100}]},
+                  ":2": {"clickers": [{"interval": "250ms"}],
+                         "sequence": "clicks.clkseq", "play": {"repeat": 10}}}}
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+from click_backends import create_backend
+from clicker_engine import ClickerEngine
+from control import ControlError, Controller, run_request
+
+# Seconds between liveness checks, and the minimum gap between restarts of one
+# display; the gap doubles with each restart of a worker that died within
+# STABLE_UPTIME seconds, up to MAX_RESTARTS in a row
+WATCH_INTERVAL = 0.5
+RESTART_BACKOFF = 1.0
+STABLE_UPTIME = 60.0
+MAX_RESTARTS = 5
+# Seconds to wait for a worker's reply
+CALL_TIMEOUT = 5.0
+
+
+def worker_main(display, conn, backend_name):
+    """Worker process: serve control requests for one display until told to stop."""
+    os.environ["DISPLAY"] = display
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the controller handles Ctrl+C
+    backend = create_backend(backend_name)
+    engine = ClickerEngine(lambda: backend)
+    controller = Controller(engine)
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            conn.send(run_request(controller, request))
+    finally:
+        controller.close()
+        engine.shutdown()
+        backend.close()
+
+
+def process_usage(pid):
+    """(rss_kb, cpu_seconds) of a process from /proc, or (None, None)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss = next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), None)
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None, None
+    return rss, cpu
+
+
+class DisplayWorker:
+    """Controller-side handle of one display's worker process."""
+
+    def __init__(self, display, backend, context):
+        self.display = display
+        self.backend = backend
+        self.context = context
+        self.clickers = []  # "add" requests by clicker id, with later "set" changes folded in
+        self.running = {}  # clicker id -> its "start" request
+        self.sequence = None  # the last "load" request
+        self.restarts = 0
+        self.crashes = 0  # restarts since the worker last stayed up STABLE_UPTIME
+        self.died = None
+        self.failed = False
+        self.process = None
+        self.conn = None
+        self.started = 0.0
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def start(self):
+        """Spawn the worker process and replay the assignment."""
+        parent, child = self.context.Pipe()
+        self.process = self.context.Process(target=worker_main, args=(self.display, child, self.backend),
+                                            name=f"clicker-{self.display}", daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.started = time.monotonic()
+        self.died = None
+        for request in self.assignment():
+            self._send(request)
+
+    def is_alive(self):
+        """True while the worker process runs."""
+        return self.process is not None and self.process.is_alive()
+
+    def call(self, cmd, **params):
+        """Run one command on the worker; raises ControlError if it fails or the worker is down."""
+        request = dict(params, cmd=cmd)
+        with self._lock:
+            response = self._send(request)
+            if response.get("ok"):
+                self._remember(request, response.get("result"))
+        if not response.get("ok"):
+            raise ControlError(f"{self.display}: {response.get('error')}")
+        return response.get("result")
+
+    def _remember(self, request, result):
+        """Fold a successful command into the assignment replayed after a restart."""
+        cmd = request["cmd"]
+        if cmd == "add":
+            self.clickers.append(request)
+        elif cmd == "set":
+            changes = {key: value for key, value in request.items()
+                       if key not in ("cmd", "clicker") and value is not None}
+            self.clickers[result["id"]] = dict(self.clickers[result["id"]], **changes)
+        elif cmd == "start":
+            self.running[result["id"]] = dict(request, clicker=result["id"])
+        elif cmd == "stop":
+            self.running.pop(result["id"], None)
+        elif cmd == "stop_all":
+            self.running.clear()
+        elif cmd == "load":
+            self.sequence = request
+
+    def assignment(self):
+        """The requests that set a fresh worker up like this one: clickers, running flags, sequence."""
+        requests = self.clickers + list(self.running.values())
+        return requests + [self.sequence] if self.sequence else requests
+
+    def _send(self, request):
+        """Send a request tagged with a fresh id and wait for the reply carrying it.
+
+        Late replies to calls that timed out are read and dropped, so they
+        are never taken for the answer to a later call.
+        """
+        request_id = next(self._ids)
+        deadline = time.monotonic() + CALL_TIMEOUT
+        try:
+            self.conn.send(dict(request, id=request_id))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    return {"ok": False, "error": "worker did not answer"}
+                response = self.conn.recv()
+                if response.get("id") == request_id:
+                    return response
+        except (OSError, EOFError):
+            return {"ok": False, "error": "worker is not running"}
+
+    def stop(self, timeout=2.0):
+        """Ask the worker to exit, killing it if it does not."""
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class FanOut:
+    """Assigns clickers and sequences to one worker process per display.
+
+    Worker processes are started from a forkserver (spawn where that is
+    unavailable), so they never inherit the controller's memory.
+    """
+
+    def __init__(self, backend="auto", context=None):
+        if context is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+        self.backend = backend
+        self.context = context
+        self.workers = {}
+        self._stop = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="fanout-watch", daemon=True)
+        self._watcher.start()
+
+    def add_display(self, display):
+        """Start a worker for a display."""
+        if display in self.workers:
+            raise ValueError(f"Display {display} already has a worker")
+        worker = DisplayWorker(display, self.backend, self.context)
+        worker.start()
+        self.workers[display] = worker
+        return worker
+
+    def assign(self, display, assignment):
+        """Give a display its clickers, and optionally a sequence to play.
+
+        assignment holds "clickers" (as in a headless config), "sequence"
+        (a .clkseq path) and "play" (SequencePlayer settings).
+        """
+        worker = self.workers.get(display) or self.add_display(display)
+        for i, clicker in enumerate(assignment.get("clickers", [])):
+            name = clicker.get("name", f"clicker{i + 1}")
+            params = {key: clicker[key] for key in ("interval", "offset", "x", "y", "burst") if key in clicker}
+            index = worker.call("add", name=name, **params)
+            worker.call("start", clicker=index, immediate=True)
+        if assignment.get("sequence"):
+            worker.call("load", path=assignment["sequence"])
+            if "play" in assignment:
+                worker.call("play", **assignment["play"])
+
+    def call(self, display, cmd, **params):
+        """Run a control command on one display."""
+        return self.workers[display].call(cmd, **params)
+
+    def broadcast(self, cmd, **params):
+        """Run a control command on every display; failures are returned as ControlErrors."""
+        results = {}
+        for display, worker in self.workers.items():
+            try:
+                results[display] = worker.call(cmd, **params)
+            except ControlError as e:
+                results[display] = e
+        return results
+
+    def status(self):
+        """Aggregated per-display status plus totals."""
+        displays = {}
+        totals = {"displays": len(self.workers), "alive": 0, "failed": 0, "fires": 0, "missed": 0,
+                  "skipped": 0, "rss_kb": 0, "restarts": 0}
+        for display, state in self.broadcast("state").items():
+            worker = self.workers[display]
+            rss, cpu = process_usage(worker.process.pid) if worker.is_alive() else (None, None)
+            entry = {"alive": worker.is_alive(), "pid": worker.process.pid, "restarts": worker.restarts,
+                     "failed": worker.failed, "rss_kb": rss, "cpu_s": cpu}
+            if worker.failed:
+                entry["error"] = f"failed, gave up after {worker.restarts} restarts"
+            elif isinstance(state, ControlError):
+                entry["error"] = str(state)
+            else:
+                entry["clickers"] = [{key: row[key] for key in ("name", "active", "fires", "missed", "skipped",
+                                                                "mean_lateness_ms", "max_lateness_ms")}
+                                     for row in state["clickers"]]
+                entry["playing"] = state["playing"]
+                for key in ("fires", "missed", "skipped"):
+                    totals[key] += sum(row[key] for row in state["clickers"])
+            totals["alive"] += entry["alive"]
+            totals["failed"] += worker.failed
+            totals["rss_kb"] += rss or 0
+            totals["restarts"] += worker.restarts
+            displays[display] = entry
+        return {"displays": displays, "totals": totals}
+
+    def check(self):
+        """Restart workers that exited, backing off; returns the displays restarted."""
+        restarted = []
+        for display, worker in list(self.workers.items()):
+            if worker.failed or worker.is_alive():
+                continue
+            now = time.monotonic()
+            with worker._lock:
+                if worker.died is None:
+                    worker.died = now
+                    if now - worker.started >= STABLE_UPTIME:
+                        worker.crashes = 0
+                    if worker.crashes >= MAX_RESTARTS:
+                        worker.failed = True
+                        print(f"Worker for {display} exited ({worker.process.exitcode}); "
+                              f"giving up after {worker.restarts} restarts", file=sys.stderr)
+                        continue
+                if now - worker.started < RESTART_BACKOFF * 2 ** worker.crashes:
+                    continue
+                worker.conn.close()
+                worker.restarts += 1
+                worker.crashes += 1
+                print(f"Worker for {display} exited ({worker.process.exitcode}); restarting",
+                      file=sys.stderr)
+                worker.start()
+            restarted.append(display)
+        return restarted
+
+    def _watch(self):
+        """Watcher thread: restart dead workers."""
+        while not self._stop.wait(WATCH_INTERVAL):
+            self.check()
+
+    def close(self):
+        """Stop the watcher and every worker."""
+        self._stop.set()
+        self._watcher.join()
+        for worker in self.workers.values():
+            worker.stop()
+
+
+def print_status(status):
+    """One line per display and a totals line."""
+    for display, entry in status["displays"].items():
+        rss = f"{entry['rss_kb'] / 1024:.1f} MB" if entry["rss_kb"] else "-"
+        if "error" in entry:
+            print(f"{display}: {entry['error']} (restarts {entry['restarts']})")
+            continue
+        fires = sum(c["fires"] for c in entry["clickers"])
+        missed = sum(c["missed"] for c in entry["clickers"])
+        print(f"{display}: {fires} clicks, {missed} missed, "
+              f"{'playing, ' if entry['playing'] else ''}{rss}, restarts {entry['restarts']}")
+    totals = status["totals"]
+    failed = f", {totals['failed']} failed" if totals["failed"] else ""
+    print(f"Total: {totals['alive']}/{totals['displays']} displays up{failed}, {totals['fires']} clicks, "
+          f"{totals['missed']} missed, {totals['rss_kb'] / 1024:.1f} MB")
+
+
+def main(argv=None):
+    """Run the displays in a config until SIGINT/SIGTERM or `duration`."""
+    parser = argparse.ArgumentParser(description="Drive clickers on many X displays")
+    parser.add_argument("--config", required=True, help="JSON config with a \"displays\" mapping")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    args = parser.parse_args(argv)
+    try:
+        with open(args.config) as f:
+            config = json.load(f)
+        displays = config["displays"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda signum, frame: stop.set())
+    fanout = FanOut(config.get("backend", "auto"))
+    try:
+        for display, assignment in displays.items():
+            fanout.assign(display, assignment)
+        print(f"Driving {len(displays)} display(s)")
+        deadline = time.monotonic() + args.duration if args.duration else None
+        interval = config.get("status_interval", 10)
+        while not stop.wait(interval if deadline is None else max(0, min(interval, deadline - time.monotonic()))):
+            print_status(fanout.status())
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        print_status(fanout.status())
+    except ControlError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        fanout.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+High-Rate Click Mode
+Helpers for clicking at hundreds of clicks per second: rate parsing,
+scheduler settings tuned for sub-millisecond periods, and a meter that
+reports the rate actually achieved against the target.
+"""
+
+import time
+
+# Scheduler settings for high-rate mode: spin for the last 200 us before each
+# deadline and allow up to 100 ms worth of overdue clicks to catch up.
+HIGH_RATE_SPIN_NS = 200_000
+CATCH_UP_SECONDS = 0.1
+MAX_CPS = 1000
+# Intervals below this use high-rate scheduling and skip per-click output
+HIGH_RATE_THRESHOLD = 0.05
+
+
+def _parse_seconds(text, bare_unit):
+    """Seconds from a value with an optional ms/s/cps suffix; bare numbers are in bare_unit."""
+    value = str(text).strip().lower()
+    if value.endswith("ms"):
+        return float(value[:-2]) / 1000
+    if value.endswith("cps"):
+        return 1 / float(value[:-3])
+    if value.endswith("s"):
+        return float(value[:-1])
+    if bare_unit == "cps":
+        return 1 / float(value)
+    if bare_unit == "ms":
+        return float(value) / 1000
+    return float(value)
+
+
+def _parse_period(text, bare_is_rate):
+    """Parse an interval with an optional ms/s/cps suffix; return seconds."""
+    try:
+        interval = _parse_seconds(text, "cps" if bare_is_rate else "s")
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid rate: {text!r}")
+    if interval <= 0:
+        raise ValueError("Rate must be greater than 0")
+    if interval < 1 / MAX_CPS:
+        raise ValueError(f"Rate is limited to {MAX_CPS} clicks per second")
+    return interval
+
+
+def parse_rate(text):
+    """Parse a click rate into an interval in seconds.
+
+    Accepts clicks per second ("500", "500cps"), milliseconds ("2ms") or
+    seconds ("0.5s").
+    """
+    return _parse_period(text, bare_is_rate=True)
+
+
+def parse_interval(text):
+    """Like parse_rate, but a bare number means seconds ("5", "2ms", "500cps")."""
+    return _parse_period(text, bare_is_rate=False)
+
+
+def parse_duration(text, bare_unit="s"):
+    """Parse a duration into seconds; bare numbers are in bare_unit ("s" or "ms").
+
+    Unlike an interval, zero is allowed and there is no rate limit.
+    """
+    try:
+        duration = _parse_seconds(text, bare_unit)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid duration: {text!r}")
+    if not 0 <= duration < float("inf"):
+        raise ValueError("Duration must be 0 or more")
+    return duration
+
+
+def parse_offset(text):
+    """Parse a phase offset in seconds ("0", "1.5", "0.5ms")."""
+    return parse_duration(text)
+
+
+def is_high_rate(interval):
+    """True when an interval is short enough to need high-rate scheduling."""
+    return interval < HIGH_RATE_THRESHOLD
+
+
+def catch_up_periods(interval):
+    """Number of overdue periods a high-rate job may fire late instead of skipping."""
+    return max(1, int(CATCH_UP_SECONDS / interval))
+
+
+class RateMeter:
+    """Counts clicks and reports the achieved rate once per window."""
+
+    def __init__(self, interval, window=1.0, clock=time.monotonic_ns):
+        self.target_cps = 1 / interval
+        self.window_ns = int(window * 1_000_000_000)
+        self.clock = clock
+        self.total = 0
+        self.started_ns = None
+        self._window_start = None
+        self._window_count = 0
+
+    def tick(self):
+        """Record one click; return the window's achieved rate when it closes, else None."""
+        now = self.clock()
+        if self.started_ns is None:
+            self.started_ns = self._window_start = now
+        self.total += 1
+        self._window_count += 1
+        span = now - self._window_start
+        if span < self.window_ns:
+            return None
+        rate = self._window_count * 1_000_000_000 / span
+        self._window_start = now
+        self._window_count = 0
+        return rate
+
+    def overall_rate(self):
+        """Average achieved rate since the first click."""
+        if self.started_ns is None or self.total < 2:
+            return 0.0
+        span = self.clock() - self.started_ns
+        return (self.total - 1) * 1_000_000_000 / span if span else 0.0
+
+    def report(self, rate):
+        """Human-readable achieved-vs-target line."""
+        return f"{rate:.1f}/{self.target_cps:.1f} CPS ({rate / self.target_cps * 100:.1f}% of target)"
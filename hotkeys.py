@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Hotkeys
+Configurable key bindings and chords for the front-ends.
+
+Bindings map a chord to an action, e.g.
+
+    {"f1": "toggle_clicker:0", "ctrl+shift+s": "stop_all", "<alt>+r": "toggle_recording"}
+
+and are compiled once into a lookup table keyed by key name and modifier
+mask. Action arguments are checked and converted at the same time. The
+listener callbacks resolve each distinct key object once and cache the
+result, so an unbound key costs a single dict lookup and no output. Held
+keys do not retrigger (auto-repeat), and a chord fired within the
+debounce window is ignored.
+"""
+
+import json
+import time
+
+# Seconds during which a chord cannot fire again
+DEBOUNCE_S = 0.2
+
+# Modifier key names (pynput Key names) and their mask bits; the left and
+# right keys share a bit, which stays set while either is held
+MODIFIERS = {
+    "ctrl": 1, "ctrl_l": 1, "ctrl_r": 1,
+    "shift": 2, "shift_l": 2, "shift_r": 2,
+    "alt": 4, "alt_l": 4, "alt_r": 4, "alt_gr": 4,
+    "cmd": 8, "cmd_l": 8, "cmd_r": 8,
+}
+
+_MISSING = object()
+
+
+def clicker_number(arg):
+    """A clicker index argument: a non-negative integer."""
+    if not arg.isdigit():
+        raise ValueError(f"expected a clicker number, got {arg!r}")
+    return int(arg)
+
+
+# Arguments of each action, as converters for the comma-separated text after ":"
+ACTION_ARGUMENTS = {
+    "toggle_clicker": (clicker_number,),
+    "stop_all": (),
+    "toggle_recording": (),
+    "toggle_playback": (),
+}
+
+
+def key_name(key):
+    """Name of a pynput key: the Key member name ("f1"), its character, or "vk<code>"."""
+    name = getattr(key, "name", None)
+    if name:
+        return name
+    char = getattr(key, "char", None)
+    if char:
+        return char.lower()
+    return f"vk{getattr(key, 'vk', None)}"
+
+
+def parse_chord(spec):
+    """Parse "ctrl+shift+f1" (or pynput's "<ctrl>+<shift>+<f1>") into (mask, key name)."""
+    parts = [part.strip().strip("<>").lower() for part in spec.split("+")]
+    if not parts or not all(parts):
+        raise ValueError(f"Invalid hotkey: {spec!r}")
+    *modifiers, name = parts
+    mask = 0
+    for modifier in modifiers:
+        if modifier not in MODIFIERS:
+            raise ValueError(f"Unknown modifier {modifier!r} in hotkey {spec!r}")
+        mask |= MODIFIERS[modifier]
+    if name in MODIFIERS:
+        raise ValueError(f"Hotkey {spec!r} has no key besides modifiers")
+    return mask, name
+
+
+def parse_action(text, arguments=ACTION_ARGUMENTS):
+    """Split "name:arg,..." into (name, args), converting each argument.
+
+    arguments maps action names to their converters; an action missing
+    from it takes no arguments. Raises ValueError for a wrong argument
+    count or an argument its converter rejects.
+    """
+    name, sep, rest = text.partition(":")
+    given = rest.split(",") if sep else []
+    converters = arguments.get(name, ())
+    if len(given) != len(converters):
+        raise ValueError(f"Action {name!r} takes {len(converters)} argument(s), got {len(given)}")
+    return name, tuple(convert(arg.strip()) for convert, arg in zip(converters, given))
+
+
+def load_bindings(path):
+    """Read a {chord: action} JSON file; a "hotkeys" key may hold the mapping."""
+    with open(path) as f:
+        config = json.load(f)
+    bindings = config.get("hotkeys", config)
+    if not isinstance(bindings, dict):
+        raise ValueError(f"{path}: hotkeys must be a mapping of chord to action")
+    return bindings
+
+
+class HotkeyMap:
+    """Dispatches key events to actions through a prebuilt table.
+
+    actions maps action names to callables; "toggle_clicker:0" calls
+    actions["toggle_clicker"](0). Unknown actions, bad arguments (see
+    ACTION_ARGUMENTS) or bad chords raise ValueError when the map is
+    built, not when a key is pressed.
+    """
+
+    def __init__(self, bindings, actions, debounce=DEBOUNCE_S, clock=time.monotonic,
+                 arguments=ACTION_ARGUMENTS):
+        self.bindings = dict(bindings)
+        self.debounce = debounce
+        self.clock = clock
+        self._table = {}  # key name -> {modifier mask: (chord, callback, args)}
+        for chord, action in self.bindings.items():
+            mask, name = parse_chord(chord)
+            action_name = action.partition(":")[0]
+            if action_name not in actions:
+                raise ValueError(f"Unknown action {action_name!r} for hotkey {chord!r}")
+            try:
+                _, args = parse_action(action, arguments)
+            except ValueError as e:
+                raise ValueError(f"Hotkey {chord!r}: {e}") from None
+            self._table.setdefault(name, {})[mask] = (chord, actions[action_name], args)
+        self._resolved = {}  # key object -> (modifier bit, name or entry) or None when unbound
+        self._modifiers = {}  # held modifier key name -> bit
+        self._mask = 0
+        self._held = set()
+        self._last_fired = {}
+
+    def _resolve(self, key):
+        name = key_name(key)
+        if name in MODIFIERS:
+            return MODIFIERS[name], name
+        entry = self._table.get(name)
+        return None if entry is None else (0, (name, entry))
+
+    def on_press(self, key):
+        """pynput on_press callback."""
+        resolved = self._resolved.get(key, _MISSING)
+        if resolved is _MISSING:
+            resolved = self._resolved[key] = self._resolve(key)
+        if resolved is None:
+            return
+        bit, bound = resolved
+        if bit:
+            self._modifiers[bound] = bit
+            self._mask |= bit
+            return
+        name, entry = bound
+        if name in self._held:
+            return  # auto-repeat
+        self._held.add(name)
+        binding = entry.get(self._mask)
+        if binding is None:
+            return
+        chord, callback, args = binding
+        now = self.clock()
+        if now - self._last_fired.get(chord, float("-inf")) < self.debounce:
+            return
+        self._last_fired[chord] = now
+        callback(*args)
+
+    def on_release(self, key):
+        """pynput on_release callback."""
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            return
+        bit, bound = resolved
+        if bit:
+            self._modifiers.pop(bound, None)
+            mask = 0
+            for held in self._modifiers.values():
+                mask |= held
+            self._mask = mask
+        else:
+            self._held.discard(bound[0])
+
+    def describe(self):
+        """Human-readable bindings, e.g. "F1=toggle_clicker:0"."""
+        return ", ".join(f"{chord.upper()}={action}" for chord, action in self.bindings.items())
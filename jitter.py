@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Humanized Jitter
+Random timing and position offsets that make a clicker less regular.
+
+Offsets are drawn ahead of time in vectorized batches and handed out one
+per fire, so the scheduler thread only indexes a list; a new batch is
+drawn once every BATCH fires. Timing offsets move each deadline around
+its place on the clicker's grid (never by more than half an interval),
+so jitter does not accumulate into drift. Every stream is derived from
+one seed: the same seed replays the same offsets exactly.
+
+    {"distribution": "normal", "spread": "40ms", "bound": "120ms", "position": 3, "seed": 7}
+
+Needs NumPy, which is imported when a Jitter is created.
+"""
+
+import secrets
+
+from high_rate import parse_interval
+from scheduler import seconds_to_ns
+
+DISTRIBUTIONS = ("uniform", "normal", "lognormal")
+# Offsets drawn per batch
+BATCH = 4096
+# Shape of the log-normal distribution (sigma of the underlying normal)
+LOGNORMAL_SIGMA = 0.5
+
+
+class Jitter:
+    """Pre-drawn timing and position offsets for one clicker.
+
+    spread scales the timing offsets (seconds): the half-width of a
+    uniform draw, the standard deviation of a normal one, or for a
+    log-normal one the offset one sigma above its median of 0 (the 84th
+    percentile), skewed late like human reaction times. Timing offsets
+    are clipped to +-bound (3 * spread by default). position is the
+    largest pixel offset on each axis.
+    stream separates clickers that share a seed.
+    """
+
+    def __init__(self, distribution="normal", spread=0.0, bound=None, position=0, seed=None, stream=0,
+                 batch=BATCH):
+        import numpy as np
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution!r} (choose from {', '.join(DISTRIBUTIONS)})")
+        if spread < 0 or position < 0 or (bound is not None and bound < 0):
+            raise ValueError("Jitter spread, bound and position must not be negative")
+        self._np = np
+        self.distribution = distribution
+        self.spread = spread
+        self.bound = 3 * spread if bound is None else bound
+        self.position = int(position)
+        self.seed = secrets.randbits(32) if seed is None else int(seed)
+        self.stream = stream
+        self.batch = batch
+        self._delay_rng = np.random.default_rng([self.seed, stream, 0])
+        self._position_rng = np.random.default_rng([self.seed, stream, 1])
+        self._delays = self._draw_delays()
+        self._positions = self._draw_positions()
+        self._next_delay = self._next_position = 0
+
+    def _draw(self, rng, scale, count):
+        np = self._np
+        if self.distribution == "uniform":
+            return rng.uniform(-scale, scale, count)
+        if self.distribution == "normal":
+            return rng.normal(0.0, scale, count)
+        return scale * (rng.lognormal(0.0, LOGNORMAL_SIGMA, count) - 1.0) / (np.exp(LOGNORMAL_SIGMA) - 1.0)
+
+    def _draw_delays(self):
+        """A batch of timing offsets in nanoseconds."""
+        np = self._np
+        if not self.spread:
+            return [0] * self.batch
+        bound_ns = seconds_to_ns(self.bound)
+        offsets = self._draw(self._delay_rng, self.spread * 1e9, self.batch)
+        return np.rint(np.clip(offsets, -bound_ns, bound_ns)).astype(np.int64).tolist()
+
+    def _draw_positions(self):
+        """A batch of (dx, dy) pixel offsets."""
+        np = self._np
+        if not self.position:
+            return [(0, 0)] * self.batch
+        scale = self.position if self.distribution == "uniform" else self.position / 2
+        offsets = np.rint(np.clip(self._draw(self._position_rng, scale, 2 * self.batch),
+                                  -self.position, self.position)).astype(np.int64)
+        return list(zip(offsets[0::2].tolist(), offsets[1::2].tolist()))
+
+    def next_delay_ns(self):
+        """The next timing offset in nanoseconds."""
+        i = self._next_delay
+        if i == self.batch:
+            self._delays = self._draw_delays()
+            i = 0
+        self._next_delay = i + 1
+        return self._delays[i]
+
+    def next_offset(self):
+        """The next (dx, dy) position offset."""
+        i = self._next_position
+        if i == self.batch:
+            self._positions = self._draw_positions()
+            i = 0
+        self._next_position = i + 1
+        return self._positions[i]
+
+    def describe(self):
+        """e.g. "normal +-40 ms (bound 120 ms), +-3 px, seed 7"."""
+        return (f"{self.distribution} +-{self.spread * 1000:g} ms (bound {self.bound * 1000:g} ms), "
+                f"+-{self.position} px, seed {self.seed}")
+
+
+def build_jitter(spec, stream=0, seed=None):
+    """Create a Jitter from a config dict; seed is used when the spec has none."""
+    spec = dict(spec)
+    unknown = set(spec) - {"distribution", "spread", "bound", "position", "seed"}
+    if unknown:
+        raise ValueError(f"Unknown jitter setting(s): {', '.join(sorted(unknown))}")
+    for key in ("spread", "bound"):
+        if spec.get(key):
+            spec[key] = parse_interval(spec[key])
+    spec.setdefault("seed", seed)
+    return Jitter(stream=stream, **spec)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Status Log Pipeline
+A bounded ring buffer for status messages. Worker threads push records
+under a short lock; the UI drains them in coalesced batches at a fixed rate.
+When producers outrun the consumer the oldest records are overwritten and
+counted as dropped.
+"""
+
+import collections
+import itertools
+import threading
+import time
+
+
+class LogRing:
+    """Bounded multi-producer / single-consumer message ring.
+
+    push() numbers and appends a record under one lock, so records sit in
+    sequence order; drain() pops without it. Gaps in the sequence seen by
+    the consumer are exactly the records that were overwritten.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._records = collections.deque(maxlen=capacity)
+        self._seq = itertools.count()
+        self._push_lock = threading.Lock()
+        self._next_expected = 0
+        self.dropped = 0
+        self.drained = 0
+
+    def push(self, message):
+        """Queue a message from any thread."""
+        timestamp = time.time()
+        with self._push_lock:
+            self._records.append((next(self._seq), timestamp, message))
+
+    def __len__(self):
+        return len(self._records)
+
+    def drain(self, limit=None):
+        """Pop up to `limit` queued records (consumer thread only).
+
+        Returns (records, dropped) where records is a list of
+        (timestamp, message) and dropped is how many records were lost
+        since the previous drain.
+        """
+        records = []
+        dropped = 0
+        popleft = self._records.popleft
+        while limit is None or len(records) < limit:
+            try:
+                seq, timestamp, message = popleft()
+            except IndexError:
+                break
+            if seq != self._next_expected:
+                dropped += seq - self._next_expected
+            self._next_expected = seq + 1
+            records.append((timestamp, message))
+        self.dropped += dropped
+        self.drained += len(records)
+        return records, dropped
+
+
+def format_batch(records, dropped=0):
+    """Render drained records as one block of '[HH:MM:SS] message' lines."""
+    lines = []
+    if dropped:
+        lines.append(f"[{time.strftime('%H:%M:%S')}] ... {dropped} messages dropped")
+    last_second = None
+    stamp = ""
+    for timestamp, message in records:
+        second = int(timestamp)
+        if second != last_second:
+            stamp = time.strftime("%H:%M:%S", time.localtime(timestamp))
+            last_second = second
+        lines.append(f"[{stamp}] {message}")
+    return "\n".join(lines) + "\n" if lines else ""
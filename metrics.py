@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Clicker Metrics
+Per-clicker counters, fire-lateness and backend-latency histograms, and
+gauges, rendered in the Prometheus text format and served over HTTP on a
+localhost port or a Unix socket.
+
+Recording is cheap: counters already live in the engine's ClickerTable and
+are read only when scraped, and a histogram observation is a bisect plus
+an array increment on the scheduler thread.
+"""
+
+import bisect
+import os
+import socketserver
+import stat
+import threading
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scheduler import NS_PER_SECOND
+
+# Histogram bucket upper bounds in nanoseconds (+Inf is implicit)
+LATENESS_BUCKETS_NS = (50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000,
+                       5_000_000, 10_000_000, 25_000_000, 100_000_000, 1_000_000_000)
+BACKEND_BUCKETS_NS = (10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+                      1_000_000, 2_500_000, 10_000_000, 100_000_000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Fixed-bucket histogram of nanosecond samples.
+
+    observe() is meant for a single writer thread; readers may see a
+    sample counted in a bucket before it reaches the sum.
+    """
+
+    def __init__(self, buckets_ns):
+        self.buckets_ns = tuple(buckets_ns)
+        self.counts = array("Q", [0] * (len(self.buckets_ns) + 1))
+        self.sum_ns = 0
+
+    def observe(self, value_ns):
+        """Count one sample."""
+        self.counts[bisect.bisect_left(self.buckets_ns, value_ns)] += 1
+        self.sum_ns += value_ns
+
+    @property
+    def count(self):
+        """Number of samples observed."""
+        return sum(self.counts)
+
+    def reset(self):
+        """Forget every sample."""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.sum_ns = 0
+
+    def lines(self, name, labels=""):
+        """Prometheus sample lines (cumulative buckets, seconds)."""
+        sep = "," if labels else ""
+        out = []
+        total = 0
+        for bound, count in zip(self.buckets_ns, self.counts):
+            total += count
+            out.append(f'{name}_bucket{{{labels}{sep}le="{bound / NS_PER_SECOND:g}"}} {total}')
+        total += self.counts[-1]
+        out.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {total}')
+        suffix = f"{{{labels}}}" if labels else ""
+        out.append(f"{name}_sum{suffix} {self.sum_ns / NS_PER_SECOND:.9f}")
+        out.append(f"{name}_count{suffix} {total}")
+        return out
+
+
+def escape_label(value):
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """Metrics for one ClickerEngine plus any extra gauges.
+
+    The engine calls observe_fire() and observe_backend() from its
+    scheduler thread; render() may be called from any thread.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.lateness = []  # per clicker id
+        self.backend_latency = Histogram(BACKEND_BUCKETS_NS)
+        self._gauges = []  # (name, help, callable)
+
+    def gauge(self, name, help_text, read):
+        """Register a gauge whose value is read() at scrape time."""
+        self._gauges.append((name, help_text, read))
+
+    def observe_fire(self, index, lateness_ns):
+        """Record the lateness of one clicker fire."""
+        lateness = self.lateness
+        while len(lateness) <= index:
+            lateness.append(Histogram(LATENESS_BUCKETS_NS))
+        lateness[index].observe(lateness_ns)
+
+    def observe_backend(self, elapsed_ns):
+        """Record the duration of one backend click call."""
+        self.backend_latency.observe(elapsed_ns)
+
+    def reset_clicker(self, index):
+        """Clear a clicker's histogram (its counters are reset by the engine)."""
+        if index < len(self.lateness):
+            self.lateness[index].reset()
+
+    def render(self):
+        """The whole registry in Prometheus text format."""
+        out = []
+        engine = self.engine
+        if engine is not None:
+            table = engine.table
+            labels = [f'clicker="{i}",name="{escape_label(table.names[i])}"' for i in range(len(table))]
+            for name, help_text, column in (
+                    ("autoclicker_clicker_fires_total", "Clicks fired", table.fires),
+                    ("autoclicker_clicker_missed_total", "Periods skipped after falling behind", table.missed),
+                    ("autoclicker_clicker_skipped_total", "Fires whose backend click failed", table.skipped)):
+                out.append(f"# HELP {name} {help_text}")
+                out.append(f"# TYPE {name} counter")
+                out.extend(f"{name}{{{labels[i]}}} {column[i]}" for i in range(len(table)))
+            name = "autoclicker_clicker_active"
+            out.append(f"# HELP {name} Whether the clicker is running")
+            out.append(f"# TYPE {name} gauge")
+            out.extend(f"{name}{{{labels[i]}}} {table.active[i]}" for i in range(len(table)))
+            name = "autoclicker_fire_lateness_seconds"
+            out.append(f"# HELP {name} Fire time minus scheduled deadline")
+            out.append(f"# TYPE {name} histogram")
+            for i, histogram in enumerate(self.lateness[:len(table)]):
+                out.extend(histogram.lines(name, labels[i]))
+        name = "autoclicker_backend_click_seconds"
+        out.append(f"# HELP {name} Duration of backend click calls")
+        out.append(f"# TYPE {name} histogram")
+        out.extend(self.backend_latency.lines(name))
+        for name, help_text, read in self._gauges:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} gauge")
+            out.append(f"{name} {read()}")
+        return "\n".join(out) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry on / and /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no host address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def unlink_socket(path):
+    """Remove a Unix socket file left at path; refuse to remove anything else.
+
+    Returns False when nothing is there; raises FileExistsError when path
+    is not a socket.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.unlink(path)
+    return True
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        unlink_socket(self.server_address)
+        # Owner-only (0600): the endpoint exposes process state
+        old_umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(old_umask)
+        # Attributes BaseHTTPRequestHandler expects from an HTTPServer
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+class MetricsServer:
+    """Serves a registry in a background thread.
+
+    address is a port number or "host:port" (host defaults to 127.0.0.1)
+    or a filesystem path for a Unix socket.
+    """
+
+    def __init__(self, registry, address):
+        self.registry = registry
+        self.address = str(address)
+        if "/" in self.address:
+            server = _UnixHTTPServer(self.address, _MetricsHandler)
+        else:
+            host, _, port = self.address.rpartition(":")
+            server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _MetricsHandler)
+            server.daemon_threads = True
+        server.registry = registry
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        """Where the metrics can be scraped."""
+        if isinstance(self._server, _UnixHTTPServer):
+            return f"unix:{self.address}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def close(self):
+        """Stop serving and remove a Unix socket file."""
+        self._server.shutdown()
+        self._server.server_close()
+        if isinstance(self._server, _UnixHTTPServer):
+            try:
+                unlink_socket(self.address)
+            except FileExistsError:
+                pass  # replaced since; not ours to remove
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Mouse Paths
+Compresses pointer motion while it is recorded and rebuilds smooth moves
+for playback.
+
+PathSimplifier is an opening-window polyline simplifier: it keeps the last
+emitted vertex as an anchor and extends a segment from it while every
+point seen since stays within `tolerance` pixels of where the segment
+places the pointer at that point's time (synchronized distance), so the
+kept vertices replay with the recorded timing as well as shape.
+"""
+
+import math
+
+from click_recorder import MOVE
+from scheduler import NS_PER_SECOND
+
+# Default tolerance (pixels), window cap and replay rate (moves per second)
+PATH_TOLERANCE = 2.0
+MAX_WINDOW = 256
+MOVE_RATE = 100
+
+
+class PathSimplifier:
+    """Online path simplification; emit(t_ns, x, y) receives the kept vertices.
+
+    add() costs O(window) and the window is capped at `max_window` points,
+    after which a vertex is emitted regardless.
+    """
+
+    def __init__(self, emit, tolerance=PATH_TOLERANCE, max_window=MAX_WINDOW):
+        self.emit = emit
+        self.tolerance = tolerance
+        self.max_window = max_window
+        self.received = 0
+        self.emitted = 0
+        self._anchor = None
+        self._window = []  # points since the anchor, the newest last
+
+    def add(self, t_ns, x, y):
+        """Feed one raw pointer position."""
+        self.received += 1
+        if self._anchor is None:
+            self._emit(t_ns, x, y)
+            return
+        window = self._window
+        if window and (len(window) >= self.max_window or not self._fits(t_ns, x, y)):
+            self._emit(*window[-1])
+        window.append((t_ns, x, y))
+
+    def flush(self):
+        """Emit the pending end of the path (e.g. before a click)."""
+        if self._window:
+            self._emit(*self._window[-1])
+
+    def reset(self):
+        """Forget the anchor so the next point starts a new path."""
+        self._anchor = None
+        self._window = []
+
+    def _fits(self, t_ns, x, y):
+        """True when every windowed point lies within tolerance of anchor -> (x, y)."""
+        t0, x0, y0 = self._anchor
+        span = t_ns - t0
+        limit = self.tolerance
+        for t, px, py in self._window:
+            f = (t - t0) / span if span > 0 else 1.0
+            if math.hypot(x0 + (x - x0) * f - px, y0 + (y - y0) * f - py) > limit:
+                return False
+        return True
+
+    def _emit(self, t_ns, x, y):
+        self._anchor = (t_ns, x, y)
+        self._window = []
+        self.emitted += 1
+        self.emit(t_ns, x, y)
+
+
+def interpolate_moves(events, rate=MOVE_RATE):
+    """Insert intermediate moves at `rate` per second before every MOVE event.
+
+    events are (offset_ns, x, y, code) in time order; segments ending in a
+    click are left alone, so click-only sequences are unchanged.
+    """
+    step = NS_PER_SECOND / rate
+    previous = None
+    for event in events:
+        offset, x, y, code = event
+        if code == MOVE and previous is not None:
+            p_offset, px, py, _ = previous
+            span = offset - p_offset
+            k = 1
+            while k * step < span:
+                f = k * step / span
+                yield int(p_offset + k * step), round(px + (x - px) * f), round(py + (y - py) * f), MOVE
+                k += 1
+        yield event
+        previous = event
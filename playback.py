@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Sequence Playback
+Replays a click sequence against absolute deadlines on time.monotonic_ns().
+Each click is due at the replay start plus its (scaled, optionally clamped)
+offset in the recording, so click latency never accumulates, and each
+repetition starts exactly where the previous one was scheduled to end.
+
+With a click_batch callable, events due within the same millisecond are
+coalesced and sent in one call; with a Burst, every recorded click
+becomes a burst of clicks.
+"""
+
+import math
+import threading
+import time
+
+from bursts import COALESCE_NS, coalesce, expand_bursts
+from motion_path import interpolate_moves
+from scheduler import NS_PER_SECOND, VirtualClock, seconds_to_ns
+
+# Deadlines closer than this are awaited by spinning instead of sleeping
+PLAYBACK_SPIN_NS = 1_000_000
+
+
+def playback_offsets(sequence, speed=1.0, max_gap=None):
+    """Yield (offset_ns, x, y, button) per click, relative to the first click.
+
+    Gaps are divided by `speed`; with `max_gap` (seconds) longer idle gaps
+    are shortened to it before scaling.
+    """
+    max_gap_ns = seconds_to_ns(max_gap) if max_gap else None
+    offset = 0.0
+    previous = None
+    for t_ns, x, y, button in sequence:
+        if previous is not None:
+            gap = t_ns - previous
+            if max_gap_ns is not None and gap > max_gap_ns:
+                gap = max_gap_ns
+            offset += max(gap, 0) / speed
+        previous = t_ns
+        yield int(offset), x, y, button
+
+
+class PlaybackReport:
+    """Deadline error of one replay (lateness = actual - scheduled)."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.clicks = 0
+        self.last_lateness_ns = 0
+        self.max_lateness_ns = 0
+        self._total = 0
+        self._total_sq = 0
+
+    def add(self, lateness_ns):
+        """Record the lateness of one click."""
+        self.clicks += 1
+        self.last_lateness_ns = lateness_ns
+        self._total += lateness_ns
+        self._total_sq += lateness_ns * lateness_ns
+        if lateness_ns > self.max_lateness_ns:
+            self.max_lateness_ns = lateness_ns
+
+    def mean_lateness_ns(self):
+        """Average lateness over the replay."""
+        return self._total / self.clicks if self.clicks else 0.0
+
+    def jitter_ns(self):
+        """Standard deviation of the lateness."""
+        if not self.clicks:
+            return 0.0
+        mean = self.mean_lateness_ns()
+        return math.sqrt(max(self._total_sq / self.clicks - mean * mean, 0.0))
+
+    def summary(self):
+        """One-line drift/jitter report."""
+        return (f"Replay {self.replay}: {self.clicks} clicks, drift {self.last_lateness_ns / 1e6:+.2f} ms, "
+                f"jitter {self.jitter_ns() / 1e6:.2f} ms, mean {self.mean_lateness_ns() / 1e6:.2f} ms, "
+                f"max {self.max_lateness_ns / 1e6:.2f} ms")
+
+
+class SequencePlayer:
+    """Plays a sequence `repeat` times through click(x, y, button).
+
+    sequence is any re-iterable of (t_ns, x, y, button) such as a
+    ClickRecorder or SequenceFile; moves reach click() with the MOVE code.
+    With move_rate, recorded paths are filled in with interpolated moves at
+    that many per second. on_click(index, x, y, button) and
+    on_report(report) are called on the playing thread.
+
+    click_batch([(x, y, button), ...]) receives the events due within
+    coalesce_ns of each other as one list; burst (a Burst) repeats each
+    recorded click with the burst's count and spacing.
+
+    progress is (replay, events played, offset_ns of the last event) for
+    displays to poll; it is replaced, never mutated.
+    """
+
+    def __init__(self, sequence, click, speed=1.0, max_gap=None, repeat=1, repeat_interval=0,
+                 move_rate=None, on_click=None, on_report=None, clock=time.monotonic_ns,
+                 spin_ns=PLAYBACK_SPIN_NS, click_batch=None, burst=None, coalesce_ns=COALESCE_NS):
+        if speed <= 0:
+            raise ValueError("Speed must be greater than 0")
+        self.sequence = sequence
+        self.click = click
+        self.speed = speed
+        self.max_gap = max_gap
+        self.repeat = repeat
+        self.repeat_interval_ns = seconds_to_ns(repeat_interval)
+        self.move_rate = move_rate
+        self.on_click = on_click
+        self.on_report = on_report
+        self.clock = clock
+        self.spin_ns = spin_ns
+        self.click_batch = click_batch
+        self.burst = burst
+        self.coalesce_ns = coalesce_ns
+        self.stop_event = threading.Event()
+        self.reports = []
+        # (replay, events played in it, offset_ns of the last one), replaced as one tuple
+        self.progress = (0, 0, 0)
+
+    def stop(self):
+        """Stop playback at the next wait."""
+        self.stop_event.set()
+
+    def _wait_until(self, deadline_ns):
+        """Sleep (then spin) until the deadline; return the wake time, or None if stopped.
+
+        A VirtualClock is simply advanced to the deadline.
+        """
+        if isinstance(self.clock, VirtualClock):
+            if self.stop_event.is_set():
+                return None
+            self.clock.advance_to(deadline_ns)
+            return self.clock()
+        while True:
+            now = self.clock()
+            remaining = deadline_ns - now
+            if remaining > self.spin_ns:
+                if self.stop_event.wait((remaining - self.spin_ns) / NS_PER_SECOND):
+                    return None
+            elif self.stop_event.is_set():
+                return None  # also when running behind, with every deadline already past
+            elif remaining <= 0:
+                return now
+
+    def run(self):
+        """Play every repetition; return the list of PlaybackReports."""
+        replay_start = self.clock()
+        for replay in range(1, self.repeat + 1):
+            report = PlaybackReport(replay)
+            offset = 0
+            events = playback_offsets(self.sequence, self.speed, self.max_gap)
+            if self.move_rate:
+                events = interpolate_moves(events, self.move_rate)
+            if self.burst is not None:
+                events = expand_bursts(events, self.burst)
+            if self.click_batch is None:
+                groups = ([event] for event in events)
+            else:
+                groups = coalesce(events, self.coalesce_ns)
+            index = 0
+            for group in groups:
+                now = self._wait_until(replay_start + group[0][0])
+                if now is None:
+                    return self.reports
+                if self.click_batch is None:
+                    _, x, y, button = group[0]
+                    self.click(x, y, button)
+                else:
+                    self.click_batch([(x, y, button) for _, x, y, button in group])
+                for offset, x, y, button in group:
+                    # Events coalesced after the first are sent up to coalesce_ns early
+                    report.add(now - replay_start - offset)
+                    if self.on_click is not None:
+                        self.on_click(index, x, y, button)
+                    index += 1
+                self.progress = (replay, index, offset)
+            self.reports.append(report)
+            if self.on_report is not None:
+                self.on_report(report)
+            # The next repetition starts from this one's scheduled end, not from now
+            replay_start += offset + self.repeat_interval_ns
+        return self.reports
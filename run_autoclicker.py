@@ -2,39 +2,58 @@
 """
 Autoclicker Launcher
 Detects platform and runs the appropriate version (GUI or terminal).
+Heavy modules (tkinter, pynput, pyautogui) are only imported by the version
+that actually runs, and the terminal fallback runs in this same process.
+Any arguments (e.g. --headless) are passed straight to the terminal version.
 """
 
-import sys
-import platform
-import subprocess
+import importlib.util
 import os
+import platform
+import sys
 
-def main():
+def module_available(name):
+    """Check whether a module can be imported without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def run_terminal(argv):
+    """Run the terminal version in-process."""
+    import autoclicker
+    return autoclicker.main(argv)
+
+def main(argv=None):
     """Main launcher function."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Command-line options belong to the terminal version (headless mode etc.)
+        return run_terminal(argv)
+
     system = platform.system().lower()
-    
+
     print("=== Simple Autoclicker Launcher ===")
     print(f"Platform: {system.title()}")
     print()
-    
+
     # Check if GUI is available
-    try:
-        import tkinter
-        gui_available = True
+    gui_available = module_available("tkinter")
+    if gui_available:
         print("✓ GUI (tkinter) available")
-    except ImportError:
-        gui_available = False
+    else:
         print("✗ GUI (tkinter) not available")
-    
+
     # Check if terminal version is available
-    terminal_available = os.path.exists("autoclicker.py")
+    here = os.path.dirname(os.path.abspath(__file__))
+    terminal_available = os.path.exists(os.path.join(here, "autoclicker.py"))
     if terminal_available:
         print("✓ Terminal version available")
     else:
         print("✗ Terminal version not found")
-    
+
     print()
-    
+
     # Choose version to run
     if gui_available:
         print("Starting GUI version...")
@@ -45,13 +64,14 @@ def main():
             print(f"Error starting GUI: {e}")
             if terminal_available:
                 print("Falling back to terminal version...")
-                subprocess.run([sys.executable, "autoclicker.py"])
+                return run_terminal([])
+        return 0
     elif terminal_available:
         print("Starting terminal version...")
-        subprocess.run([sys.executable, "autoclicker.py"])
+        return run_terminal([])
     else:
         print("Error: No autoclicker version available!")
-        sys.exit(1)
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Click Scheduler
+An event-driven deadline scheduler shared by the terminal and GUI autoclickers.
+Deadlines are absolute times on time.monotonic_ns() kept in a min-heap; a single
+thread sleeps until the earliest deadline or a control change, so an idle
+scheduler never wakes up.
+
+A job may carry a Jitter (see jitter.py) whose pre-drawn offsets move
+each deadline around its grid position.
+
+With a VirtualClock and manual=True no thread is started; run_until() fires
+the due jobs on the calling thread and jumps the clock from deadline to
+deadline, so hours of schedule run in milliseconds.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def seconds_to_ns(seconds):
+    """Convert a (possibly fractional) number of seconds to integer nanoseconds."""
+    return int(round(float(seconds) * NS_PER_SECOND))
+
+
+class VirtualClock:
+    """A manually advanced stand-in for time.monotonic_ns().
+
+    Call it to read the time; it only moves through advance()/advance_to().
+    """
+
+    def __init__(self, start_ns=0):
+        self.now_ns = start_ns
+
+    def __call__(self):
+        return self.now_ns
+
+    def advance_to(self, t_ns):
+        """Move the clock forward to t_ns (never backwards)."""
+        if t_ns > self.now_ns:
+            self.now_ns = t_ns
+
+    def advance(self, seconds):
+        """Move the clock forward by `seconds`."""
+        self.now_ns += seconds_to_ns(seconds)
+
+
+class ScheduledJob:
+    """A periodic job and the fire-time error measured for it."""
+
+    def __init__(self, name, interval_ns, callback, anchor_ns, offset_ns=0, catch_up=0, jitter=None):
+        self.name = name
+        self.interval_ns = interval_ns
+        self.callback = callback
+        self.anchor_ns = anchor_ns
+        self.offset_ns = offset_ns
+        # Overdue periods that may still fire back-to-back before being skipped;
+        # one budget per late streak, refilled once the job is back on time
+        self.catch_up = catch_up
+        self.catch_up_left = catch_up
+        self.jitter = jitter
+        self.grid_ns = None  # unjittered position of the pending deadline
+        self.due_ns = None  # pending deadline
+        self.deadline_ns = None
+        self.token = None
+
+        # Fire-time error statistics (lateness = actual - scheduled)
+        self.fires = 0
+        self.missed = 0
+        self.last_lateness_ns = 0
+        self.max_lateness_ns = 0
+        self.total_lateness_ns = 0
+
+    def elapsed(self):
+        """Seconds between the anchor and the deadline that last fired."""
+        if self.deadline_ns is None:
+            return 0.0
+        return (self.deadline_ns - self.anchor_ns) / NS_PER_SECOND
+
+    def mean_lateness_ns(self):
+        """Average lateness over all fires so far."""
+        if not self.fires:
+            return 0
+        return self.total_lateness_ns // self.fires
+
+    def first_deadline(self, now_ns, immediate=False):
+        """First deadline anchor + offset + k * interval that is still ahead of now.
+
+        k starts at 1, or at 0 when `immediate` is set; with `immediate` a
+        deadline that has just passed is returned as-is so it fires at once.
+        """
+        base = self.anchor_ns + self.offset_ns
+        if immediate:
+            if base + self.interval_ns > now_ns:
+                return base
+        deadline = base + self.interval_ns
+        if deadline <= now_ns:
+            periods = (now_ns - base) // self.interval_ns + 1
+            deadline = base + periods * self.interval_ns
+        return deadline
+
+
+class ClickScheduler:
+    """Runs periodic jobs at absolute deadlines from one sleeping thread.
+
+    Callbacks are invoked on the scheduler thread as callback(job, lateness_ns)
+    and must not block for long; they are called outside the internal lock so
+    they may add or remove jobs.
+
+    spin_ns trades CPU for accuracy: deadlines closer than this are awaited by
+    spinning on the clock instead of sleeping (used by high-rate mode).
+
+    A manual scheduler never starts a thread and is driven by run_until().
+    """
+
+    def __init__(self, clock=time.monotonic_ns, spin_ns=0, manual=False):
+        self.clock = clock
+        self.spin_ns = spin_ns
+        self.manual = manual
+        self._heap = []  # (deadline_ns, token, name)
+        self._jobs = {}
+        self._tokens = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Start the scheduler thread (idempotent; manual schedulers only mark themselves running)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            if self.manual:
+                return
+        self._thread = threading.Thread(target=self._run, name="click-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the scheduler thread and drop every job."""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._jobs.clear()
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def add(self, name, interval, callback, anchor_ns=None, offset=0, catch_up=0,
+            immediate=False, jitter=None):
+        """Schedule (or reschedule) a job firing every `interval` seconds.
+
+        Deadlines are anchor + offset + k * interval for k >= 1 (k >= 0 with
+        `immediate`); the anchor defaults to now, so jobs sharing an anchor
+        stay phase-locked. Up to `catch_up` overdue periods are fired late
+        rather than skipped. A jitter moves each deadline by its next
+        offset, limited to half an interval.
+        """
+        interval_ns = seconds_to_ns(interval)
+        if interval_ns <= 0:
+            raise ValueError("Interval must be greater than 0")
+        with self._cond:
+            now = self.clock()
+            job = ScheduledJob(name, interval_ns, callback,
+                               now if anchor_ns is None else anchor_ns,
+                               seconds_to_ns(offset), catch_up, jitter)
+            self._push(job, job.first_deadline(now, immediate), now)
+            self._jobs[name] = job
+            self._cond.notify()
+        return job
+
+    def add_once(self, name, deadline_ns, callback):
+        """Schedule a one-shot job at an absolute deadline (replacing any job of that name)."""
+        with self._cond:
+            job = ScheduledJob(name, 0, callback, deadline_ns)
+            self._push(job, deadline_ns)
+            self._jobs[name] = job
+            self._cond.notify()
+        return job
+
+    def remove(self, name):
+        """Cancel a job; its stale heap entry is discarded lazily."""
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job is not None:
+                job.token = None
+                self._cond.notify()
+        return job
+
+    def get(self, name):
+        """Return the job registered under name, or None."""
+        with self._cond:
+            return self._jobs.get(name)
+
+    def jobs(self):
+        """Snapshot of the currently scheduled jobs."""
+        with self._cond:
+            return list(self._jobs.values())
+
+    def deadlines(self):
+        """{name: pending deadline_ns} of every scheduled job."""
+        with self._cond:
+            return {name: job.due_ns for name, job in self._jobs.items()}
+
+    def is_idle(self):
+        """True when no jobs are scheduled."""
+        with self._cond:
+            return not self._jobs
+
+    def run_until(self, end_ns):
+        """Fire every job due up to end_ns on this thread, advancing a VirtualClock.
+
+        Each job fires exactly at its deadline (zero lateness); returns the
+        number of fires.
+        """
+        fired = 0
+        while True:
+            with self._cond:
+                entry = self._peek()
+                if entry is None or entry[0] > end_ns:
+                    self.clock.advance_to(end_ns)
+                    return fired
+                deadline, job = entry
+                heapq.heappop(self._heap)
+                self.clock.advance_to(deadline)
+                lateness = self._record_fire(job, deadline, self.clock())
+            self._invoke(job, lateness)
+            fired += 1
+
+    def _push(self, job, grid_ns, earliest_ns=None):
+        job.grid_ns = deadline_ns = grid_ns
+        if job.jitter is not None:
+            half = job.interval_ns // 2
+            deadline_ns += max(-half, min(half, job.jitter.next_delay_ns()))
+            # A first deadline jittered into the past fires now, not late
+            if earliest_ns is not None and deadline_ns < earliest_ns:
+                deadline_ns = earliest_ns
+        job.due_ns = deadline_ns
+        job.token = next(self._tokens)
+        heapq.heappush(self._heap, (deadline_ns, job.token, job.name))
+
+    def _peek(self):
+        """Earliest live (deadline, job), discarding cancelled entries (lock held)."""
+        heap = self._heap
+        while heap:
+            deadline, token, name = heap[0]
+            job = self._jobs.get(name)
+            if job is not None and job.token == token:
+                return deadline, job
+            heapq.heappop(heap)
+        return None
+
+    def _record_fire(self, job, deadline, now):
+        """Update a job's statistics for a fire at `now` and queue its next deadline (lock held)."""
+        lateness = now - deadline
+        job.deadline_ns = deadline
+        job.fires += 1
+        job.last_lateness_ns = lateness
+        job.total_lateness_ns += lateness
+        if lateness > job.max_lateness_ns:
+            job.max_lateness_ns = lateness
+        if not job.interval_ns:
+            # One-shot job: done
+            del self._jobs[job.name]
+            job.token = None
+            return lateness
+
+        # Next deadline stays on the absolute grid; periods that were
+        # missed beyond what is left of the catch-up budget are skipped
+        # and counted rather than bursted.
+        next_deadline = job.grid_ns + job.interval_ns
+        if next_deadline <= now:
+            skipped = (now - next_deadline) // job.interval_ns + 1 - job.catch_up_left
+            if skipped > 0:
+                job.missed += skipped
+                next_deadline += skipped * job.interval_ns
+        if next_deadline <= now:
+            job.catch_up_left -= 1
+        else:
+            job.catch_up_left = job.catch_up
+        self._push(job, next_deadline)
+        return lateness
+
+    def _invoke(self, job, lateness):
+        """Run a job's callback outside the lock."""
+        try:
+            job.callback(job, lateness)
+        except Exception as e:
+            print(f"Scheduler job {job.name!r} failed: {e}")
+
+    def _run(self):
+        """Scheduler loop: sleep until the earliest deadline, then fire it.
+
+        The last spin_ns before a deadline are spun out without the lock,
+        so jobs can be added, removed and inspected meanwhile; the heap
+        head is checked again afterwards.
+        """
+        cond = self._cond
+        clock = self.clock
+        spin_until = None
+        while True:
+            if spin_until is not None:
+                while clock() < spin_until:
+                    pass
+                spin_until = None
+            with cond:
+                if not self._running:
+                    return
+                entry = self._peek()
+                if entry is None:
+                    cond.wait()
+                    continue
+                deadline, job = entry
+                now = clock()
+                if deadline > now:
+                    if deadline - now > self.spin_ns:
+                        cond.wait((deadline - now - self.spin_ns) / NS_PER_SECOND)
+                    else:
+                        spin_until = deadline
+                    continue
+                heapq.heappop(self._heap)
+                lateness = self._record_fire(job, deadline, now)
+
+            self._invoke(job, lateness)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Click Sequence Files
+A versioned binary format for recorded click sequences: a fixed header
+followed by fixed-width little-endian records. Files are memory-mapped for
+playback and iterated straight from the mapping, so opening a sequence of
+any length only reads the header.
+
+Also a command-line tool that streams sequences to and from JSON/CSV:
+
+    python3 sequence_file.py import clicks.csv clicks.clkseq
+    python3 sequence_file.py export clicks.clkseq clicks.json
+    python3 sequence_file.py info clicks.clkseq
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+
+from click_recorder import BUTTON_NAMES, button_code
+
+MAGIC = b"CLKSEQ"
+VERSION = 1
+EXTENSION = ".clkseq"
+# magic, version, header size, record size, record count
+HEADER = struct.Struct("<6sHHHQ")
+# time since the start of the recording (ns), x, y, button code
+RECORD = struct.Struct("<qiiB3x")
+# Records packed per write when saving
+WRITE_BATCH = 4096
+
+
+class SequenceFormatError(ValueError):
+    """Raised when a file is not a readable click sequence."""
+
+
+def write_sequence(path, events):
+    """Write (t_ns, x, y, button) events to a sequence file; return the count.
+
+    The count in the header is filled in after the last record, so events
+    may be any iterator.
+    """
+    count = 0
+    buffer = bytearray(RECORD.size * WRITE_BATCH)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.size, 0))
+        used = 0
+        for event in events:
+            RECORD.pack_into(buffer, used, *event)
+            used += RECORD.size
+            count += 1
+            if used == len(buffer):
+                f.write(buffer)
+                used = 0
+        f.write(memoryview(buffer)[:used])
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.size, count))
+    return count
+
+
+def save_recording(recorder, path):
+    """Save a ClickRecorder with times relative to the start of the recording."""
+    start = recorder.start_ns
+    return write_sequence(path, ((t_ns - start, x, y, button) for t_ns, x, y, button in recorder))
+
+
+class SequenceFile:
+    """A memory-mapped, read-only click sequence.
+
+    Iterating yields (t_ns, x, y, button) tuples unpacked directly from the
+    mapping; nothing is loaded up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SequenceFormatError(f"{path}: empty file")
+        try:
+            self.count, self._offset = self._read_header()
+        except SequenceFormatError:
+            self.close()
+            raise
+        self._records = memoryview(self._map)[self._offset:self._offset + self.count * RECORD.size]
+
+    def _read_header(self):
+        if len(self._map) < HEADER.size:
+            raise SequenceFormatError(f"{self.path}: truncated header")
+        magic, version, header_size, record_size, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SequenceFormatError(f"{self.path}: not a click sequence file")
+        if version != VERSION or record_size != RECORD.size:
+            raise SequenceFormatError(f"{self.path}: unsupported sequence version {version}")
+        if header_size + count * record_size > len(self._map):
+            raise SequenceFormatError(f"{self.path}: truncated records")
+        return count, header_size
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return RECORD.iter_unpack(self._records)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("sequence index out of range")
+        return RECORD.unpack_from(self._records, index * RECORD.size)
+
+    def duration_ns(self):
+        """Time from the first to the last click."""
+        if self.count < 2:
+            return 0
+        return self[-1][0] - self[0][0]
+
+    def close(self):
+        """Unmap and close the file."""
+        records = getattr(self, "_records", None)
+        self._records = None
+        try:
+            if records is not None:
+                records.release()
+            self._map.close()
+        except BufferError:
+            # An iterator still reads from the mapping; it is unmapped when collected
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Text formats: one event per CSV row or JSON object, with the button by name
+
+FIELDS = ("t_ns", "x", "y", "button")
+
+
+def _from_text(row):
+    """Convert a CSV row or JSON object into a (t_ns, x, y, button) event."""
+    try:
+        return int(row["t_ns"]), int(row["x"]), int(row["y"]), button_code(row.get("button", "left"))
+    except (KeyError, TypeError, ValueError):
+        raise SequenceFormatError(f"Invalid event: {row!r}")
+
+
+def _to_text(event):
+    t_ns, x, y, button = event
+    return {"t_ns": t_ns, "x": x, "y": y, "button": BUTTON_NAMES.get(button, "unknown")}
+
+
+def read_csv(f):
+    """Stream events from a CSV file with a t_ns,x,y,button header."""
+    for row in csv.DictReader(f):
+        yield _from_text(row)
+
+
+def write_csv(f, events):
+    """Stream events to CSV."""
+    writer = csv.writer(f)
+    writer.writerow(FIELDS)
+    for event in events:
+        writer.writerow(_to_text(event).values())
+
+
+def read_json(f, block_size=65536):
+    """Stream events from a JSON array of objects without loading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        # Skip separators between objects
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            if buffer[pos] == "[":
+                started = True
+            pos += 1
+        if pos < len(buffer):
+            if not started:
+                raise SequenceFormatError("Expected a JSON array of events")
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise SequenceFormatError("Malformed JSON sequence")
+                obj = None
+            if obj is not None:
+                yield _from_text(obj)
+                pos = end
+                continue
+        if eof:
+            return
+        block = f.read(block_size)
+        eof = not block
+        buffer = buffer[pos:] + block
+        pos = 0
+
+
+def write_json(f, events):
+    """Stream events to a JSON array, one object per line."""
+    f.write("[")
+    separator = "\n"
+    for event in events:
+        f.write(separator + json.dumps(_to_text(event)))
+        separator = ",\n"
+    f.write("\n]\n")
+
+
+TEXT_FORMATS = {".csv": (read_csv, write_csv), ".json": (read_json, write_json)}
+
+
+def _text_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in TEXT_FORMATS:
+        raise SequenceFormatError(f"Unsupported format {ext!r} (use {', '.join(TEXT_FORMATS)})")
+    return TEXT_FORMATS[ext]
+
+
+def import_text(source, target):
+    """Convert a JSON/CSV sequence into a sequence file; return the count."""
+    read, _ = _text_format(source)
+    with open(source, newline="") as f:
+        return write_sequence(target, read(f))
+
+
+def export_text(source, target):
+    """Convert a sequence file into JSON/CSV; return the count."""
+    _, write = _text_format(target)
+    with SequenceFile(source) as sequence, open(target, "w", newline="") as f:
+        write(f, sequence)
+        return len(sequence)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Convert and inspect click sequence files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("import", "convert JSON/CSV to a sequence file"),
+                            ("export", "convert a sequence file to JSON/CSV")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("source")
+        command.add_argument("target")
+    info = commands.add_parser("info", help="show a sequence file's header")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "import":
+            print(f"Imported {import_text(args.source, args.target)} clicks into {args.target}")
+        elif args.command == "export":
+            print(f"Exported {export_text(args.source, args.target)} clicks to {args.target}")
+        else:
+            with SequenceFile(args.path) as sequence:
+                print(f"{args.path}: version {VERSION}, {len(sequence)} clicks, "
+                      f"{sequence.duration_ns() / 1e9:.3f} s")
+    except (OSError, SequenceFormatError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Sequence View
+A paged, filterable window onto a recorded sequence for the Recorder tab.
+
+Only the rows on screen are read, by index, straight from the recording's
+storage (a ClickRecorder's spill file or a SequenceFile's mapping), so a
+refresh costs the same for ten events as for ten million. A filter on
+button or screen region builds an index of the matching events a batch at
+a time, letting the GUI scan between redraws instead of freezing.
+"""
+
+import itertools
+from array import array
+from bisect import bisect_left
+
+from click_recorder import BUTTON_NAMES, EVENT_CODES, MOVE
+
+# Events examined per scan() call while a filter is being built
+SCAN_BATCH = 50_000
+
+
+def format_event(index, event):
+    """One display line, e.g. "12. Click at (10, 20) - left"."""
+    _, x, y, button = event
+    if button == MOVE:
+        return f"{index + 1}. Move to ({x}, {y})"
+    return f"{index + 1}. Click at ({x}, {y}) - {BUTTON_NAMES.get(button, 'left')}"
+
+
+def parse_region(text):
+    """An (x, y, width, height) region from "x,y,w,h"; empty text is no region."""
+    if not text.strip():
+        return None
+    try:
+        x, y, width, height = (int(v) for v in text.replace(" ", "").split(","))
+    except ValueError:
+        raise ValueError(f"Invalid region: {text!r} (expected x,y,width,height)") from None
+    if width <= 0 or height <= 0:
+        raise ValueError("Region width and height must be positive")
+    return x, y, width, height
+
+
+class SequenceView:
+    """Rows of a sequence, optionally filtered to one button and/or a region.
+
+    sequence needs len() and indexing (ClickRecorder, SequenceFile or a
+    list). Rows are numbered from 0; without a filter row i is event i.
+    With one, rows are the matching events found so far, and scan() must
+    be called until it returns True to find the rest.
+    """
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.total = len(sequence)
+        self.button = None
+        self.region = None
+        self._matches = None  # array of matching event indices, or None when unfiltered
+        self._events = None
+        self.scanned = self.total
+
+    def set_filter(self, button=None, region=None):
+        """Show only events of `button` (a name or "move") inside `region`; None clears."""
+        if button is not None and button not in EVENT_CODES:
+            raise ValueError(f"Unknown button: {button!r} (choose from {', '.join(EVENT_CODES)})")
+        self.button = button
+        self.region = region
+        if button is None and region is None:
+            self._matches = None
+            self._events = None
+            self.scanned = self.total
+            return
+        self._matches = array("q")
+        self._events = iter(self.sequence)
+        self.scanned = 0
+
+    @property
+    def filtered(self):
+        return self._matches is not None
+
+    def scan(self, limit=SCAN_BATCH):
+        """Examine up to `limit` more events for the filter; True once all are done."""
+        if self._events is None:
+            return True
+        code = None if self.button is None else EVENT_CODES[self.button]
+        if self.region is not None:
+            left, top, width, height = self.region
+            right, bottom = left + width, top + height
+        matches = self._matches
+        index = self.scanned
+        for _, x, y, button in itertools.islice(self._events, limit):
+            if ((code is None or button == code)
+                    and (self.region is None or (left <= x < right and top <= y < bottom))):
+                matches.append(index)
+            index += 1
+        self.scanned = index
+        if index >= self.total:
+            self._events = None
+            return True
+        return False
+
+    def __len__(self):
+        return self.total if self._matches is None else len(self._matches)
+
+    def rows(self, first, count):
+        """Up to `count` (index, event) rows starting at row `first`."""
+        first = max(first, 0)
+        last = min(first + count, len(self))
+        if self._matches is None:
+            return [(i, self.sequence[i]) for i in range(first, last)]
+        return [(i, self.sequence[i]) for i in self._matches[first:last]]
+
+    def row_of(self, index):
+        """The row showing event `index`, or the next matching event after it."""
+        if self._matches is None:
+            return min(max(index, 0), max(self.total - 1, 0))
+        return min(bisect_left(self._matches, index), max(len(self._matches) - 1, 0))
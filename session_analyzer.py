@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Session Analyzer
+Offline report on click audit logs (see audit_log.py) and recorded
+sequence files: per-clicker lateness and backend-latency percentiles,
+inter-click interval distributions, lateness drift and stalls.
+
+Files are streamed CHUNK records at a time into fixed-size histograms
+with 1% wide buckets, so memory stays flat however large the logs are:
+
+    python3 session_analyzer.py clicks.clkaud
+    python3 session_analyzer.py clicks.clkaud --since 8 --json
+    python3 session_analyzer.py session.clkseq
+
+A log path without a segment number reads all of its segments. Needs
+NumPy.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+import time
+
+from audit_log import FIELDS, AuditFormatError, read_audit, read_header, segment_paths
+from click_recorder import BUTTON_NAMES, MOVE
+from scheduler import NS_PER_SECOND
+from sequence_file import (HEADER as SEQUENCE_HEADER, MAGIC as SEQUENCE_MAGIC, VERSION as SEQUENCE_VERSION,
+                           SequenceFormatError)
+
+# Records read per chunk
+CHUNK = 1 << 20
+# Relative width of a histogram bucket, and buckets to cover any int64 value
+BUCKET_STEP = math.log1p(0.01)
+BUCKETS = int(math.log(2 ** 63) / BUCKET_STEP) + 2
+PERCENTILES = (50, 90, 99, 99.9)
+# An interval this many times the clicker's median is a stall
+GAP_FACTOR = 5.0
+# Longest intervals kept per clicker as stall candidates
+TOP_GAPS = 10
+# Segments whose clocks are further apart than this come from different runs
+SESSION_BREAK_NS = NS_PER_SECOND
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+
+class LogHistogram:
+    """Counts of non-negative nanosecond values in 1% wide buckets."""
+
+    def __init__(self, np):
+        self._np = np
+        self.counts = np.zeros(BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, values):
+        """Count an array of values (negative ones count as 0)."""
+        np = self._np
+        if not len(values):
+            return
+        values = np.maximum(values, 0)
+        buckets = np.ceil(np.log(np.maximum(values, 1)) / BUCKET_STEP).astype(np.int64)
+        self.counts += np.bincount(buckets, minlength=BUCKETS)[:BUCKETS]
+        self.count += len(values)
+        self.total += int(values.sum())
+        self.max = max(self.max, int(values.max()))
+
+    def percentile(self, q):
+        """The value at percentile q, to within one bucket (1%), capped at the max."""
+        if not self.count:
+            return 0
+        rank = max(math.ceil(q / 100 * self.count), 1)
+        bucket = int(self._np.searchsorted(self._np.cumsum(self.counts), rank))
+        return min(round(math.exp(bucket * BUCKET_STEP)) if bucket else 0, self.max)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        """Percentiles, mean and max in milliseconds."""
+        out = {f"p{q:g}": self.percentile(q) / 1e6 for q in PERCENTILES}
+        out.update(mean=self.mean() / 1e6, max=self.max / 1e6)
+        return out
+
+    def decades(self):
+        """Counts per power-of-ten range in ms, e.g. {"0.1-1 ms": 12}."""
+        out = {}
+        values = self._np.exp(self._np.arange(BUCKETS) * BUCKET_STEP)
+        for bucket in self._np.nonzero(self.counts)[0]:
+            exponent = math.floor(math.log10(max(values[bucket] / 1e6, 1e-6)) + 1e-9)
+            key = f"{10.0 ** exponent:g}-{10.0 ** (exponent + 1):g} ms"
+            out[key] = out.get(key, 0) + int(self.counts[bucket])
+        return out
+
+
+class ClickerStats:
+    """Streaming statistics of one clicker (or one button of a recording)."""
+
+    def __init__(self, np, name):
+        self._np = np
+        self.name = name
+        self.events = 0
+        self.clicks = 0
+        self.lateness = LogHistogram(np)
+        self.latency = LogHistogram(np)
+        self.intervals = LogHistogram(np)
+        self.early = 0
+        self.active_ns = 0
+        self.last_ns = None
+        self.offset_ns = None
+        self.gaps = []  # heap of (interval_ns, end_ns, wall offset_ns)
+        # Least-squares sums of lateness (ms) against time (hours)
+        self._t0 = None
+        self._fit = [0, 0.0, 0.0, 0.0, 0.0]  # n, sum t, sum l, sum t*t, sum t*l
+
+    def add(self, actual_ns, clicks, lateness_ns=None, latency_ns=None):
+        """Add one chunk of this clicker's records, in order."""
+        np = self._np
+        self.events += len(actual_ns)
+        self.clicks += int(clicks.sum())
+        if self.last_ns is not None:
+            intervals = np.diff(actual_ns, prepend=self.last_ns)
+        else:
+            intervals = np.diff(actual_ns)
+        ends = actual_ns[len(actual_ns) - len(intervals):]
+        self.intervals.add(intervals)
+        self.active_ns += int(intervals.sum())
+        self.last_ns = int(actual_ns[-1])
+        self._keep_gaps(intervals, ends)
+        if latency_ns is not None:
+            self.latency.add(latency_ns)
+        if lateness_ns is not None:
+            self.early += int((lateness_ns < 0).sum())
+            self.lateness.add(lateness_ns)
+            if self._t0 is None:
+                self._t0 = int(actual_ns[0])
+            t = (actual_ns - self._t0) / NS_PER_HOUR
+            lateness_ms = lateness_ns / 1e6
+            fit = self._fit
+            fit[0] += len(t)
+            fit[1] += float(t.sum())
+            fit[2] += float(lateness_ms.sum())
+            fit[3] += float((t * t).sum())
+            fit[4] += float((t * lateness_ms).sum())
+
+    def _keep_gaps(self, intervals, ends):
+        """Keep the TOP_GAPS longest intervals seen so far."""
+        if not len(intervals):
+            return
+        top = intervals.argsort()[-TOP_GAPS:] if len(intervals) > TOP_GAPS else range(len(intervals))
+        for i in top:
+            entry = (int(intervals[i]), int(ends[i]), self.offset_ns)
+            if len(self.gaps) < TOP_GAPS:
+                heapq.heappush(self.gaps, entry)
+            elif entry > self.gaps[0]:
+                heapq.heapreplace(self.gaps, entry)
+
+    def drift_ms_per_hour(self):
+        """Slope of lateness over time, or None with too little data."""
+        n, st, sl, stt, stl = self._fit
+        denominator = n * stt - st * st
+        if n < 2 or denominator <= 0:
+            return None
+        return (n * stl - st * sl) / denominator
+
+    def report(self, gap_factor=GAP_FACTOR):
+        median = self.intervals.percentile(50)
+        stalls = sorted((gap for gap in self.gaps if median and gap[0] > gap_factor * median),
+                        key=lambda gap: gap[1])
+        out = {"name": self.name, "events": self.events, "clicks": self.clicks,
+               "rate_per_s": (self.intervals.count / (self.active_ns / NS_PER_SECOND)
+                              if self.active_ns else 0.0),
+               "interval_ms": self.intervals.summary(), "interval_histogram": self.intervals.decades(),
+               "stalls": [{"interval_ms": length / 1e6, "end": format_time(end, offset)}
+                          for length, end, offset in stalls]}
+        if self.lateness.count:
+            out["lateness_ms"] = self.lateness.summary()
+            out["early"] = self.early
+            out["drift_ms_per_hour"] = self.drift_ms_per_hour()
+        if self.latency.count:
+            out["backend_latency_ms"] = self.latency.summary()
+        return out
+
+
+def format_time(t_ns, offset_ns):
+    """Wall-clock time of an engine-clock time, or seconds into a recording."""
+    if offset_ns is None:
+        return f"{t_ns / NS_PER_SECOND:.3f} s"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime((t_ns + offset_ns) / NS_PER_SECOND))
+
+
+def expand_paths(paths):
+    """Files to read: each existing file, or every segment of a log path."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        segments = segment_paths(path)
+        if not segments:
+            raise FileNotFoundError(f"No such log or file: {path}")
+        files.extend(segments)
+    return files
+
+
+def _read_blocks(f, dtype, chunk, np):
+    """Structured arrays of up to chunk whole records from f."""
+    while True:
+        block = f.read(chunk * dtype.itemsize)
+        usable = len(block) - len(block) % dtype.itemsize
+        if usable:
+            yield np.frombuffer(block, dtype=dtype, count=usable // dtype.itemsize)
+        if len(block) < chunk * dtype.itemsize:
+            return
+
+
+def iter_chunks(path, chunk=CHUNK, np=None):
+    """Yield (kind, offset_ns, records) chunks of an audit segment or sequence file.
+
+    kind is "audit" or "sequence"; offset_ns maps engine-clock times to
+    wall-clock ones (None for sequences); records is a structured array
+    with the audit FIELDS or the sequence's t_ns, x, y and button.
+    """
+    if np is None:
+        import numpy as np
+    audit_dtype = np.dtype([(name, np.dtype(code).newbyteorder("<")) for name, code in
+                            zip(FIELDS, ("i8", "i8", "i8", "i4", "i4", "u2", "u2"))])
+    with open(path, "rb") as f:
+        if f.read(len(SEQUENCE_MAGIC)) == SEQUENCE_MAGIC:
+            f.seek(0)
+            _, version, header_size, record_size, count = SEQUENCE_HEADER.unpack(f.read(SEQUENCE_HEADER.size))
+            if version != SEQUENCE_VERSION:
+                raise SequenceFormatError(f"{path}: unsupported sequence version {version}")
+            dtype = np.dtype({"names": ["t_ns", "x", "y", "button"], "formats": ["<i8", "<i4", "<i4", "u1"],
+                              "offsets": [0, 8, 12, 16], "itemsize": record_size})
+            f.seek(header_size)
+            for records in _read_blocks(f, dtype, chunk, np):
+                yield "sequence", None, records
+            return
+        f.seek(0)
+        fmt, header = read_header(f)
+        offset_ns = header["wall_ns"] - header["clock_ns"]
+        if fmt == "binary":
+            for records in _read_blocks(f, audit_dtype, chunk, np):
+                yield "audit", offset_ns, records
+            return
+    # JSON lines are parsed record by record, then converted a chunk at a time
+    rows = []
+    for row in read_audit(path):
+        rows.append(row)
+        if len(rows) == chunk:
+            yield "audit", offset_ns, np.array(rows, dtype=audit_dtype)
+            rows = []
+    if rows:
+        yield "audit", offset_ns, np.array(rows, dtype=audit_dtype)
+
+
+class SessionAnalyzer:
+    """Accumulates per-clicker statistics from audit segments and sequence files.
+
+    since_ns keeps only audit records from that wall-clock time on.
+    """
+
+    def __init__(self, chunk=CHUNK, since_ns=None, gap_factor=GAP_FACTOR):
+        import numpy as np
+        self._np = np
+        self.chunk = chunk
+        self.since_ns = since_ns
+        self.gap_factor = gap_factor
+        self.clickers = {}  # (kind, id) -> ClickerStats
+        self.files = 0
+        self.records = 0
+        self.sessions = 0
+        self._offset_ns = None
+
+    def _stats(self, key, name):
+        stats = self.clickers.get(key)
+        if stats is None:
+            stats = self.clickers[key] = ClickerStats(self._np, name)
+        return stats
+
+    def add_file(self, path):
+        """Stream one audit segment or sequence file into the statistics."""
+        np = self._np
+        self.files += 1
+        first = True
+        for kind, offset_ns, records in iter_chunks(path, self.chunk, np):
+            self.records += len(records)
+            if first:
+                first = False
+                self._start_file(kind, offset_ns)
+            if kind == "sequence":
+                clicks = records[records["button"] != MOVE]
+                for button in np.unique(clicks["button"]):
+                    mine = clicks[clicks["button"] == button]
+                    stats = self._stats(("sequence", int(button)), f"{BUTTON_NAMES.get(int(button), button)} clicks")
+                    stats.add(mine["t_ns"], np.ones(len(mine), dtype=np.int64))
+                continue
+            if self.since_ns is not None:
+                records = records[records["actual_ns"] >= self.since_ns - offset_ns]
+            for clicker in np.unique(records["clicker"]):
+                mine = records[records["clicker"] == clicker]
+                stats = self._stats(("audit", int(clicker)), f"clicker {int(clicker)}")
+                stats.offset_ns = offset_ns
+                stats.add(mine["actual_ns"], mine["clicks"], mine["actual_ns"] - mine["scheduled_ns"],
+                          mine["latency_ns"])
+
+    def _start_file(self, kind, offset_ns):
+        """Break interval chains between runs and between recordings."""
+        if kind == "audit" and self._offset_ns is not None and abs(offset_ns - self._offset_ns) <= SESSION_BREAK_NS:
+            return
+        self.sessions += 1
+        self._offset_ns = offset_ns
+        for (stats_kind, _), stats in self.clickers.items():
+            if stats_kind == kind:
+                stats.last_ns = None
+
+    def report(self):
+        """The summary as a dict."""
+        return {"files": self.files, "records": self.records, "sessions": self.sessions,
+                "clickers": [self.clickers[key].report(self.gap_factor) for key in sorted(self.clickers)]}
+
+
+def format_report(report):
+    """Human-readable lines for a report dict."""
+    lines = [f"{report['records']} records from {report['files']} file(s), {report['sessions']} session(s)"]
+    for c in report["clickers"]:
+        lines.append("")
+        lines.append(f"{c['name']}: {c['clicks']} clicks in {c['events']} fires, {c['rate_per_s']:.2f}/s")
+        for label, key in (("lateness", "lateness_ms"), ("backend", "backend_latency_ms"),
+                           ("interval", "interval_ms")):
+            if key in c:
+                s = c[key]
+                cells = "  ".join(f"p{q:g} {s[f'p{q:g}']:.3f}" for q in PERCENTILES)
+                lines.append(f"  {label:9}{cells}  max {s['max']:.3f} ms")
+        if c.get("drift_ms_per_hour") is not None:
+            lines.append(f"  drift    {c['drift_ms_per_hour']:+.3f} ms/hour, {c['early']} early")
+        if c["interval_histogram"]:
+            lines.append("  intervals " + ", ".join(f"{k}: {v}" for k, v in c["interval_histogram"].items()))
+        for stall in c["stalls"]:
+            lines.append(f"  stall    {stall['interval_ms']:.1f} ms ending {stall['end']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Summarise click audit logs and recorded sequences")
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="audit log, audit segment or .clkseq file")
+    parser.add_argument("--since", type=float, metavar="HOURS", help="only audit records from the last HOURS")
+    parser.add_argument("--gap-factor", type=float, default=GAP_FACTOR,
+                        help=f"report intervals this many times the median as stalls (default {GAP_FACTOR:g})")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="records read at a time")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    since_ns = None if args.since is None else time.time_ns() - int(args.since * NS_PER_HOUR)
+    try:
+        analyzer = SessionAnalyzer(args.chunk, since_ns, args.gap_factor)
+        for path in expand_paths(args.paths):
+            analyzer.add_file(path)
+    except ImportError:
+        print("Error: the session analyzer needs NumPy (pip install numpy)", file=sys.stderr)
+        return 2
+    except (OSError, AuditFormatError, SequenceFormatError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    report = analyzer.report()
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the click audit log.
+Writes logs to a temporary directory from clickers on a VirtualClock and
+the fake backend; no mouse or display is required.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from audit_log import (NO_POSITION, RECORD, AuditFormatError, AuditLog, build_audit_log, read_audit,
+                       segment_paths)
+from autoclicker import run_headless
+from bursts import parse_burst
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED
+from scheduler import NS_PER_SECOND, VirtualClock
+from virtual_engine import virtual_engine
+
+MS = 1_000_000
+
+
+def records(path):
+    """Every record of every segment of the log at path."""
+    return [record for segment in segment_paths(path) for record in read_audit(segment)]
+
+
+def wait_written(log, count):
+    """Wait for the writer thread to write count records."""
+    deadline = time.monotonic() + 2
+    while log.records < count and time.monotonic() < deadline:
+        time.sleep(0.002)
+
+
+def test_engine_audit():
+    """Test that every fire is logged with its schedule, position and burst size."""
+    print("Testing engine audit trail...")
+    for format in ("binary", "jsonl"):
+        path = os.path.join(tempfile.mkdtemp(), "clicks.clkaud")
+        engine, backend, clock = virtual_engine()
+        engine.add_clicker("Fixed", 1, x=5, y=6, mode=MODE_FIXED)
+        engine.add_clicker("Double", 2, x=7, y=8, mode=MODE_FIXED)
+        engine.set_burst(1, parse_burst({"count": 2, "spacing": "10ms"}))
+        audit = AuditLog(path, format=format, clock=clock)
+        engine.set_audit(audit)
+        engine.start(0)
+        engine.start(1)
+        engine.scheduler.run_until(4 * NS_PER_SECOND + 50 * MS)
+        audit.close()
+        logged = records(path)
+        assert sorted((r[0], r[1], r[3], r[4], r[5], r[6]) for r in logged) == [
+            (1 * NS_PER_SECOND, 1 * NS_PER_SECOND, 5, 6, 0, 1),
+            (2 * NS_PER_SECOND, 2 * NS_PER_SECOND, 5, 6, 0, 1),
+            (2 * NS_PER_SECOND, 2 * NS_PER_SECOND, 7, 8, 1, 1),
+            (2 * NS_PER_SECOND + 10 * MS, 2 * NS_PER_SECOND + 10 * MS, 7, 8, 1, 1),
+            (3 * NS_PER_SECOND, 3 * NS_PER_SECOND, 5, 6, 0, 1),
+            (4 * NS_PER_SECOND, 4 * NS_PER_SECOND, 5, 6, 0, 1),
+            (4 * NS_PER_SECOND, 4 * NS_PER_SECOND, 7, 8, 1, 1),
+            (4 * NS_PER_SECOND + 10 * MS, 4 * NS_PER_SECOND + 10 * MS, 7, 8, 1, 1)], logged
+        assert all(r[2] >= 0 for r in logged) and len(backend.clicks()) == 8
+        print(f"✓ {format}: 8 clicks logged, burst clicks on their own offsets")
+
+    audit = AuditLog(os.path.join(tempfile.mkdtemp(), "track.clkaud"), format="jsonl")
+    audit.record(3, 10, 12, None, None, 500)
+    audit.close()
+    with open(audit.segment) as f:
+        header, line = f.read().splitlines()
+    assert json.loads(header)["format"] == "clkaud"
+    assert json.loads(line) == {"clicker": 3, "scheduled_ns": 10, "actual_ns": 12, "x": None, "y": None,
+                                "latency_ns": 500, "clicks": 1}
+    assert list(read_audit(audit.segment)) == [(10, 12, 500, NO_POSITION, NO_POSITION, 3, 1)]
+    print("✓ Clicks at the pointer position logged without coordinates")
+
+
+def test_rotation():
+    """Test size and age rotation, retention and that segments are never reused."""
+    print("\nTesting rotation...")
+    path = os.path.join(tempfile.mkdtemp(), "rotate.clkaud")
+    log = AuditLog(path, max_bytes=100 * RECORD.size, flush_interval=60, batch=30)
+    for i in range(300):
+        log.record(0, i, i, 1, 1, 0)
+        if i % 30 == 29:
+            wait_written(log, i + 1)  # the writer takes each batch of 30
+    log.close()
+    sizes = [os.path.getsize(segment) for segment in segment_paths(path)]
+    assert len(sizes) == 4 and max(sizes) <= 100 * RECORD.size, sizes
+    assert [r[0] for r in records(path)] == list(range(300))
+
+    clock = VirtualClock()
+    aged = AuditLog(path, max_age=60, keep=2, flush_interval=0.01, clock=clock)
+    for minute in range(3):
+        aged.record(0, minute, minute, 1, 1, 0)
+        wait_written(aged, minute + 1)
+        clock.advance(61)
+    aged.close()
+    names = [os.path.basename(segment) for segment in segment_paths(path)]
+    assert names == ["rotate.000006.clkaud", "rotate.000007.clkaud"], names
+    assert aged.segments == 3 and [r[0] for r in records(path)] == [1, 2]
+    print(f"✓ 300 records in {len(sizes)} size-limited segments; age rotation keeps the newest 2")
+
+
+def test_torn_and_invalid():
+    """Test that a torn last record is skipped and bad settings are rejected."""
+    print("\nTesting torn segments and settings...")
+    path = os.path.join(tempfile.mkdtemp(), "torn.clkaud")
+    with AuditLog(path, fsync="batch") as log:
+        for i in range(5):
+            log.record(1, i, i, 2, 2, 0)
+    with open(log.segment, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    assert len(list(read_audit(log.segment))) == 5
+    with open(os.path.join(os.path.dirname(path), "junk.clkaud"), "wb") as f:
+        f.write(b"hello\n")
+    try:
+        list(read_audit(f.name))
+    except AuditFormatError:
+        pass
+    else:
+        raise AssertionError("junk file should have been rejected")
+    for spec, error in (({"path": path, "format": "xml"}, "Unknown audit format"),
+                        ({"path": path, "fsync": "always"}, "Unknown fsync policy"),
+                        ({"path": path, "max_bytes": 0}, "must be greater than 0"),
+                        ({"path": path, "rotate": 1}, "Unknown audit setting"),
+                        ({}, "needs a path")):
+        try:
+            build_audit_log(spec)
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{spec} should have been rejected")
+    print("✓ Torn record ignored; bad files and settings rejected")
+
+
+def test_click_path_cost():
+    """Test that recording a click only queues it."""
+    print("\nTesting click path cost...")
+    path = os.path.join(tempfile.mkdtemp(), "cost.clkaud")
+    count = 200_000
+    with AuditLog(path) as log:
+        start = time.perf_counter_ns()
+        for i in range(count):
+            log.record(0, i, i, 10, 20, 1000)
+        per_click = (time.perf_counter_ns() - start) / count
+    assert log.records == count and log.writes <= count // 100, log.stats()
+    assert per_click < 20_000, per_click
+    print(f"✓ {per_click:.0f} ns per click queued; {count} records in {log.writes} writes")
+
+
+def test_headless_audit():
+    """Test the headless "audit" config key."""
+    print("\nTesting headless audit log...")
+    path = os.path.join(tempfile.mkdtemp(), "headless.clkaud")
+    config = {"clickers": [{"interval": "250ms", "x": 1, "y": 2}], "duration": 10, "quiet": True,
+              "audit": {"path": path, "format": "jsonl", "fsync": "never"}}
+    clock = VirtualClock()
+    summary = run_headless(config, backend=FakeBackend(clock), clock=clock)
+    assert summary["audit"]["records"] == summary["clickers"][0]["fires"] == len(records(path)) == 41
+    print(f"✓ {summary['audit']['records']} headless clicks logged")
+
+
+def main():
+    """Run all tests."""
+    print("=== Audit Log Test Suite ===")
+    try:
+        test_engine_audit()
+        test_rotation()
+        test_torn_and_invalid()
+        test_click_path_cost()
+        test_headless_audit()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,22 +4,10 @@ Test script for the autoclicker application.
 This script tests the core functionality without requiring actual mouse clicks.
 """
 
-import time
-import threading
-from unittest.mock import patch, MagicMock
+from scheduler import NS_PER_SECOND
+from virtual_engine import virtual_engine
 
-# Mock pyautogui to avoid actual mouse clicks during testing
-with patch('pyautogui.position') as mock_position, \
-     patch('pyautogui.click') as mock_click, \
-     patch('pyautogui.FAILSAFE', True), \
-     patch('pyautogui.PAUSE', 0.01):
-    
-    # Set up mock return values
-    mock_position.return_value = (100, 200)
-    mock_click.return_value = None
-    
-    # Import the autoclicker module
-    import autoclicker
+import autoclicker
 
 def test_input_validation():
     """Test input validation functions."""
@@ -40,74 +28,46 @@ def test_input_validation():
     print("Input validation tests passed!")
 
 def test_clicker_logic():
-    """Test the clicker thread logic."""
+    """Test that a 1 second clicker clicks at the mouse position every second."""
     print("\nTesting clicker logic...")
     
-    # Mock the global variables
-    autoclicker.start_time = time.time()
-    autoclicker.mouse_x, autoclicker.mouse_y = 100, 200
-    
-    # Test clicker thread with mock
-    active_flag = [True]
-    interval = 1  # 1 second interval for testing
-    
-    def test_click_thread():
-        """Test version of click_thread that runs for a short time."""
-        start_test = time.time()
-        click_count = 0
-        last_click_time = 0
-        
-        while time.time() - start_test < 2.5:  # Run for 2.5 seconds
-            if active_flag[0] and autoclicker.start_time is not None:
-                current_time = time.time()
-                elapsed = current_time - autoclicker.start_time
-                # Only click if enough time has passed since last click
-                if elapsed % interval < 0.1 and elapsed - last_click_time >= 0.9:
-                    click_count += 1
-                    last_click_time = elapsed
-                    print(f"  Click #{click_count} at {elapsed:.1f}s")
-            time.sleep(0.01)
-        
-        return click_count
+    engine, backend, clock = virtual_engine(position=(100, 200))
+    engine.add_clicker("Primary", 1)
+    engine.start(0)
+    engine.scheduler.run_until(int(2.5 * NS_PER_SECOND))
     
-    # Run the test
-    click_count = test_click_thread()
-    
-    # Should have clicked approximately 2-3 times in 2.5 seconds
-    assert 2 <= click_count <= 3, f"Expected 2-3 clicks, got {click_count}"
-    print(f"✓ Clicker logic test passed! ({click_count} clicks in 2.5s)")
+    clicks = backend.clicks()
+    for number, (t_ns, x, y, button) in enumerate(clicks, 1):
+        print(f"  Click #{number} at {t_ns / NS_PER_SECOND:.1f}s")
+    assert clicks == [(NS_PER_SECOND, 100, 200, "left"), (2 * NS_PER_SECOND, 100, 200, "left")], clicks
+    print(f"✓ Clicker logic test passed! ({len(clicks)} clicks in 2.5s)")
 
 def test_synchronization():
     """Test synchronization between clickers."""
     print("\nTesting synchronization...")
     
-    # Test that both clickers would start from the same timestamp
-    start_time = time.time()
-    
-    # Simulate two clickers with different intervals
-    primary_interval = 2  # 2 seconds
-    secondary_interval = 6  # 6 seconds
-    
-    # Check that they would sync at multiples of 6 seconds
-    test_times = [0, 2, 4, 6, 8, 10, 12]
-    
-    for test_time in test_times:
-        primary_should_click = (test_time % primary_interval) < 0.1
-        secondary_should_click = (test_time % secondary_interval) < 0.1
-        
-        if primary_should_click and secondary_should_click:
+    # Two clickers share the start time, so they coincide at multiples of 6 seconds
+    engine, backend, clock = virtual_engine(position=(100, 200))
+    engine.add_clicker("Primary", 2)
+    engine.add_clicker("Secondary", 6)
+    engine.start(0)
+    engine.start(1)
+    engine.scheduler.run_until(12 * NS_PER_SECOND)
+    
+    times = [t_ns // NS_PER_SECOND for t_ns, _, _, _ in backend.clicks()]
+    assert times == [2, 4, 6, 6, 8, 10, 12, 12], f"Unexpected click times {times}"
+    for test_time in sorted(set(times)):
+        if times.count(test_time) == 2:
             print(f"  ✓ Both clickers sync at {test_time}s")
-        elif primary_should_click:
+        else:
             print(f"  ✓ Primary only at {test_time}s")
-        elif secondary_should_click:
-            print(f"  ✓ Secondary only at {test_time}s")
     
     print("Synchronization test passed!")
 
 def main():
     """Run all tests."""
     print("=== Autoclicker Test Suite ===")
-    print("Note: This test uses mocked mouse functions to avoid actual clicks.")
+    print("Note: This test uses a fake backend and virtual clock, so nothing is clicked.")
     print()
     
     try:
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for click bursts and batched backend calls.
+Runs on a VirtualClock against the fake backend; no mouse or display is
+required.
+"""
+
+from bench_timing import TimingBackend, bench_burst
+from bursts import Burst, expand_bursts, parse_burst
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED
+from playback import SequencePlayer
+from scheduler import NS_PER_SECOND, VirtualClock
+from virtual_engine import virtual_engine
+
+MS = 1_000_000
+
+
+def test_parse_and_groups():
+    """Test burst specs and how their clicks are grouped per millisecond."""
+    print("Testing burst specs...")
+    assert parse_burst("double").groups == [(0, 2)]
+    assert parse_burst("triple").groups == [(0, 3)]
+    assert parse_burst({"count": 4, "spacing": 0.0004}).groups == [(0, 3), (1_200_000, 1)]
+    assert parse_burst("3x20ms").groups == [(0, 1), (20 * MS, 1), (40 * MS, 1)]
+    assert parse_burst("3x20").groups == parse_burst("3x20ms").groups  # bare spacing is in ms
+    assert parse_burst("2x0.5s").groups == [(0, 1), (500 * MS, 1)]
+    assert parse_burst("5x0").groups == parse_burst({"count": 5, "spacing": "0"}).groups == [(0, 5)]
+    burst = parse_burst({"count": 2, "button": "right", "spacing": "5ms"})
+    assert (burst.count, burst.button, burst.groups) == (2, "right", [(0, 1), (5 * MS, 1)])
+    assert burst.describe() == "2x right, 5 ms apart"
+    for spec, error in (("0", "at least one click"), ("often", "Invalid burst"), ("3x-1", "Invalid burst"),
+                        ({"button": "thumb"}, "Unknown button")):
+        try:
+            parse_burst(spec)
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{spec!r} should have been rejected")
+    print("✓ Named, counted and spaced bursts parsed; clicks within 1 ms share a group")
+
+
+def test_engine_bursts():
+    """Test that each fire sends its burst on time, one backend call per group."""
+    print("\nTesting clicker bursts...")
+    engine, backend, clock = virtual_engine()
+    engine.add_clicker("Triple", 1, x=5, y=5, mode=MODE_FIXED)
+    engine.add_clicker("Spaced", 2, x=9, y=9, mode=MODE_FIXED)
+    engine.set_burst(0, parse_burst("triple"))
+    engine.set_burst(1, Burst(3, "right", spacing=0.05))
+    engine.start(0)
+    engine.start(1)
+    engine.scheduler.run_until(2 * NS_PER_SECOND + 200 * MS)
+    clicks = sorted((t // MS, x, button) for t, x, _, button in backend.clicks())
+    assert clicks == [(1000, 5, "left")] * 3 + [(2000, 5, "left")] * 3 + [(2000, 9, "right"),
+                                                                          (2050, 9, "right"),
+                                                                          (2100, 9, "right")], clicks
+    assert backend.flushes == 5
+    assert [engine.table.fires[i] for i in range(2)] == [2, 1]
+
+    engine.scheduler.run_until(4 * NS_PER_SECOND + 10 * MS)
+    engine.stop(1)  # mid-burst: the rest is cancelled
+    engine.scheduler.run_until(5 * NS_PER_SECOND)
+    assert [c for c in backend.clicks() if c[1] == 9][3:] == [(4 * NS_PER_SECOND, 9, 9, "right")]
+    print("✓ Triple click in one call; spaced burst on its offsets; stop cancels the rest")
+
+    engine, backend, clock = virtual_engine()
+    engine.add_clicker("Overlapping", 0.2, x=1, y=1, mode=MODE_FIXED)
+    engine.set_burst(0, parse_burst("5x100ms"))  # each burst outlasts two periods
+    engine.start(0)
+    engine.scheduler.run_until(2 * NS_PER_SECOND + 450 * MS)
+    times = sorted(t // MS for t, *_ in backend.clicks())
+    expected = sorted(t for t in (fire * 200 + k * 100 for fire in range(1, 13) for k in range(5)) if t <= 2450)
+    assert engine.table.fires[0] == 12 and times == expected, times
+    engine.stop(0)  # the bursts of the last two fires are still in flight
+    engine.scheduler.run_until(4 * NS_PER_SECOND)
+    assert len(backend.clicks()) == len(expected) and not engine.scheduler.jobs(), backend.clicks()[-3:]
+    print(f"✓ Overlapping 5-click bursts sent all {len(expected)} clicks; stop cancels every one in flight")
+
+
+def test_playback_batches():
+    """Test that playback coalesces steps due together and expands step bursts."""
+    print("\nTesting playback batches...")
+    sequence = [(0, 1, 1, 1), (300_000, 2, 2, 1), (900_000, 3, 3, 0), (5 * MS, 4, 4, 3)]
+    clock = VirtualClock()
+    backend = FakeBackend(clock)
+    batches = []
+
+    def click_batch(events):
+        batches.append(len(events))
+        backend.click_batch([(x, y, "move" if button == 0 else "left") for x, y, button in events])
+
+    player = SequencePlayer(sequence, None, clock=clock, click_batch=click_batch)
+    report = player.run()[0]
+    assert batches == [3, 1] and report.clicks == 4
+    assert [t for t, *_ in backend.events] == [0, 0, 0, 5 * MS]
+
+    events = list(expand_bursts([(offset, x, y, b) for offset, x, y, b in sequence], Burst(2, spacing=0.002)))
+    assert events == [(0, 1, 1, 1), (300_000, 2, 2, 1), (900_000, 3, 3, 0), (2 * MS, 1, 1, 1),
+                      (2_300_000, 2, 2, 1), (5 * MS, 4, 4, 3), (7 * MS, 4, 4, 3)], events
+    batches.clear()
+    SequencePlayer(sequence, None, clock=VirtualClock(), click_batch=click_batch,
+                   burst=parse_burst("double")).run()
+    assert batches == [5, 2], batches
+    print("✓ Steps within 1 ms sent together; bursts merged into the step order")
+
+
+def test_batch_throughput():
+    """Test events per second with and without batching (one flush per batch)."""
+    print("\nTesting batch throughput...")
+    for backend in (TimingBackend(), FakeBackend()):
+        result = bench_burst(backend, 30_000, 10)
+        if isinstance(backend, FakeBackend):
+            assert backend.flushes == 30_000 + 3_000 and len(backend.clicks()) == 60_000
+        print(f"✓ {result['backend']}: {result['single_per_s']:.0f} events/s one call each, "
+              f"{result['batched_per_s']:.0f} events/s batched")
+
+
+def main():
+    """Run all tests."""
+    print("=== Burst Test Suite ===")
+    try:
+        test_parse_and_groups()
+        test_engine_bursts()
+        test_playback_batches()
+        test_batch_throughput()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for click backends.
+Stands in for XTest and pyautogui, so no display is required. The
+pyautogui grab test is skipped when Pillow is not installed.
+"""
+
+from types import SimpleNamespace
+
+import click_backends
+from click_backends import FailSafeError, FakeBackend, PyAutoGUIBackend, create_backend
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class StubBackend(click_backends.ClickBackend):
+    """Records its options; fails like a missing display when built with fail=True."""
+
+    def __init__(self, fail=False, **options):
+        if fail:
+            raise RuntimeError("no display")
+        self.options = options
+
+
+def test_create_backend():
+    """Test backend selection by name and the auto fallback to pyautogui."""
+    print("Testing backend selection...")
+    assert isinstance(create_backend("fake"), FakeBackend)
+    try:
+        create_backend("nope")
+    except ValueError as e:
+        assert "xtest, pyautogui, fake" in str(e), e
+    else:
+        raise AssertionError("unknown backend should be rejected")
+
+    saved = click_backends.XTestBackend, click_backends.PyAutoGUIBackend
+    try:
+        click_backends.XTestBackend = type("XTest", (StubBackend,), {})
+        click_backends.PyAutoGUIBackend = type("PyAutoGUI", (StubBackend,), {})
+        backend = create_backend(failsafe=True)
+        assert type(backend).__name__ == "XTest" and backend.options == {"failsafe": True}
+        print("✓ auto picks XTest when it is available")
+
+        click_backends.XTestBackend = lambda **options: StubBackend(fail=True)
+        backend = create_backend(failsafe=True)
+        assert type(backend).__name__ == "PyAutoGUI" and backend.options == {"failsafe": True}
+        print("✓ auto falls back to pyautogui with the same options")
+    finally:
+        click_backends.XTestBackend, click_backends.PyAutoGUIBackend = saved
+
+
+def test_click_batch_order():
+    """Test that a batch keeps its order and position updates, as one flush."""
+    print("\nTesting click batches...")
+    backend = FakeBackend(clock=lambda: 7, position=(5, 5))
+    backend.click_batch([(10, 20, "left"), (None, None, "right"), (30, 40, "move"), (None, None, "middle")])
+    assert backend.events == [(7, "click", 10, 20, "left"), (7, "click", 10, 20, "right"),
+                              (7, "move", 30, 40, None), (7, "click", 30, 40, "middle")], backend.events
+    assert backend.flushes == 1
+
+    # The base class sends the same batch one event at a time
+    calls = []
+    base = SimpleNamespace(click=lambda x, y, button: calls.append(("click", x, y, button)),
+                           move=lambda x, y: calls.append(("move", x, y)))
+    click_backends.ClickBackend.click_batch(base, [(1, 2, "left"), (3, 4, "move"), (None, None, "right")])
+    assert calls == [("click", 1, 2, "left"), ("move", 3, 4), ("click", None, None, "right")], calls
+    print("✓ Batches keep their order")
+
+
+def test_fake_failsafe():
+    """Test that the fake backend refuses to click in the top-left corner when failsafe is on."""
+    print("\nTesting fake failsafe...")
+    backend = FakeBackend(clock=lambda: 0, failsafe=True)
+    for send in (lambda: backend.click(), lambda: backend.click_batch([(None, None, "left")])):
+        try:
+            send()
+        except FailSafeError:
+            pass
+        else:
+            raise AssertionError("failsafe should have stopped the click")
+    backend.move(5, 5)
+    backend.click()
+    backend.click_batch([(None, None, "left")])
+    assert len(backend.clicks()) == 2
+    FakeBackend(clock=lambda: 0).click()  # off by default
+    print("✓ Failsafe honoured")
+
+
+def test_pyautogui_grab():
+    """Test that pyautogui grabs are returned in the BGRX layout of XTest grabs."""
+    print("\nTesting pyautogui grab...")
+    if Image is None:
+        print("✗ Pillow not available; skipping")
+        return
+    regions = []
+
+    def screenshot(region):
+        regions.append(region)
+        image = Image.new("RGB", region[2:])
+        image.putpixel((0, 0), (10, 20, 30))
+        image.putpixel((1, 1), (200, 100, 50))
+        return image
+
+    backend = PyAutoGUIBackend.__new__(PyAutoGUIBackend)
+    backend._pyautogui = SimpleNamespace(screenshot=screenshot)
+    width, height, data = backend.grab(4, 6, 2, 2)
+    assert regions == [(4, 6, 2, 2)] and (width, height) == (2, 2)
+    assert len(data) == 2 * 2 * 4
+    assert data[0:3] == bytes((30, 20, 10)) and data[12:15] == bytes((50, 100, 200)), data
+    print("✓ Grab returned as BGRX")
+
+
+def main():
+    """Run all tests."""
+    print("=== Click Backend Test Suite ===")
+    try:
+        test_create_backend()
+        test_click_batch_order()
+        test_fake_failsafe()
+        test_pyautogui_grab()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
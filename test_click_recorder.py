@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the click recorder.
+Records synthetic events; no mouse or display is required.
+"""
+
+import threading
+import tracemalloc
+
+from click_recorder import ClickRecorder, button_code
+
+
+def test_small_recording_stays_in_memory():
+    """Test that a short recording iterates in order without spilling."""
+    print("Testing small recording...")
+    recorder = ClickRecorder(chunk_size=100)
+    for i in range(10):
+        recorder.record(i, -i, button_code("right"), t_ns=1000 + i)
+    events = list(recorder)
+    assert len(recorder) == 10 and recorder.spilled == 0
+    assert events[3] == (1003, 3, -3, 3), f"Unexpected event {events[3]}"
+    recorder.close()
+    print("✓ 10 events recorded in memory")
+
+
+def test_spill_keeps_memory_flat():
+    """Test that long recordings spill to disk and read back in order."""
+    print("\nTesting spill to disk...")
+    recorder = ClickRecorder(chunk_size=1000)
+    tracemalloc.start()
+    for i in range(200_000):
+        recorder.record(i % 1920, i % 1080, 1, t_ns=i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    recorder.finish()
+
+    assert len(recorder) == 200_000 and recorder.spilled == 200_000
+    assert peak < 1_000_000, f"Recording used {peak} bytes"
+    count = 0
+    for expected, (t_ns, x, y, button) in enumerate(recorder):
+        assert t_ns == expected and x == expected % 1920, f"Event {expected} out of order"
+        count += 1
+    assert count == 200_000
+    recorder.close()
+    print(f"✓ 200000 events spilled, peak {peak / 1024:.0f} KiB while recording")
+
+
+def test_producer_thread():
+    """Test recording from a listener-like thread while the UI polls the count."""
+    print("\nTesting producer thread...")
+    recorder = ClickRecorder(chunk_size=256)
+    counts = []
+
+    def producer():
+        for i in range(5000):
+            recorder.record(i, i, 1)
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    while thread.is_alive():
+        counts.append(len(recorder))
+    thread.join()
+    times = [t for t, _, _, _ in recorder]
+    assert len(times) == 5000 and times == sorted(times), "Timestamps not monotonic"
+    assert counts == sorted(counts), "Count went backwards"
+    recorder.close()
+    print("✓ 5000 events from a producer thread, timestamps monotonic")
+
+
+def main():
+    """Run all tests."""
+    print("=== Click Recorder Test Suite ===")
+    try:
+        test_small_recording_stays_in_memory()
+        test_spill_keeps_memory_flat()
+        test_producer_thread()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
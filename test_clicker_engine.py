@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the clicker engine.
+Uses an in-test recording backend so no mouse or display is required.
+"""
+
+import threading
+import time
+
+from clicker_engine import FLAG_FOLLOW, MODE_FIXED, ClickerEngine
+from scheduler import seconds_to_ns
+
+
+class RecordingBackend:
+    """Minimal backend that records clicks instead of performing them."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.clicks = []
+        self._lock = threading.Lock()
+
+    def position(self):
+        return 7, 8
+
+    def click(self, x=None, y=None, button="left"):
+        with self._lock:
+            self.clicks.append((x, y))
+
+    def close(self):
+        pass
+
+
+def test_many_clickers_one_thread():
+    """Test that hundreds of clickers share a single scheduler thread."""
+    print("Testing many clickers...")
+    backend = RecordingBackend()
+    engine = ClickerEngine(lambda: backend)
+    threads_before = threading.active_count()
+    for i in range(300):
+        engine.add_clicker(f"clicker{i}", 0.05, offset=i * 0.0001, x=i, y=i, mode=MODE_FIXED)
+    for i in range(300):
+        engine.start(i)
+    time.sleep(0.28)
+    engine.shutdown()
+
+    assert threading.active_count() <= threads_before, "Clickers started extra threads"
+    fires = [engine.table.fires[i] for i in range(300)]
+    assert min(fires) >= 4, f"Some clickers fell behind: min {min(fires)} fires"
+    assert (299, 299) in backend.clicks
+    print(f"✓ 300 clickers, {sum(fires)} clicks, max lateness "
+          f"{max(engine.table.max_lateness_ns) / 1e6:.2f} ms")
+
+
+def test_follow_and_reanchor():
+    """Test that delta clickers follow clicker 0's period and start time."""
+    print("\nTesting delta clickers...")
+    backend = RecordingBackend()
+    engine = ClickerEngine(lambda: backend)
+    engine.add_clicker("Primary", 0.05)
+    engine.add_clicker("Secondary", 1, offset=0.01, flags=FLAG_FOLLOW)
+    engine.start(1)
+    engine.start(0, reanchor=True)
+    assert engine.period_ns(1) == seconds_to_ns(0.05)
+    time.sleep(0.13)
+    jobs = {job.name: job for job in engine.scheduler.jobs()}
+    assert jobs[0].anchor_ns == jobs[1].anchor_ns == engine.start_ns, "Clickers not phase-locked"
+    assert engine.table.fires[1] >= 2, f"Secondary fired {engine.table.fires[1]} times"
+    assert backend.clicks[0] == (7, 8), "Tracking clicker ignored the mouse position"
+
+    engine.stop(0)
+    engine.stop(1)
+    assert not engine.any_active() and engine.start_ns is None
+    assert engine.scheduler.is_idle()
+    engine.shutdown()
+    print("✓ Delta clicker follows primary and stops cleanly")
+
+
+def test_row_snapshot():
+    """Test that a table row reports settings and counters."""
+    print("\nTesting row snapshot...")
+    engine = ClickerEngine(lambda: RecordingBackend())
+    index = engine.add_clicker("Fixed", 2, x=100, y=200, mode=MODE_FIXED)
+    engine.configure(index, interval=0.5, x=300)
+    row = engine.table.row(index)
+    assert row["interval"] == 0.5 and (row["x"], row["y"]) == (300, 200)
+    assert row["fires"] == 0 and not row["active"]
+    engine.shutdown()
+    print("✓ Row snapshot reflects configuration")
+
+
+def main():
+    """Run all tests."""
+    print("=== Clicker Engine Test Suite ===")
+    try:
+        test_many_clickers_one_thread()
+        test_follow_and_reanchor()
+        test_row_snapshot()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
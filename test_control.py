@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test script for the control socket.
+Runs a server on a temporary Unix socket against a fake backend; no mouse
+or display is required.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED, ClickerEngine
+from control import ControlClient, ControlError, ControlServer, Controller
+from scheduler import NS_PER_SECOND
+from sequence_file import write_sequence
+from triggers import Trigger
+from virtual_engine import virtual_engine
+
+
+def serve(engine):
+    """Start a control server for engine on a fresh socket path."""
+    path = os.path.join(tempfile.mkdtemp(), "control.sock")
+    controller = Controller(engine)
+    return ControlServer(controller, path), controller, path
+
+
+def test_commands():
+    """Test starting, reconfiguring and querying clickers."""
+    print("Testing commands...")
+    engine, backend, clock = virtual_engine()
+    engine.add_clicker("Primary", 1)
+    server, controller, path = serve(engine)
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        with ControlClient(path) as client:
+            assert client.call("ping") == "pong"
+            assert client.call("add", name="Fixed", interval="500ms", x=10, y=20) == 1
+            client.call("set", clicker="Primary", interval=2)
+            client.call("start", clicker=0)
+            client.call("start", clicker="Fixed")
+            engine.scheduler.run_until(4 * NS_PER_SECOND)
+            rows = client.call("state")["clickers"]
+            assert [r["fires"] for r in rows] == [2, 8], rows
+            assert rows[1]["mode"] == MODE_FIXED and (rows[1]["x"], rows[1]["y"]) == (10, 20)
+            client.call("stop_all")
+            assert not any(r["active"] for r in client.call("state")["clickers"])
+
+            for cmd, params, error in (("nope", {}, "Unknown command 'nope'"),
+                                       ("start", {"clicker": 7}, "No clicker 7"),
+                                       ("set", {"clicker": 0, "interval": "fast"}, "Invalid rate: 'fast'"),
+                                       ("play", {}, "No sequence loaded")):
+                try:
+                    client.call(cmd, **params)
+                except ControlError as e:
+                    assert str(e) == error, e
+                else:
+                    raise AssertionError(f"{cmd} should have failed")
+    finally:
+        server.close()
+        engine.shutdown()
+    assert not os.path.exists(path)
+    print("✓ Clickers added, retimed, started and stopped; errors reported")
+
+
+def test_load_and_play():
+    """Test loading a sequence file and playing it through the control socket."""
+    print("\nTesting load and play...")
+    backend = FakeBackend()
+    engine = ClickerEngine(lambda: backend)
+    server, controller, path = serve(engine)
+    sequence_path = os.path.join(os.path.dirname(path), "clicks.clkseq")
+    write_sequence(sequence_path, [(i * 1_000_000, i, i, 1) for i in range(20)])
+    try:
+        with ControlClient(path) as client:
+            assert client.call("load", path=sequence_path)["events"] == 20
+            client.call("play", speed=4, repeat=2)
+            deadline = time.monotonic() + 5
+            while client.call("state")["playing"] and time.monotonic() < deadline:
+                time.sleep(0.005)
+        assert [(x, y) for _, x, y, _ in backend.clicks()] == [(i, i) for i in range(20)] * 2
+    finally:
+        server.close()
+        controller.close()
+        engine.shutdown()
+    print("✓ 40 clicks played from a loaded sequence file")
+
+
+def test_concurrent_clients():
+    """Test round-trip time with many clients at once."""
+    print("\nTesting concurrent clients...")
+    engine = ClickerEngine(FakeBackend)
+    engine.add_clicker("Primary", 1)
+    server, controller, path = serve(engine)
+    clients, requests = 32, 200
+    times = []
+    errors = []
+
+    def worker():
+        try:
+            with ControlClient(path) as client:
+                for _ in range(requests):
+                    start = time.perf_counter_ns()
+                    client.call("state")
+                    times.append(time.perf_counter_ns() - start)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.close()
+        engine.shutdown()
+    assert not errors and len(times) == clients * requests, errors
+    times.sort()
+    p50, p99 = times[len(times) // 2] / 1e6, times[int(len(times) * 0.99)] / 1e6
+    # Round trips queue behind each other; a single client sees the bare latency
+    print(f"✓ {len(times)} requests from {clients} clients: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+    engine = ClickerEngine(FakeBackend)
+    server, controller, path = serve(engine)
+    try:
+        with ControlClient(path) as client:
+            times = []
+            for _ in range(500):
+                start = time.perf_counter_ns()
+                client.call("ping")
+                times.append(time.perf_counter_ns() - start)
+    finally:
+        server.close()
+        engine.shutdown()
+    times.sort()
+    p50 = times[len(times) // 2] / 1e6
+    assert p50 < 1.0, f"Round trip p50 {p50:.3f} ms"
+    print(f"✓ Single-client round trip p50 {p50:.3f} ms")
+
+
+class SlowBackend(FakeBackend):
+    """Fake backend whose clicks take 300 ms."""
+
+    def click(self, x=None, y=None, button="left"):
+        time.sleep(0.3)
+        FakeBackend.click(self, x, y, button)
+
+    def click_batch(self, events):
+        time.sleep(0.3)
+        FakeBackend.click_batch(self, events)
+
+
+class SlowTrigger(Trigger):
+    """Trigger whose every check takes 300 ms and matches."""
+
+    def check(self, width, height, data):
+        time.sleep(0.3)
+        return 0, 0
+
+
+def test_stop_never_blocks():
+    """Test that stopping playback or a trigger does not hold up other clients."""
+    print("\nTesting non-blocking stops...")
+    backend = SlowBackend()
+    engine = ClickerEngine(lambda: backend)
+    engine.add_clicker("Watcher", 1)
+    trigger = SlowTrigger((0, 0, 2, 2))
+    engine.attach_trigger(0, trigger)
+    server, controller, path = serve(engine)
+    sequence_path = os.path.join(os.path.dirname(path), "clicks.clkseq")
+    write_sequence(sequence_path, [(i * 1_000_000, i, i, 1) for i in range(20)])
+    try:
+        with ControlClient(path) as client, ControlClient(path) as other:
+            client.call("load", path=sequence_path)
+            client.call("play")
+            client.call("start", clicker="Watcher")
+            while not backend.events or trigger.polls == 0:
+                time.sleep(0.005)
+            times = []
+            for cmd, params in (("stop_playback", {}), ("stop", {"clicker": "Watcher"})):
+                start = time.perf_counter()
+                client.call(cmd, **params)
+                other.call("ping")
+                times.append((time.perf_counter() - start) * 1000)
+            assert max(times) < 100, times
+    finally:
+        server.close()
+        controller.close()
+        engine.shutdown()
+    time.sleep(0.4)  # let a click already in progress finish
+    clicks = len(backend.clicks())
+    time.sleep(0.4)
+    assert len(backend.clicks()) == clicks, "A stopped trigger or player kept clicking"
+    print(f"✓ stop_playback and stop answered in {times[0]:.1f} and {times[1]:.1f} ms mid-click")
+
+
+def test_socket_path_guard():
+    """Test that only a socket is replaced at the control path."""
+    print("\nTesting socket path guard...")
+    path = os.path.join(tempfile.mkdtemp(), "control.sock")
+    with open(path, "w") as f:
+        f.write("keep me")
+    try:
+        ControlServer(Controller(ClickerEngine(FakeBackend)), path)
+    except FileExistsError:
+        pass
+    else:
+        raise AssertionError("A regular file at the socket path was replaced")
+    with open(path) as f:
+        assert f.read() == "keep me"
+    os.unlink(path)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)  # left behind by a server that was killed
+    stale.close()
+    engine = ClickerEngine(FakeBackend)
+    server = ControlServer(Controller(engine), path)
+    server.close()
+    engine.shutdown()
+    assert not os.path.exists(path)
+    print("✓ Regular file left in place; a stale socket replaced")
+
+
+def main():
+    """Run all tests."""
+    print("=== Control Socket Test Suite ===")
+    try:
+        test_commands()
+        test_load_and_play()
+        test_concurrent_clients()
+        test_stop_never_blocks()
+        test_socket_path_guard()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
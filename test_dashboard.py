@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the live dashboard.
+Takes engine snapshots on a VirtualClock against the fake backend; no
+display is required.
+"""
+
+import threading
+import time
+
+from click_backends import FakeBackend
+from clicker_engine import FLAG_FOLLOW, MODE_FIXED, ClickerEngine
+from dashboard import DASHBOARD_HZ, Dashboard, format_countdown, format_playback
+from playback import SequencePlayer
+from scheduler import NS_PER_SECOND, VirtualClock
+from virtual_engine import virtual_engine
+
+FRAME_NS = NS_PER_SECOND // DASHBOARD_HZ
+
+
+def test_snapshot():
+    """Test that a snapshot holds every clicker's counters and next deadline."""
+    print("Testing engine snapshot...")
+    engine, _, _ = virtual_engine()
+    engine.add_clicker("Fast", 0.002, x=1, y=1, mode=MODE_FIXED)
+    engine.add_clicker("Slow", 60, x=2, y=2, mode=MODE_FIXED)
+    engine.add_clicker("Delta", 1, offset=0.5, flags=FLAG_FOLLOW)
+    engine.start(0)
+    engine.start(1)
+    engine.scheduler.run_until(NS_PER_SECOND + 1)
+    snapshot = engine.snapshot()
+    fast, slow, delta = snapshot["clickers"]
+    assert snapshot["time_ns"] == NS_PER_SECOND + 1
+    assert (fast["fires"], fast["active"], fast["next_fire_ns"]) == (500, True, 1_002_000_000), fast
+    assert (slow["fires"], slow["next_fire_ns"], slow["period_ns"]) == (0, 60 * NS_PER_SECOND, 60 * NS_PER_SECOND)
+    assert (delta["active"], delta["next_fire_ns"], delta["period_ns"]) == (False, None, 2_000_000)
+    print("✓ Counts, deadlines and followed periods captured together")
+
+
+def test_rates_and_rows():
+    """Test achieved rates and countdowns at 500 clicks/s and one a minute."""
+    print("\nTesting dashboard rows...")
+    engine, _, _ = virtual_engine()
+    engine.add_clicker("Fast", 0.002, mode=MODE_FIXED)
+    engine.add_clicker("Slow", 60, mode=MODE_FIXED)
+    engine.start(0)
+    engine.start(1)
+    dashboard = Dashboard()
+    frames = 0
+    for frame in range(1, 65 * DASHBOARD_HZ + 1):
+        engine.scheduler.run_until(frame * FRAME_NS)
+        rows = dashboard.update(engine.snapshot())
+        frames += 1
+        if frame == 30:
+            assert rows[0][:4] == ("Fast", "ON", "1500", "500.0/s"), rows[0]
+            assert rows[1][1:] == ("ON", "0", "0.0/s", "57.0 s", "-"), rows[1]
+        if frame == 605:
+            assert rows[1][2:5] == ("1", "1.0/s", "59.5 s"), rows[1]
+    assert rows[1][2:5] == ("1", "0.0/s", "55.0 s"), rows[1]
+    assert len(dashboard._history) == DASHBOARD_HZ + 1
+    engine.stop(0)
+    engine.scheduler.run_until((frame + 1) * FRAME_NS)
+    rows = dashboard.update(engine.snapshot())
+    assert rows[0][1] == "OFF" and rows[0][4] == "-"
+    assert [format_countdown(n) for n in (0, 35_000_000, 4_200_000_000)] == ["now", "35 ms", "4.2 s"]
+    print(f"✓ {frames} frames over 65 s; 500/s and 1/min clickers shown from the same snapshots")
+
+
+def test_playback_progress():
+    """Test that the player's progress can be polled while it plays."""
+    print("\nTesting playback progress...")
+    sequence = [(k * 10_000_000, k, k, 1) for k in range(50)]
+    player = SequencePlayer(sequence, lambda x, y, button: None, repeat=3, clock=VirtualClock())
+    assert format_playback(player.progress, 3) == ("Playing...", "Starting")
+    player.run()
+    assert player.progress == (3, 50, 490_000_000)
+    assert format_playback(player.progress, 3) == ("Playing... (3/3)", "Replay 3 of 3: 50 events, 0.5 s in")
+    print("✓ Replay, events played and position reported")
+
+
+def test_consistent_under_load():
+    """Test that snapshots taken while clickers fire never show half a fire."""
+    print("\nTesting snapshots under load...")
+    backend = FakeBackend()
+    engine = ClickerEngine(lambda: backend)
+    engine.add_clicker("Busy", 0.001, x=1, y=1, mode=MODE_FIXED)
+    seen = []
+    stop = threading.Event()
+
+    def poll():
+        while not stop.is_set():
+            row = engine.snapshot()["clickers"][0]
+            seen.append((row["fires"], row["last_fire_ns"]))
+            time.sleep(0)
+
+    poller = threading.Thread(target=poll)
+    try:
+        engine.start(0)
+        poller.start()
+        time.sleep(0.3)
+    finally:
+        stop.set()
+        poller.join()
+        engine.shutdown()
+    # Fire times follow the counts: a later count never carries an earlier time
+    assert all(f1 < f2 and t1 < t2 or f1 == f2 and t1 == t2 for (f1, t1), (f2, t2) in zip(seen, seen[1:])
+               if f1 and f2)
+    assert seen[-1][0] > 20, seen[-1]
+    print(f"✓ {len(seen)} snapshots consistent across {seen[-1][0]} fires")
+
+
+def main():
+    """Run all tests."""
+    print("=== Dashboard Test Suite ===")
+    try:
+        test_snapshot()
+        test_rates_and_rows()
+        test_playback_progress()
+        test_consistent_under_load()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
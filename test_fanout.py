@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-display fan-out.
+Runs worker processes on the fake backend, so no X display is required.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import fanout as fanout_module
+from click_backends import FakeBackend
+from clicker_engine import ClickerEngine
+from control import ControlError, Controller, run_request
+from fanout import DisplayWorker, FanOut
+from sequence_file import write_sequence
+
+
+def wait_for(condition, timeout=10):
+    """Poll condition() until it is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out")
+        time.sleep(0.02)
+
+
+def test_assign_and_status():
+    """Test that each display runs its own clickers and sequence."""
+    print("Testing assignment and status...")
+    sequence_path = os.path.join(tempfile.mkdtemp(), "clicks.clkseq")
+    write_sequence(sequence_path, [(i * 1_000_000, i, i, 1) for i in range(10)])
+    fanout = FanOut("fake")
+    try:
+        fanout.assign(":91", {"clickers": [{"interval": "10ms"}, {"interval": 0.02, "x": 5, "y": 5}]})
+        fanout.assign(":92", {"clickers": [{"name": "only", "interval": "20ms"}],
+                              "sequence": sequence_path, "play": {"repeat": 1000}})
+        time.sleep(0.3)
+        status = fanout.status()
+        one, two = status["displays"][":91"], status["displays"][":92"]
+        assert [c["name"] for c in one["clickers"]] == ["clicker1", "clicker2"]
+        assert all(c["fires"] > 5 for c in one["clickers"] + two["clickers"]), status
+        assert two["playing"] and not one["playing"]
+        assert status["totals"]["fires"] == sum(c["fires"] for d in (one, two) for c in d["clickers"])
+        assert one["pid"] != two["pid"] != os.getpid()
+        rss = [d["rss_kb"] for d in (one, two)]
+        print(f"✓ 2 displays, {status['totals']['fires']} clicks, worker RSS {rss} kB")
+    finally:
+        fanout.close()
+
+
+def test_restart():
+    """Test that a killed worker is restarted with its clickers."""
+    print("\nTesting restart...")
+    fanout = FanOut("fake")
+    try:
+        fanout.assign(":93", {"clickers": [{"interval": "10ms"}]})
+        worker = fanout.workers[":93"]
+        old_pid = worker.process.pid
+        worker.process.kill()
+        wait_for(lambda: worker.restarts == 1 and worker.is_alive())
+        wait_for(lambda: fanout.call(":93", "state")["clickers"][0]["fires"] > 3)
+        status = fanout.status()["displays"][":93"]
+        assert status["pid"] != old_pid and status["restarts"] == 1 and status["clickers"][0]["active"]
+        print("✓ Worker restarted and its clicker resumed")
+    finally:
+        fanout.close()
+
+
+def test_assignment_compacted():
+    """Test that only the current clicker settings and running flags are kept for a restart."""
+    print("\nTesting replayed assignment...")
+    fanout = FanOut("fake")
+    try:
+        fanout.assign(":95", {"clickers": [{"interval": "10ms"}, {"name": "b", "interval": "1s"}]})
+        worker = fanout.workers[":95"]
+        for i in range(50):
+            fanout.call(":95", "set", clicker="b", interval=f"{100 + i}ms")
+            fanout.call(":95", "stop", clicker=0)
+            fanout.call(":95", "start", clicker=0)
+        fanout.call(":95", "stop", clicker="b")
+        assignment = worker.assignment()
+        assert [r["cmd"] for r in assignment] == ["add", "add", "start"], assignment
+        assert assignment[1]["interval"] == "149ms" and assignment[2]["clicker"] == 0
+
+        worker.process.kill()
+        wait_for(lambda: worker.restarts == 1 and worker.is_alive())
+        rows = fanout.call(":95", "state")["clickers"]
+        assert [row["active"] for row in rows] == [True, False]
+        assert abs(rows[1]["interval"] - 0.149) < 1e-9
+        print(f"✓ 151 calls replayed as {len(assignment)} requests")
+    finally:
+        fanout.close()
+
+
+def test_restart_backoff():
+    """Test that a worker that keeps dying is retried with a growing delay, then reported failed."""
+    print("\nTesting restart backoff...")
+    saved = fanout_module.WATCH_INTERVAL, fanout_module.RESTART_BACKOFF, fanout_module.MAX_RESTARTS
+    fanout_module.WATCH_INTERVAL, fanout_module.RESTART_BACKOFF, fanout_module.MAX_RESTARTS = 0.01, 0.1, 3
+    fanout = FanOut("fake")
+    try:
+        worker = fanout.add_display(":96")
+        worker.backend = "no-such-backend"  # every restart exits at once
+        worker.process.kill()
+        gaps = []
+        while not worker.failed:
+            started = worker.started
+            wait_for(lambda: worker.failed or worker.started != started)
+            gaps.append(worker.started - started)
+        assert worker.restarts == 3, worker.restarts
+        assert all(gap >= 0.1 * 2 ** i for i, gap in enumerate(gaps[:3])), gaps
+        status = fanout.status()
+        entry = status["displays"][":96"]
+        assert entry["failed"] and not entry["alive"] and "gave up" in entry["error"]
+        assert status["totals"]["failed"] == 1
+        print(f"✓ Gave up after 3 restarts, {', '.join(f'{gap:.2f}' for gap in gaps[:3])} s apart")
+    finally:
+        fanout_module.WATCH_INTERVAL, fanout_module.RESTART_BACKOFF, fanout_module.MAX_RESTARTS = saved
+        fanout.close()
+
+
+class SlowController(Controller):
+    def cmd_slow(self):
+        time.sleep(0.3)
+        return "slow"
+
+
+def test_late_replies_dropped():
+    """Test that a reply arriving after its call timed out is not taken by the next call."""
+    print("\nTesting late replies...")
+    worker = DisplayWorker(":94", "fake", None)
+    worker.conn, child = multiprocessing.Pipe()
+    engine = ClickerEngine(FakeBackend)
+    controller = SlowController(engine)
+
+    def serve():  # worker_main's loop, in a thread
+        while (request := child.recv()) is not None:
+            child.send(run_request(controller, request))
+
+    server = threading.Thread(target=serve)
+    server.start()
+    timeout = fanout_module.CALL_TIMEOUT
+    fanout_module.CALL_TIMEOUT = 0.1
+    try:
+        try:
+            worker.call("slow")
+        except ControlError as e:
+            assert "did not answer" in str(e), e
+        else:
+            raise AssertionError("slow call should have timed out")
+        fanout_module.CALL_TIMEOUT = timeout
+        assert worker.call("ping") == "pong"
+        assert worker.call("state")["clickers"] == []
+    finally:
+        fanout_module.CALL_TIMEOUT = timeout
+        worker.conn.send(None)
+        server.join()
+        engine.shutdown()
+    print("✓ Late reply dropped; later calls get their own answers")
+
+
+def main():
+    """Run all tests."""
+    print("=== Fan-Out Test Suite ===")
+    try:
+        test_assign_and_status()
+        test_restart()
+        test_assignment_compacted()
+        test_restart_backoff()
+        test_late_replies_dropped()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
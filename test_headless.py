@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for headless autoclicker mode.
+Uses an in-test recording backend so no mouse or display is required.
+"""
+
+import subprocess
+import sys
+import threading
+
+import autoclicker
+
+
+class RecordingBackend:
+    """Minimal backend that records clicks instead of performing them."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.clicks = []
+
+    def position(self):
+        return 0, 0
+
+    def click(self, x=None, y=None, button="left"):
+        self.clicks.append((x, y))
+
+    def close(self):
+        pass
+
+
+def test_parse_clicker():
+    """Test --clicker spec parsing."""
+    print("Testing clicker specs...")
+    assert autoclicker.parse_clicker("5") == {"interval": "5"}
+    assert autoclicker.parse_clicker("2ms@100,200") == {"interval": "2ms", "x": 100, "y": 200}
+    assert autoclicker.parse_clicker("30@10,10+1.5") == {"interval": "30", "x": 10, "y": 10, "offset": "1.5"}
+    print("✓ Clicker specs parsed")
+
+    offsets = [clicker["offset"] for clicker in autoclicker.normalize_config({"clickers": [
+        {"interval": "5", "offset": "0"}, {"interval": "5", "offset": 0},
+        {"interval": "5", "offset": "0.5ms"}, autoclicker.parse_clicker("5+2ms"), {"interval": "5"}]})["clickers"]]
+    assert offsets == [0, 0, 0.0005, 0.002, 0], f"Unexpected offsets {offsets}"
+    print("✓ Offsets of 0 and under 1 ms accepted")
+
+
+def test_headless_run():
+    """Test that headless mode clicks immediately and stops on its duration."""
+    print("\nTesting headless run...")
+    backend = RecordingBackend()
+    config = {
+        "clickers": [{"interval": "0.05", "x": 10, "y": 20}, {"interval": "10ms"}],
+        "duration": 0.3,
+        "quiet": True,
+    }
+    summary = autoclicker.run_headless(config, backend=backend, stop_event=threading.Event())
+
+    fires = [c["fires"] for c in summary["clickers"]]
+    assert 5 <= fires[0] <= 8, f"Expected ~7 fires at 50 ms, got {fires[0]}"
+    assert 25 <= fires[1] <= 32, f"Expected ~31 fires at 10 ms, got {fires[1]}"
+    assert (10, 20) in backend.clicks and (None, None) in backend.clicks
+    assert summary["first_click_ms"] is not None
+    print(f"✓ {sum(fires)} clicks, first click after {summary['first_click_ms']:.1f} ms")
+
+
+def test_no_gui_imports():
+    """Test that importing the terminal clicker pulls in neither tkinter, pynput nor the metrics server."""
+    print("\nTesting imports...")
+    code = ("import sys, autoclicker; "
+            "print(','.join(m for m in ('tkinter', 'pynput', 'metrics', 'http.server') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "", f"Unexpected imports: {result.stdout.strip()}"
+    print("✓ No tkinter, pynput or http.server imported")
+
+
+def test_invalid_config():
+    """Test that bad configs are rejected before clicking starts."""
+    print("\nTesting invalid config...")
+    for config in ({"clickers": []}, {"clickers": [{"interval": "0"}]},
+                   {"clickers": [{"interval": "5", "x": 1}]}):
+        try:
+            autoclicker.run_headless(config, backend=RecordingBackend())
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{config} should be rejected")
+    print("✓ Invalid configs rejected")
+
+
+def main():
+    """Run all tests."""
+    print("=== Headless Mode Test Suite ===")
+    try:
+        test_parse_clicker()
+        test_headless_run()
+        test_no_gui_imports()
+        test_invalid_config()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for high-rate click mode.
+Drives the scheduler with a no-op click so no mouse or display is required.
+"""
+
+import time
+
+from high_rate import HIGH_RATE_SPIN_NS, RateMeter, catch_up_periods, parse_offset, parse_rate
+from scheduler import ClickScheduler
+
+
+def test_parse_rate():
+    """Test rate parsing for clicks/sec, milliseconds and seconds."""
+    print("Testing rate parsing...")
+    test_cases = [
+        ("500", 0.002),
+        ("250cps", 0.004),
+        ("2ms", 0.002),
+        ("0.5s", 0.5),
+    ]
+    for text, expected in test_cases:
+        result = parse_rate(text)
+        assert abs(result - expected) < 1e-12, f"Expected {expected}, got {result}"
+        print(f"✓ {text!r} -> {result}s")
+
+    for text in ("0", "abc", "-5", "0.1ms"):
+        try:
+            parse_rate(text)
+        except ValueError:
+            print(f"✓ {text!r} rejected")
+        else:
+            raise AssertionError(f"{text!r} should be rejected")
+
+
+def test_parse_offset():
+    """Test that offsets allow zero and are not held to the rate limit."""
+    print("\nTesting offset parsing...")
+    for text, expected in (("0", 0), (0, 0), ("0.5ms", 0.0005), ("1.5", 1.5), ("2s", 2)):
+        result = parse_offset(text)
+        assert abs(result - expected) < 1e-12, f"Expected {expected}, got {result}"
+        print(f"✓ {text!r} -> {result}s")
+
+    for text in ("abc", "-1", "inf", ""):
+        try:
+            parse_offset(text)
+        except ValueError:
+            print(f"✓ {text!r} rejected")
+        else:
+            raise AssertionError(f"{text!r} should be rejected")
+
+
+def test_sustained_rate():
+    """Test that the scheduler holds a 500 CPS target with a no-op click."""
+    print("\nTesting sustained rate...")
+    interval = parse_rate("500")
+    meter = RateMeter(interval)
+    scheduler = ClickScheduler(spin_ns=HIGH_RATE_SPIN_NS)
+    scheduler.start()
+    job = scheduler.add("primary", interval, lambda job, late: meter.tick(),
+                        catch_up=catch_up_periods(interval))
+    time.sleep(1.0)
+    scheduler.stop()
+
+    rate = meter.overall_rate()
+    assert rate >= 0.95 * meter.target_cps, f"Achieved only {meter.report(rate)}"
+    print(f"✓ {meter.report(rate)}, missed {job.missed}")
+
+
+def main():
+    """Run all tests."""
+    print("=== High-Rate Mode Test Suite ===")
+    try:
+        test_parse_rate()
+        test_parse_offset()
+        test_sustained_rate()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
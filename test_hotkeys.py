@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for hotkey dispatch.
+Uses stand-ins for pynput key objects; no keyboard or display is required.
+"""
+
+import time
+
+from hotkeys import HotkeyMap, parse_chord
+
+
+class Key:
+    """Stand-in for a pynput Key member."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+class KeyCode:
+    """Stand-in for a pynput KeyCode."""
+
+    def __init__(self, char):
+        self.char = char
+
+
+F1, F2, F9, CTRL, SHIFT = Key("f1"), Key("f2"), Key("f9"), Key("ctrl_l"), Key("shift_r")
+CTRL_R = Key("ctrl_r")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def build(bindings):
+    calls = []
+    actions = {"toggle_clicker": lambda index: calls.append(("toggle", index)),
+               "stop_all": lambda: calls.append(("stop_all",))}
+    clock = FakeClock()
+    return HotkeyMap(bindings, actions, clock=clock), calls, clock
+
+
+def tap(hotkeys, clock, *keys):
+    """Press keys in order, then release them in reverse, a second apart."""
+    clock.now += 1
+    for key in keys:
+        hotkeys.on_press(key)
+    for key in reversed(keys):
+        hotkeys.on_release(key)
+
+
+def test_bindings_and_chords():
+    """Test that plain keys and chords dispatch to their actions only."""
+    print("Testing bindings and chords...")
+    hotkeys, calls, clock = build({"f1": "toggle_clicker:0", "<ctrl>+f1": "toggle_clicker:1",
+                                   "ctrl+shift+s": "stop_all"})
+    tap(hotkeys, clock, F1)
+    tap(hotkeys, clock, CTRL, F1)
+    tap(hotkeys, clock, CTRL, SHIFT, KeyCode("S"))
+    tap(hotkeys, clock, SHIFT, F1)  # no binding for shift+f1
+    tap(hotkeys, clock, F2)
+    tap(hotkeys, clock, KeyCode("s"))
+    assert calls == [("toggle", 0), ("toggle", 1), ("stop_all",)], calls
+    assert parse_chord("<ctrl>+<alt>+F5") == (5, "f5")
+    print("✓ F1, Ctrl+F1 and Ctrl+Shift+S dispatched; others ignored")
+
+
+def test_repeat_and_debounce():
+    """Test that auto-repeat and quick double presses fire once."""
+    print("\nTesting auto-repeat and debounce...")
+    hotkeys, calls, clock = build({"f1": "toggle_clicker:0"})
+    clock.now = 10
+    for _ in range(20):
+        hotkeys.on_press(F1)  # held key: repeated presses without release
+    hotkeys.on_release(F1)
+    clock.now += 0.05
+    hotkeys.on_press(F1)  # release/press pair inside the debounce window
+    hotkeys.on_release(F1)
+    clock.now += 1
+    hotkeys.on_press(F1)
+    assert calls == [("toggle", 0), ("toggle", 0)], calls
+    print("✓ Held and bounced keys fired once each")
+
+
+def test_both_modifier_sides():
+    """Test that releasing one Ctrl key keeps the chord while the other is held."""
+    print("\nTesting left and right modifiers...")
+    hotkeys, calls, clock = build({"ctrl+f1": "toggle_clicker:1", "f1": "toggle_clicker:0"})
+    hotkeys.on_press(CTRL)
+    hotkeys.on_press(CTRL_R)
+    hotkeys.on_release(CTRL)
+    tap(hotkeys, clock, F1)  # right Ctrl still down
+    hotkeys.on_release(CTRL_R)
+    tap(hotkeys, clock, F1)
+    assert calls == [("toggle", 1), ("toggle", 0)], calls
+    print("✓ Ctrl+F1 while right Ctrl is held; plain F1 after both are released")
+
+
+def test_invalid_bindings():
+    """Test that bad chords and actions fail when the map is built."""
+    print("\nTesting invalid bindings...")
+    for bindings, error in (({"f1": "explode"}, "Unknown action 'explode'"),
+                            ({"hyper+f1": "stop_all"}, "Unknown modifier 'hyper'"),
+                            ({"ctrl+shift": "stop_all"}, "no key besides modifiers"),
+                            ({"f1": "toggle_clicker:abc"}, "expected a clicker number, got 'abc'"),
+                            ({"f1": "toggle_clicker:-1"}, "expected a clicker number"),
+                            ({"f1": "toggle_clicker"}, "takes 1 argument(s), got 0"),
+                            ({"f1": "stop_all:1"}, "takes 0 argument(s), got 1")):
+        try:
+            build(bindings)
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{bindings} should have been rejected")
+    print("✓ Bad chords, actions and arguments rejected at load time")
+
+
+def test_unbound_cost():
+    """Test that unbound keys do no work beyond a lookup."""
+    print("\nTesting unbound key cost...")
+    hotkeys, calls, clock = build({"f1": "toggle_clicker:0"})
+    keys = [KeyCode(c) for c in "abcdefghijklmnopqrstuvwxyz"] + [F9]
+    start = time.perf_counter()
+    for _ in range(4000):
+        for key in keys:
+            hotkeys.on_press(key)
+            hotkeys.on_release(key)
+    per_key_us = (time.perf_counter() - start) / (4000 * len(keys)) * 1e6
+    assert not calls
+    print(f"✓ {per_key_us:.2f} us per unbound press+release")
+
+
+def main():
+    """Run all tests."""
+    print("=== Hotkey Test Suite ===")
+    try:
+        test_bindings_and_chords()
+        test_repeat_and_debounce()
+        test_both_modifier_sides()
+        test_invalid_bindings()
+        test_unbound_cost()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for humanized jitter.
+Runs jittered clickers on a VirtualClock against the fake backend; no
+mouse or display is required. Skipped when NumPy is not installed.
+"""
+
+import statistics
+import time
+
+from autoclicker import run_headless
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED
+from scheduler import NS_PER_SECOND, VirtualClock
+from virtual_engine import virtual_engine
+
+try:
+    from jitter import Jitter, build_jitter
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def have_numpy():
+    if numpy is None:
+        print("✗ NumPy not available; skipping")
+        return False
+    return True
+
+
+def run(jitter, seconds=2000, interval=1):
+    """Clicks of one fixed clicker with jitter over `seconds` of virtual time."""
+    engine, backend, clock = virtual_engine()
+    engine.add_clicker("Jittered", interval, x=100, y=100, mode=MODE_FIXED)
+    engine.set_jitter(0, jitter)
+    engine.start(0)
+    # A quarter interval more, so a late last click still lands
+    engine.scheduler.run_until((seconds + interval / 4) * NS_PER_SECOND)
+    assert engine.table.missed[0] == 0
+    return backend.clicks()
+
+
+def test_reproducible():
+    """Test that a seed replays the same timeline exactly."""
+    print("Testing reproducibility...")
+    if not have_numpy():
+        return
+    spec = {"distribution": "normal", "spread": "40ms", "position": 3}
+    first = run(build_jitter(spec, seed=7))
+    again = run(build_jitter(spec, seed=7))
+    other = run(build_jitter(spec, seed=8))
+    other_stream = run(build_jitter(spec, seed=7, stream=1))
+    assert first == again
+    assert first != other and first != other_stream
+    print(f"✓ {len(first)} clicks replayed identically from seed 7")
+
+
+def test_bounds_and_grid():
+    """Test that offsets stay bounded around the grid and do not drift."""
+    print("\nTesting bounds and grid...")
+    if not have_numpy():
+        return
+    clicks = run(Jitter("normal", spread=0.04, bound=0.1, position=3, seed=1), seconds=5000)
+    assert len(clicks) == 5000, len(clicks)
+    offsets = [t - (k + 1) * NS_PER_SECOND for k, (t, _, _, _) in enumerate(clicks)]
+    assert all(abs(o) <= 100_000_000 for o in offsets)
+    assert all(97 <= x <= 103 and 97 <= y <= 103 for _, x, y, _ in clicks)
+    sigma_ms = statistics.pstdev(offsets) / 1e6
+    assert 35 < sigma_ms < 45, sigma_ms
+    assert len({x for _, x, _, _ in clicks}) == 7
+    print(f"✓ Offsets within 100 ms (sigma {sigma_ms:.1f} ms) and 3 px; click 5000 on its grid slot")
+
+    clicks = run(Jitter("uniform", spread=10, seed=2), seconds=200)
+    offsets = [t - (k + 1) * NS_PER_SECOND for k, (t, _, _, _) in enumerate(clicks)]
+    assert max(abs(o) for o in offsets) <= NS_PER_SECOND // 2
+    print("✓ Spread wider than the interval is limited to half an interval")
+
+
+def test_distributions():
+    """Test the shape of each distribution's timing offsets."""
+    print("\nTesting distributions...")
+    if not have_numpy():
+        return
+    for distribution in ("uniform", "normal", "lognormal"):
+        jitter = Jitter(distribution, spread=0.05, bound=1, seed=3)
+        offsets = [jitter.next_delay_ns() / 1e6 for _ in range(20000)]
+        mean, median = statistics.fmean(offsets), statistics.median(offsets)
+        if distribution == "uniform":
+            assert -50 <= min(offsets) and max(offsets) <= 50 and abs(mean) < 2
+        elif distribution == "normal":
+            assert abs(mean) < 2 and 45 < statistics.pstdev(offsets) < 55
+        else:
+            assert abs(median) < 2 and mean > median + 5, (mean, median)
+        print(f"✓ {distribution}: mean {mean:+.1f} ms, median {median:+.1f} ms")
+
+    for spec, error in (({"distribution": "poisson"}, "Unknown distribution"),
+                        ({"spread": "fast"}, "Invalid rate"),
+                        ({"jitter": 1}, "Unknown jitter setting")):
+        try:
+            build_jitter(spec)
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{spec} should have been rejected")
+    print("✓ Bad settings rejected")
+
+
+def test_headless_seed():
+    """Test that a headless run reports its seed and replays from it."""
+    print("\nTesting headless seed...")
+    if not have_numpy():
+        return
+    config = {"clickers": [{"interval": 1, "x": 10, "y": 10, "jitter": {"spread": "50ms", "position": 2}},
+                           {"interval": 3, "jitter": {"distribution": "lognormal", "spread": "200ms"}}],
+              "duration": 600, "quiet": True}
+    clock = VirtualClock()
+    backend = FakeBackend(clock)
+    summary = run_headless(config, backend=backend, clock=clock)
+    replay_clock = VirtualClock()
+    replay = FakeBackend(replay_clock)
+    run_headless(dict(config, seed=summary["seed"]), backend=replay, clock=replay_clock)
+    assert backend.clicks() == replay.clicks()
+    print(f"✓ {len(backend.clicks())} clicks replayed from seed {summary['seed']}")
+
+
+def test_per_fire_cost():
+    """Test that taking an offset is cheap next to drawing one per fire."""
+    print("\nTesting per-fire cost...")
+    if not have_numpy():
+        return
+    jitter = Jitter("lognormal", spread=0.05, position=3, seed=4)
+    rng = numpy.random.default_rng(4)
+    count = 200_000
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        jitter.next_delay_ns()
+        jitter.next_offset()
+    batched = (time.perf_counter_ns() - start) / count
+    start = time.perf_counter_ns()
+    for _ in range(count // 10):
+        rng.lognormal(0, 0.5)
+        rng.normal(0, 1.5, 2)
+    per_call = (time.perf_counter_ns() - start) / (count // 10)
+    print(f"✓ {batched:.0f} ns per fire from batches vs {per_call:.0f} ns drawing per fire")
+
+
+def main():
+    """Run all tests."""
+    print("=== Jitter Test Suite ===")
+    try:
+        test_reproducible()
+        test_bounds_and_grid()
+        test_distributions()
+        test_headless_seed()
+        test_per_fire_cost()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
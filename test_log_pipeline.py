@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the status log pipeline.
+Exercises the ring buffer from several threads without a GUI.
+"""
+
+import sys
+import threading
+
+from log_pipeline import LogRing, format_batch
+
+
+def test_drain_in_order():
+    """Test that records drain in push order as one batch."""
+    print("Testing ordered drain...")
+    ring = LogRing(capacity=10)
+    for i in range(5):
+        ring.push(f"message {i}")
+    records, dropped = ring.drain()
+    assert [m for _, m in records] == [f"message {i}" for i in range(5)]
+    assert dropped == 0 and len(ring) == 0
+    batch = format_batch(records)
+    assert batch.count("\n") == 5 and batch.startswith("[")
+    print("✓ 5 records drained in order")
+
+
+def test_overflow_counts_dropped():
+    """Test that overwritten records are counted as dropped."""
+    print("\nTesting overflow...")
+    ring = LogRing(capacity=10)
+    for i in range(25):
+        ring.push(f"message {i}")
+    records, dropped = ring.drain()
+    assert len(records) == 10 and dropped == 15, f"Got {len(records)} records, {dropped} dropped"
+    assert records[0][1] == "message 15"
+    assert "15 messages dropped" in format_batch(records, dropped)
+    print("✓ 15 of 25 records dropped and reported")
+
+
+def test_concurrent_producers():
+    """Test that pushes from many threads are all accounted for."""
+    print("\nTesting concurrent producers...")
+    ring = LogRing(capacity=500)
+    received = []
+    stop = threading.Event()
+
+    def consumer():
+        while not stop.is_set() or len(ring):
+            records, _ = ring.drain(limit=100)
+            received.extend(records)
+
+    def producer(n):
+        for i in range(2000):
+            ring.push((n, i))
+
+    drainer = threading.Thread(target=consumer)
+    drainer.start()
+    producers = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    stop.set()
+    drainer.join()
+
+    assert len(received) + ring.dropped == 8000, "Records were lost without being counted"
+    print(f"✓ {len(received)} received + {ring.dropped} dropped = 8000")
+
+
+def test_no_false_gaps():
+    """Test that racing producers never show up as drops when nothing overflowed."""
+    print("\nTesting sequence order under contention...")
+    ring = LogRing(capacity=100_000)
+    drops = []
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        producers = [threading.Thread(target=lambda: [ring.push(i) for i in range(5000)]) for _ in range(8)]
+        for thread in producers:
+            thread.start()
+        while any(thread.is_alive() for thread in producers) or len(ring):
+            drops.append(ring.drain(limit=50)[1])
+        for thread in producers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not any(drops) and ring.dropped == 0 and ring.drained == 40_000, (set(drops), ring.dropped)
+    print(f"✓ 40000 records from 8 producers in {len(drops)} drains, no false gaps")
+
+
+def main():
+    """Run all tests."""
+    print("=== Log Pipeline Test Suite ===")
+    try:
+        test_drain_in_order()
+        test_overflow_counts_dropped()
+        test_concurrent_producers()
+        test_no_false_gaps()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for clicker metrics.
+Drives the engine on a virtual clock and scrapes the endpoint locally;
+no mouse or display is required.
+"""
+
+import http.client
+import os
+import socket
+import tempfile
+
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED
+from metrics import Histogram, MetricsServer
+from scheduler import NS_PER_SECOND
+from virtual_engine import virtual_engine
+
+
+class FlakyBackend(FakeBackend):
+    """Fake backend whose every third click fails."""
+
+    def click(self, x=None, y=None, button="left"):
+        if len(self.events) % 3 == 2:
+            self.events.append((self.clock(), "error", x, y, button))
+            raise OSError("display went away")
+        FakeBackend.click(self, x, y, button)
+
+
+def test_histogram():
+    """Test that histogram buckets are cumulative and in seconds."""
+    print("Testing histogram...")
+    histogram = Histogram((1_000, 1_000_000))
+    for value in (0, 1_000, 5_000, 2_000_000):
+        histogram.observe(value)
+    lines = histogram.lines("x", 'clicker="0"')
+    assert lines == ['x_bucket{clicker="0",le="1e-06"} 2', 'x_bucket{clicker="0",le="0.001"} 3',
+                     'x_bucket{clicker="0",le="+Inf"} 4', 'x_sum{clicker="0"} 0.002006000',
+                     'x_count{clicker="0"} 4'], lines
+    print("✓ Buckets cumulative, sum in seconds")
+
+
+def test_render():
+    """Test per-clicker counters, skipped clicks and histograms in the text format."""
+    print("\nTesting render...")
+    engine, _, clock = virtual_engine(backend_class=FlakyBackend)
+    registry = engine.enable_metrics()
+    registry.gauge("autoclicker_log_queue_depth", "Queued messages", lambda: 7)
+    engine.add_clicker('Main "A"', 1, x=1, y=1, mode=MODE_FIXED)
+    engine.start(0)
+    engine.scheduler.run_until(9 * NS_PER_SECOND)
+    text = registry.render()
+    labels = 'clicker="0",name="Main \\"A\\""'
+    for line in (f"autoclicker_clicker_fires_total{{{labels}}} 6",
+                 f"autoclicker_clicker_skipped_total{{{labels}}} 3",
+                 f"autoclicker_clicker_missed_total{{{labels}}} 0",
+                 f'autoclicker_fire_lateness_seconds_bucket{{{labels},le="5e-05"}} 6',
+                 "autoclicker_backend_click_seconds_count 6",
+                 "# TYPE autoclicker_fire_lateness_seconds histogram",
+                 "autoclicker_log_queue_depth 7"):
+        assert line in text.splitlines(), f"Missing {line!r} in\n{text}"
+    print("✓ 6 fires, 3 skipped, lateness histogram and gauge rendered")
+
+
+def test_http_and_unix_socket():
+    """Test scraping over a localhost port and a Unix socket."""
+    print("\nTesting endpoints...")
+    engine, _, clock = virtual_engine()
+    registry = engine.enable_metrics()
+    engine.add_clicker("Primary", 2)
+    engine.start(0)
+    engine.scheduler.run_until(10 * NS_PER_SECOND)
+
+    server = MetricsServer(registry, "127.0.0.1:0")
+    try:
+        conn = http.client.HTTPConnection(*server._server.server_address[:2], timeout=5)
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        body = response.read().decode()
+        assert response.status == 200 and response.getheader("Content-Type").startswith("text/plain")
+        assert 'autoclicker_clicker_fires_total{clicker="0",name="Primary"} 5' in body
+        conn.close()
+    finally:
+        server.close()
+
+    path = os.path.join(tempfile.mkdtemp(), "metrics.sock")
+    with open(path, "w") as f:
+        f.write("not a socket")
+    try:
+        MetricsServer(registry, path)
+    except FileExistsError:
+        pass
+    else:
+        raise AssertionError("A regular file at the socket path was replaced")
+    assert os.path.isfile(path)
+    os.unlink(path)
+    server = MetricsServer(registry, path)
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(path)
+            sock.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+            data = b""
+            while chunk := sock.recv(65536):
+                data += chunk
+        assert data.startswith(b"HTTP/1.0 200") and b"autoclicker_backend_click_seconds_count 5" in data
+    finally:
+        server.close()
+    assert not os.path.exists(path)
+    print(f"✓ Scraped over TCP and {path} (owner-only); a regular file there is left alone")
+
+
+def main():
+    """Run all tests."""
+    print("=== Metrics Test Suite ===")
+    try:
+        test_histogram()
+        test_render()
+        test_http_and_unix_socket()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
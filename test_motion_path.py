@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for mouse-path simplification and interpolation.
+Feeds synthetic paths; no mouse or display is required.
+"""
+
+import math
+
+from click_recorder import MOVE
+from motion_path import PathSimplifier, interpolate_moves
+
+
+def simplify(points, tolerance):
+    """Run points through a simplifier and return the kept vertices."""
+    kept = []
+    path = PathSimplifier(lambda t, x, y: kept.append((t, x, y)), tolerance)
+    for point in points:
+        path.add(*point)
+    path.flush()
+    return kept
+
+
+def position_at(vertices, t):
+    """Linear position along the vertices at time t."""
+    for (t0, x0, y0), (t1, x1, y1) in zip(vertices, vertices[1:]):
+        if t0 <= t <= t1:
+            f = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+            return x0 + (x1 - x0) * f, y0 + (y1 - y0) * f
+    return vertices[-1][1:]
+
+
+def test_straight_line_collapses():
+    """Test that constant-speed motion keeps only its end points."""
+    print("Testing straight line...")
+    points = [(i * 2_000_000, i * 3, i * 2) for i in range(200)]
+    kept = simplify(points, tolerance=1.0)
+    assert kept == [points[0], points[-1]], f"Kept {len(kept)} vertices"
+    print("✓ 200 points reduced to 2")
+
+
+def test_circle_within_tolerance():
+    """Test that a curved path is compressed and replays within tolerance."""
+    print("\nTesting circle...")
+    points = [(i * 2_000_000, round(500 + 200 * math.cos(i / 50)), round(500 + 200 * math.sin(i / 50)))
+              for i in range(1000)]
+    kept = simplify(points, tolerance=2.0)
+    error = max(math.hypot(px - x, py - y)
+                for t, px, py in points for x, y in [position_at(kept, t)])
+    assert len(kept) < len(points) / 5, f"Kept {len(kept)} of {len(points)} points"
+    assert error <= 2.0 + 1e-9, f"Replay error {error:.2f} px"
+    print(f"✓ 1000 points reduced to {len(kept)}, max replay error {error:.2f} px")
+
+
+def test_interpolation():
+    """Test that moves are filled in at the output rate and clicks are untouched."""
+    print("\nTesting interpolation...")
+    events = [(0, 0, 0, 1), (100_000_000, 100, 0, MOVE), (200_000_000, 100, 0, 1)]
+    out = list(interpolate_moves(events, rate=100))
+    moves = [e for e in out if e[3] == MOVE]
+    assert len(moves) == 10, f"Expected 10 moves, got {len(moves)}"
+    assert moves[4] == (50_000_000, 50, 0, MOVE)
+    assert out[-1] == events[-1]
+    clicks_only = [(0, 0, 0, 1), (100_000_000, 50, 50, 1)]
+    assert list(interpolate_moves(clicks_only)) == clicks_only
+    print("✓ 9 moves interpolated at 100/s, click-only sequences unchanged")
+
+
+def main():
+    """Run all tests."""
+    print("=== Motion Path Test Suite ===")
+    try:
+        test_straight_line_collapses()
+        test_circle_within_tolerance()
+        test_interpolation()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for sequence playback.
+Plays synthetic sequences into a list; no mouse or display is required.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from click_backends import FakeBackend
+from playback import SequencePlayer, playback_offsets
+from scheduler import VirtualClock
+
+
+def test_offsets_speed_and_clamp():
+    """Test that gaps are scaled by speed and clamped to the max idle gap."""
+    print("Testing offsets...")
+    sequence = [(1_000, 0, 0, 1), (1_001_000, 1, 1, 1), (11_001_000, 2, 2, 1)]
+    offsets = [o for o, _, _, _ in playback_offsets(sequence, speed=2)]
+    assert offsets == [0, 500_000, 5_500_000], f"Unexpected offsets {offsets}"
+    offsets = [o for o, _, _, _ in playback_offsets(sequence, max_gap=0.002)]
+    assert offsets == [0, 1_000_000, 3_000_000], f"Unexpected clamped offsets {offsets}"
+    print("✓ Speed and idle-gap clamp applied")
+
+
+def test_no_accumulated_drift():
+    """Test that slow clicks do not push later clicks or repetitions back."""
+    print("\nTesting drift...")
+    sequence = [(i * 5_000_000, i, i, 1) for i in range(20)]  # one click every 5 ms
+    clicks = []
+
+    def slow_click(x, y, button):
+        clicks.append(time.monotonic_ns())
+        time.sleep(0.002)  # latency that a relative-sleep player would add to every gap
+
+    player = SequencePlayer(sequence, slow_click, repeat=3, repeat_interval=0.01)
+    start = time.monotonic_ns()
+    reports = player.run()
+
+    assert len(clicks) == 60 and len(reports) == 3
+    # Replay 3's last click is due at 2 * (95 ms + 10 ms) + 95 ms after the start
+    expected = start + (2 * 105 + 95) * 1_000_000
+    drift_ms = (clicks[-1] - expected) / 1e6
+    assert abs(drift_ms) < 5, f"Playback drifted {drift_ms:.2f} ms"
+    for report in reports:
+        assert report.max_lateness_ns < 5_000_000, report.summary()
+    print(f"✓ 60 clicks over 3 replays, end drift {drift_ms:.2f} ms")
+    print(f"  {reports[-1].summary()}")
+
+
+def test_stop():
+    """Test that stop() ends playback during a long gap."""
+    print("\nTesting stop...")
+    sequence = [(0, 0, 0, 1), (10_000_000_000, 1, 1, 1)]
+    clicks = []
+    player = SequencePlayer(sequence, lambda x, y, button: clicks.append((x, y)))
+    thread = threading.Thread(target=player.run)
+    thread.start()
+    time.sleep(0.05)
+    player.stop()
+    thread.join(1)
+    assert not thread.is_alive() and clicks == [(0, 0)]
+    print("✓ Playback stopped mid-gap")
+
+
+def test_gui_playback_clicks():
+    """Test the GUI's playback callbacks against the fake backend."""
+    print("\nTesting GUI playback callbacks...")
+    try:
+        from autoclicker_gui import AutoclickerGUI
+    except ImportError:
+        print("✗ tkinter not available; skipping")
+        return
+    clock = VirtualClock()
+    gui = SimpleNamespace(backend=FakeBackend(clock))
+    sequence = [(0, 1, 1, 1), (5_000_000, 2, 2, 0), (10_000_000, 3, 3, 3), (10_000_000, 4, 4, 1)]
+    for batch in (False, True):
+        gui.backend.events.clear()
+        player = SequencePlayer(sequence, lambda x, y, button: AutoclickerGUI.play_click(gui, x, y, button),
+                                click_batch=(lambda events: AutoclickerGUI.play_click_batch(gui, events))
+                                if batch else None, clock=clock)
+        player.run()
+        assert [(kind, x, button) for _, kind, x, _, button in gui.backend.events] == [
+            ("click", 1, "left"), ("move", 2, None), ("click", 3, "right"), ("click", 4, "left")]
+    print("✓ Clicks, moves and batches reach the backend with their button names")
+
+
+def test_gui_playback_end():
+    """Test that the GUI resets playback once: when the player ends, not again after a user stop."""
+    print("\nTesting GUI playback end...")
+    try:
+        from autoclicker_gui import AutoclickerGUI
+    except ImportError:
+        print("✗ tkinter not available; skipping")
+        return
+    for user_stop in (False, True):
+        stops, messages = [], []
+        player = SequencePlayer([(0, 1, 1, 1)], lambda x, y, button: None, clock=VirtualClock())
+        gui = SimpleNamespace(player=player, playing=True, log_message=messages.append,
+                              root=SimpleNamespace(after=lambda ms, callback, *args: callback(*args)))
+        gui.stop_playback = lambda: (stops.append(1), player.stop(), setattr(gui, "playing", False))
+        gui.playback_finished = lambda player: AutoclickerGUI.playback_finished(gui, player)
+        if user_stop:
+            gui.stop_playback()
+        AutoclickerGUI.playback_thread(gui)
+        assert len(stops) == 1, stops
+        assert messages == ([] if user_stop else ["Playback completed"]), messages
+    print("✓ Playback controls reset once")
+
+
+def main():
+    """Run all tests."""
+    print("=== Playback Test Suite ===")
+    try:
+        test_offsets_speed_and_clamp()
+        test_no_accumulated_drift()
+        test_stop()
+        test_gui_playback_clicks()
+        test_gui_playback_end()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
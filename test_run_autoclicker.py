@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the launcher.
+Replaces both entry points and the tkinter check, so neither version
+actually starts.
+"""
+
+import importlib.machinery
+import importlib.util
+import sys
+import types
+
+import autoclicker
+import run_autoclicker
+
+
+def launch(argv=None, sys_argv=("run_autoclicker.py",), tkinter=True, gui_error=None):
+    """Run the launcher with stand-in entry points; returns (exit code, calls made)."""
+    calls = []
+
+    def find_spec(name, package=None):
+        calls.append(("find_spec", name))
+        if tkinter is None:
+            raise ValueError(f"{name}.__spec__ is None")
+        return importlib.machinery.ModuleSpec(name, None) if tkinter else None
+
+    def gui_main():
+        calls.append(("gui",))
+        if gui_error is not None:
+            raise gui_error
+
+    def terminal_main(argv):
+        calls.append(("terminal", argv))
+        return 0
+
+    gui_module = types.ModuleType("autoclicker_gui")
+    gui_module.main = gui_main
+    saved = importlib.util.find_spec, autoclicker.main, sys.modules.get("autoclicker_gui"), sys.argv
+    importlib.util.find_spec, autoclicker.main = find_spec, terminal_main
+    sys.modules["autoclicker_gui"] = gui_module
+    sys.argv = list(sys_argv)
+    try:
+        code = run_autoclicker.main(argv)
+    finally:
+        importlib.util.find_spec, autoclicker.main, gui, sys.argv = saved
+        if gui is None:
+            del sys.modules["autoclicker_gui"]
+        else:
+            sys.modules["autoclicker_gui"] = gui
+    return code, calls
+
+
+def test_arguments_go_to_terminal():
+    """Test that command-line arguments run the terminal version with the same argv."""
+    print("Testing argument forwarding...")
+    argv = ["--headless", "--clicker", "5"]
+    assert launch(argv) == (0, [("terminal", argv)])
+    assert launch(sys_argv=["run_autoclicker.py"] + argv) == (0, [("terminal", argv)])
+    print("✓ Arguments passed to the terminal version, tkinter not checked")
+
+
+def test_gui_when_available():
+    """Test that the GUI runs when tkinter can be found."""
+    print("\nTesting GUI launch...")
+    assert launch() == (0, [("find_spec", "tkinter"), ("gui",)])
+    print("✓ GUI started")
+
+
+def test_terminal_fallback():
+    """Test the in-process terminal fallback without tkinter or when the GUI fails."""
+    print("\nTesting terminal fallback...")
+    assert launch(tkinter=False) == (0, [("find_spec", "tkinter"), ("terminal", [])])
+    assert launch(tkinter=None) == (0, [("find_spec", "tkinter"), ("terminal", [])])
+    assert launch(gui_error=RuntimeError("no display")) == (0, [("find_spec", "tkinter"), ("gui",),
+                                                                ("terminal", [])])
+    print("✓ Terminal version run in-process")
+
+
+def main():
+    """Run all tests."""
+    print("=== Launcher Test Suite ===")
+    try:
+        test_arguments_go_to_terminal()
+        test_gui_when_available()
+        test_terminal_fallback()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
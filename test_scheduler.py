@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the click scheduler.
+Runs short real-time schedules; no mouse or display is required.
+"""
+
+import threading
+import time
+
+from scheduler import ClickScheduler, VirtualClock, seconds_to_ns
+
+
+def test_periodic_fires():
+    """Test that a job fires on its absolute deadlines."""
+    print("Testing periodic fires...")
+    scheduler = ClickScheduler()
+    scheduler.start()
+    fired = []
+    done = threading.Event()
+
+    def on_fire(job, lateness_ns):
+        fired.append((job.deadline_ns, lateness_ns))
+        if len(fired) == 5:
+            done.set()
+
+    anchor = time.monotonic_ns()
+    scheduler.add("primary", 0.02, on_fire, anchor_ns=anchor)
+    assert done.wait(2), f"Expected 5 fires, got {len(fired)}"
+    scheduler.stop()
+
+    for k, (deadline, lateness) in enumerate(fired[:5], start=1):
+        assert deadline == anchor + k * seconds_to_ns(0.02), f"Fire {k} off the grid"
+        assert lateness >= 0, "Fired before its deadline"
+    print(f"✓ 5 fires on grid, max lateness {max(l for _, l in fired) / 1e6:.2f} ms")
+
+
+def test_offset_and_remove():
+    """Test delta offsets and cancellation."""
+    print("\nTesting offsets and removal...")
+    scheduler = ClickScheduler()
+    scheduler.start()
+    fired = []
+    anchor = time.monotonic_ns()
+    scheduler.add("primary", 0.05, lambda job, late: fired.append(job.name), anchor_ns=anchor)
+    job = scheduler.add("secondary", 0.05, lambda job, late: fired.append(job.name),
+                        anchor_ns=anchor, offset=0.01)
+    time.sleep(0.08)
+    assert fired[:2] == ["primary", "secondary"], f"Unexpected order {fired}"
+    assert job.deadline_ns == anchor + seconds_to_ns(0.06)
+
+    scheduler.remove("primary")
+    scheduler.remove("secondary")
+    count = len(fired)
+    time.sleep(0.12)
+    assert len(fired) == count, "Removed jobs kept firing"
+    assert scheduler.is_idle()
+    scheduler.stop()
+    print("✓ Offsets respected and removed jobs stopped")
+
+
+def test_idle_has_no_wakeups():
+    """Test that an idle scheduler does not poll the clock."""
+    print("\nTesting idle wakeups...")
+    calls = [0]
+
+    def counting_clock():
+        calls[0] += 1
+        return time.monotonic_ns()
+
+    scheduler = ClickScheduler(clock=counting_clock)
+    scheduler.start()
+    time.sleep(0.1)
+    assert calls[0] == 0, f"Idle scheduler read the clock {calls[0]} times"
+    scheduler.stop()
+    print("✓ No wakeups while idle")
+
+
+def test_missed_periods_are_skipped():
+    """Test that a stalled callback skips missed periods instead of bursting."""
+    print("\nTesting missed periods...")
+    scheduler = ClickScheduler()
+    scheduler.start()
+    fired = []
+
+    def slow(job, lateness_ns):
+        fired.append(job.deadline_ns)
+        if len(fired) == 1:
+            time.sleep(0.055)
+
+    anchor = time.monotonic_ns()
+    job = scheduler.add("primary", 0.01, slow, anchor_ns=anchor)
+    time.sleep(0.1)
+    scheduler.stop()
+    assert job.missed >= 3, f"Expected skipped periods, got {job.missed}"
+    gaps = [b - a for a, b in zip(fired, fired[1:])]
+    assert all(gap % seconds_to_ns(0.01) == 0 for gap in gaps), "Deadlines left the grid"
+    print(f"✓ {job.missed} missed periods skipped, grid preserved")
+
+
+def test_catch_up_budget():
+    """Test that catch-up is one budget per late streak, not per fire."""
+    print("\nTesting catch-up budget...")
+    clock = VirtualClock()
+    scheduler = ClickScheduler(clock=clock, manual=True)
+    scheduler.start()
+    lateness = []
+
+    def slow(job, lateness_ns):
+        lateness.append(lateness_ns)
+        clock.advance(0.025)  # every fire takes 2.5 periods
+
+    job = scheduler.add("primary", 0.01, slow, catch_up=3)
+    scheduler.run_until(seconds_to_ns(2))
+    # A per-fire allowance would let the lateness grow by 15 ms every fire
+    assert job.missed > 0 and max(lateness) <= seconds_to_ns(0.035), (job.missed, max(lateness))
+    print(f"✓ Lateness stays under {max(lateness) / 1e6:.0f} ms over {len(lateness)} slow fires, "
+          f"{job.missed} periods skipped")
+
+
+def test_spin_releases_lock():
+    """Test that spinning up to a deadline does not block other threads."""
+    print("\nTesting spin without the lock...")
+    scheduler = ClickScheduler(spin_ns=seconds_to_ns(0.2))
+    scheduler.start()
+    scheduler.add("primary", 0.3, lambda job, late: None)
+    time.sleep(0.15)  # inside the spin window
+    start = time.perf_counter()
+    scheduler.deadlines()
+    scheduler.add("secondary", 10, lambda job, late: None)
+    blocked_ms = (time.perf_counter() - start) * 1000
+    scheduler.stop()
+    assert blocked_ms < 50, f"Blocked {blocked_ms:.1f} ms behind the spin"
+    print(f"✓ deadlines() and add() took {blocked_ms:.1f} ms during a spin")
+
+
+def main():
+    """Run all tests."""
+    print("=== Scheduler Test Suite ===")
+    try:
+        test_periodic_fires()
+        test_offset_and_remove()
+        test_idle_has_no_wakeups()
+        test_missed_periods_are_skipped()
+        test_catch_up_budget()
+        test_spin_releases_lock()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for click sequence files.
+Writes sequences to a temporary directory; no mouse or display is required.
+"""
+
+import os
+import tempfile
+import time
+
+import sequence_file
+from click_recorder import ClickRecorder
+from sequence_file import SequenceFile, SequenceFormatError, save_recording, write_sequence
+
+
+def test_roundtrip_and_lazy_open():
+    """Test that a large sequence opens without reading its records."""
+    print("Testing binary roundtrip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.clkseq")
+        count = write_sequence(path, ((i * 1000, i % 1920, i % 1080, 1) for i in range(200_000)))
+        assert count == 200_000
+
+        start = time.perf_counter()
+        sequence = SequenceFile(path)
+        open_ms = (time.perf_counter() - start) * 1000
+        assert len(sequence) == 200_000
+        assert sequence[12345] == (12_345_000, 12345 % 1920, 12345 % 1080, 1)
+        assert sequence.duration_ns() == 199_999_000
+        assert sum(1 for _ in sequence) == 200_000
+        sequence.close()
+        assert open_ms < 50, f"Opening took {open_ms:.1f} ms"
+    print(f"✓ 200000 clicks, opened in {open_ms:.2f} ms")
+
+
+def test_save_recording():
+    """Test that recordings are saved with times relative to their start."""
+    print("\nTesting save from recorder...")
+    recorder = ClickRecorder(chunk_size=4)
+    for i in range(10):
+        recorder.record(i, i, 3, t_ns=recorder.start_ns + i * 10)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rec.clkseq")
+        assert save_recording(recorder, path) == 10
+        with SequenceFile(path) as sequence:
+            assert list(sequence)[9] == (90, 9, 9, 3)
+    recorder.close()
+    print("✓ Recorder saved with relative times")
+
+
+def test_text_roundtrip():
+    """Test streaming JSON and CSV import/export through the CLI."""
+    print("\nTesting JSON/CSV conversion...")
+    events = [(i * 5, i, -i, 1 + i % 3) for i in range(1000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = os.path.join(tmp, "a.clkseq")
+        write_sequence(binary, events)
+        for ext in (".json", ".csv"):
+            text = os.path.join(tmp, "a" + ext)
+            again = os.path.join(tmp, "b" + ext + ".clkseq")
+            assert sequence_file.main(["export", binary, text]) == 0
+            assert sequence_file.main(["import", text, again]) == 0
+            with SequenceFile(again) as sequence:
+                assert list(sequence) == events, f"{ext} roundtrip changed the events"
+        with open(os.path.join(tmp, "a.json")) as f:
+            # Small blocks force objects to straddle block boundaries
+            assert list(sequence_file.read_json(f, block_size=7)) == events
+    print("✓ JSON and CSV roundtrips preserve every click")
+
+
+def test_invalid_files():
+    """Test that non-sequence and truncated files are rejected."""
+    print("\nTesting invalid files...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bad.clkseq")
+        write_sequence(path, [(0, 1, 2, 1), (1, 2, 3, 1)])
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 1)
+        for content in (None, b"", b"not a sequence file at all"):
+            if content is not None:
+                with open(path, "wb") as f:
+                    f.write(content)
+            try:
+                SequenceFile(path).close()
+            except SequenceFormatError:
+                pass
+            else:
+                raise AssertionError(f"{content!r} should be rejected")
+    print("✓ Invalid files rejected")
+
+
+def main():
+    """Run all tests."""
+    print("=== Sequence File Test Suite ===")
+    try:
+        test_roundtrip_and_lazy_open()
+        test_save_recording()
+        test_text_roundtrip()
+        test_invalid_files()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the paged sequence view.
+Pages through synthetic recordings and sequence files; no display is
+required.
+"""
+
+import os
+import tempfile
+import time
+
+from click_recorder import ClickRecorder, button_code
+from sequence_file import SequenceFile, write_sequence
+from sequence_view import SequenceView, format_event, parse_region
+
+
+def make_recording(count, chunk_size=1000):
+    """A finished recording of count events cycling left, right and move."""
+    recorder = ClickRecorder(chunk_size=chunk_size)
+    buttons = [button_code("left"), button_code("right"), button_code("move")]
+    for i in range(count):
+        recorder.record(i % 500, i % 300, buttons[i % 3], t_ns=i)
+    recorder.finish()
+    return recorder
+
+
+def test_random_access():
+    """Test indexed reads from memory and from the spill file."""
+    print("Testing random access...")
+    small = make_recording(10, chunk_size=100)
+    large = make_recording(25_500)
+    try:
+        assert small[4] == (4, 4, 4, 3) and small.spilled == 0
+        assert large.spilled == 25_500
+        events = list(large)
+        for index in (0, 999, 1000, 12_345, 25_000, 25_499, -1):
+            assert large[index] == events[index], index
+        for index in (25_500, -25_501):
+            try:
+                large[index]
+            except IndexError:
+                pass
+            else:
+                raise AssertionError(f"index {index} should be out of range")
+        # Lookups do not disturb an iteration in progress
+        it = iter(large)
+        head = [next(it) for _ in range(1500)]
+        large[20_000]
+        assert head + list(it) == events
+    finally:
+        small.close()
+        large.close()
+    print("✓ Events read in place across full and partial spill blocks")
+
+
+def test_pages_and_jump():
+    """Test that pages and jumps read only the rows on screen."""
+    print("\nTesting pages and jumps...")
+    recorder = make_recording(50_000)
+    try:
+        view = SequenceView(recorder)
+        assert len(view) == 50_000 and not view.filtered
+        rows = view.rows(49_998, 8)
+        assert [i for i, _ in rows] == [49_998, 49_999]
+        assert format_event(*rows[0]) == "49999. Click at (498, 198) - left"
+        assert format_event(*view.rows(2, 1)[0]) == "3. Move to (2, 2)"
+        assert view.row_of(30_000) == 30_000 and view.row_of(10**9) == 49_999
+    finally:
+        recorder.close()
+
+    path = os.path.join(tempfile.mkdtemp(), "big.clkseq")
+    write_sequence(path, ((i, i % 7, i % 5, 1) for i in range(200_000)))
+    with SequenceFile(path) as sequence:
+        view = SequenceView(sequence)
+        start = time.perf_counter()
+        for top in range(0, 200_000, 2_000):
+            page = view.rows(top, 8)
+        per_page_ms = (time.perf_counter() - start) * 1000 / 100
+        assert page[0] == (198_000, (198_000, 198_000 % 7, 0, 1))
+        assert per_page_ms < 5, per_page_ms
+    print(f"✓ Pages anywhere in 200000 events, {per_page_ms:.3f} ms each")
+
+
+def test_filters():
+    """Test button and region filters built in batches."""
+    print("\nTesting filters...")
+    recorder = make_recording(30_000)
+    try:
+        view = SequenceView(recorder)
+        view.set_filter("right", parse_region("0, 0, 50, 50"))
+        assert len(view) == 0 and view.filtered
+        batches = 1
+        while not view.scan(limit=4_000):
+            batches += 1
+        assert batches == 8 and view.scanned == 30_000
+        expected = [i for i, (_, x, y, b) in enumerate(recorder) if b == 3 and x < 50 and y < 50]
+        assert [i for i, _ in view.rows(0, len(view))] == expected
+        assert view.row_of(expected[5] - 1) == 5
+        assert view.row_of(10**9) == len(view) - 1
+
+        view.set_filter("move")
+        view.scan(limit=10**9)
+        assert len(view) == 10_000 and all(b == 0 for _, (_, _, _, b) in view.rows(0, 100))
+        view.set_filter()
+        assert len(view) == 30_000 and not view.filtered
+    finally:
+        recorder.close()
+
+    for call, error in ((lambda: parse_region("1,2,3"), "Invalid region"),
+                        (lambda: parse_region("1,2,0,4"), "must be positive"),
+                        (lambda: SequenceView([]).set_filter("thumb"), "Unknown button")):
+        try:
+            call()
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{error} not raised")
+    assert parse_region("  ") is None
+    print("✓ Matches indexed a batch at a time; jumps land on the next match")
+
+
+def main():
+    """Run all tests."""
+    print("=== Sequence View Test Suite ===")
+    try:
+        test_random_access()
+        test_pages_and_jump()
+        test_filters()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for the session analyzer.
+Analyzes synthetic audit logs and sequence files in a temporary
+directory; no mouse or display is required. Skipped when NumPy is not
+installed.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from audit_log import AuditLog
+from sequence_file import write_sequence
+
+try:
+    import numpy as np
+    from session_analyzer import SessionAnalyzer, format_report, main as analyze
+except ImportError:
+    np = None
+
+MS = 1_000_000
+HOUR = 3600 * 1_000_000_000
+
+
+def have_numpy():
+    if np is None:
+        print("✗ NumPy not available; skipping")
+        return False
+    return True
+
+
+def write_records(path, clicker, scheduled, actual, latency=50_000):
+    """Append raw binary records for one clicker to an audit segment."""
+    records = np.zeros(len(actual), dtype=[("s", "<i8"), ("a", "<i8"), ("l", "<i8"), ("x", "<i4"),
+                                           ("y", "<i4"), ("c", "<u2"), ("k", "<u2")])
+    records["s"], records["a"], records["l"], records["c"], records["k"] = scheduled, actual, latency, clicker, 1
+    with open(path, "ab") as f:
+        f.write(records.tobytes())
+
+
+def empty_segment(clock_ns=0):
+    """A new binary audit segment whose header maps clock 0 near now."""
+    log = AuditLog(os.path.join(tempfile.mkdtemp(), "session.clkaud"), clock=lambda: clock_ns)
+    log.close()
+    return log.segment
+
+
+def test_percentiles_drift_and_stalls():
+    """Test chunked percentiles against exact ones, drift and stall detection."""
+    print("Testing percentiles, drift and stalls...")
+    if not have_numpy():
+        return
+    segment = empty_segment()
+    rng = np.random.default_rng(1)
+    count = 200_000
+    fast = np.arange(1, count + 1, dtype=np.int64) * 10 * MS
+    fast_late = rng.lognormal(12, 1, count).astype(np.int64)
+    fast_actual = fast + fast_late
+    fast_actual[150_000:] += 3 * 1_000_000_000  # one 3 s stall
+    slow = np.arange(1, count + 1, dtype=np.int64) * 1_000_000_000
+    slow_late = rng.integers(0, MS, count) + slow // (HOUR // (2 * MS))  # drifts 2 ms later per hour
+    write_records(segment, 0, fast, fast_actual)
+    write_records(segment, 1, slow, slow + slow_late, latency=rng.integers(10_000, 90_000, count))
+
+    analyzer = SessionAnalyzer(chunk=30_000)
+    analyzer.add_file(segment)
+    report = analyzer.report()
+    fast_report, slow_report = report["clickers"]
+    assert report["records"] == 2 * count and fast_report["clicks"] == count
+    for q in (50, 99):
+        exact = np.percentile(slow_late, q) / 1e6
+        assert abs(slow_report["lateness_ms"][f"p{q}"] - exact) <= 0.011 * exact, (q, exact, slow_report)
+    exact = np.percentile(np.diff(fast_actual), 50) / 1e6
+    assert abs(fast_report["interval_ms"]["p50"] - exact) <= 0.011 * exact
+    assert abs(slow_report["drift_ms_per_hour"] - 2) < 0.01, slow_report["drift_ms_per_hour"]
+    assert [round(s["interval_ms"]) for s in fast_report["stalls"]] == [3010], fast_report["stalls"]
+    assert slow_report["stalls"] == [] and slow_report["backend_latency_ms"]["max"] < 0.09
+    assert abs(slow_report["rate_per_s"] - 1) < 0.001
+    print(f"✓ p99 lateness {slow_report['lateness_ms']['p99']:.3f} ms (exact {np.percentile(slow_late, 99) / 1e6:.3f}); "
+          f"drift {slow_report['drift_ms_per_hour']:+.2f} ms/h; 1 stall found")
+
+
+def test_formats_and_segments():
+    """Test that binary and JSONL logs give the same report across segments."""
+    print("\nTesting formats and segments...")
+    if not have_numpy():
+        return
+    reports = []
+    for format in ("binary", "jsonl"):
+        path = os.path.join(tempfile.mkdtemp(), "clicks.clkaud")
+        # Every segment maps clock 0 to its wall time, so they stay one session
+        log = AuditLog(path, format=format, max_bytes=4000, flush_interval=0.005, clock=lambda: 0)
+        for k in range(1, 301):
+            log.record(k % 2, k * 20 * MS, k * 20 * MS + k * 1000, 3, 4, 20_000, 1 + k % 3)
+            if k % 50 == 0:
+                deadline = time.monotonic() + 2
+                while log.records < k and time.monotonic() < deadline:
+                    time.sleep(0.002)
+        log.close()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert analyze([path, "--json", "--chunk", "64"]) == 0
+        reports.append(json.loads(out.getvalue()))
+    binary, jsonl = reports
+    for report in reports:
+        for clicker in report["clickers"]:
+            clicker["drift_ms_per_hour"] = round(clicker["drift_ms_per_hour"], 6)
+    assert binary["files"] > 1 and binary["records"] == 300
+    assert binary["clickers"] == jsonl["clickers"]
+    assert [c["clicks"] for c in binary["clickers"]] == [300, 300]
+    assert binary["sessions"] == 1 and abs(binary["clickers"][0]["interval_ms"]["p50"] - 40) <= 0.4
+    print(f"✓ Same report from {binary['files']} binary and {jsonl['files']} JSONL segments")
+
+
+def test_since_and_sequences():
+    """Test the --since window and reports on recorded sequences."""
+    print("\nTesting --since and sequence files...")
+    if not have_numpy():
+        return
+    segment = empty_segment(clock_ns=20 * HOUR)
+    times = np.arange(0, 20 * HOUR, HOUR // 60, dtype=np.int64)  # a click a minute for 20 hours
+    write_records(segment, 0, times, times + MS)
+    # Half a minute off the click grid, so the ms between writing and reading do not matter
+    recent = SessionAnalyzer(since_ns=time.time_ns() - 8 * HOUR - 30 * 1_000_000_000)
+    recent.add_file(segment)
+    assert recent.report()["clickers"][0]["events"] == 8 * 60, recent.report()["clickers"][0]["events"]
+
+    path = os.path.join(tempfile.mkdtemp(), "session.clkseq")
+    events = [(k * 100 * MS, k, k, 1 if k % 4 else 3) for k in range(400)]
+    events += [(60 * 1_000_000_000 + k * 100 * MS, k, k, 1) for k in range(100)]  # after a 20 s pause
+    events.insert(5, (450 * MS, 0, 0, 0))  # a move: not a click
+    write_sequence(path, events)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        assert analyze([path]) == 0
+    text = out.getvalue()
+    assert "left clicks: 400 clicks" in text and "right clicks: 100 clicks" in text, text
+    assert text.count("stall") == 1 and "stall    20100.0 ms ending 60.000 s" in text, text
+    with contextlib.redirect_stderr(io.StringIO()):
+        assert analyze([os.path.join(os.path.dirname(path), "missing.clkaud")]) == 2
+    print("✓ Only the last 8 hours counted; recordings reported per button with their pauses")
+
+
+def test_bounded_memory():
+    """Test that memory stays bounded by the chunk size, not the log size."""
+    print("\nTesting bounded memory...")
+    if not have_numpy():
+        return
+    segment = empty_segment()
+    count = 1_000_000
+    for clicker in range(4):
+        times = np.arange(1, count // 4 + 1, dtype=np.int64) * MS + clicker
+        write_records(segment, clicker, times, times + 1000)
+    size = os.path.getsize(segment)
+    analyzer = SessionAnalyzer(chunk=50_000)
+    tracemalloc.start()
+    start = time.perf_counter()
+    analyzer.add_file(segment)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(format_report(analyzer.report()).splitlines()[0])
+    assert peak < size / 4, (peak, size)
+    print(f"✓ {count} records ({size / 1e6:.0f} MB) in {elapsed:.2f} s with a {peak / 1e6:.1f} MB peak")
+
+
+def main():
+    """Run all tests."""
+    print("=== Session Analyzer Test Suite ===")
+    try:
+        test_percentiles_drift_and_stalls()
+        test_formats_and_segments()
+        test_since_and_sequences()
+        test_bounded_memory()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test script for screen triggers.
+Paints a fake backend's screen; no display is required. Image trigger
+tests are skipped when NumPy is not installed.
+"""
+
+import time
+
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED, ClickerEngine
+from triggers import MAX_POLL_S, ImageTrigger, PixelTrigger, build_trigger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def have_numpy():
+    if np is None:
+        print("✗ NumPy not available; skipping")
+        return False
+    return True
+
+
+def make_template(seed, width=12, height=10):
+    """A random RGB template."""
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def paste(backend, x, y, rgb):
+    """Paste an RGB array onto a fake backend's screen."""
+    height, width = rgb.shape[:2]
+    bgrx = np.zeros((height, width, 4), dtype=np.uint8)
+    bgrx[:, :, :3] = rgb[:, :, ::-1]
+    backend.paste(x, y, width, height, bgrx.tobytes())
+
+
+def test_match_and_edges():
+    """Test matching inside the region and that only rising edges fire."""
+    print("Testing matching and rising edges...")
+    if not have_numpy():
+        return
+    backend = FakeBackend()
+    template = make_template(1)
+    trigger = ImageTrigger(template, (250, 150, 200, 150))
+    assert trigger.poll(backend) is None
+
+    paste(backend, 300, 200, template)
+    x, y, _ = trigger.poll(backend)
+    assert (x, y) == (306, 205), (x, y)
+    backend.fill(260, 160, 5, 5, (255, 0, 0))  # change elsewhere; still matching
+    assert trigger.poll(backend) is None
+
+    backend.fill(300, 200, 12, 10, (0, 0, 0))
+    assert trigger.poll(backend) is None
+    noisy = np.clip(template.astype(int) + np.random.default_rng(2).integers(-8, 9, template.shape), 0, 255)
+    paste(backend, 420, 270, noisy.astype(np.uint8))
+    x, y, _ = trigger.poll(backend)
+    assert (x, y) == (426, 275), (x, y)
+
+    backend.fill(420, 270, 12, 10, (0, 0, 0))
+    paste(backend, 300, 200, make_template(3))
+    paste(backend, 100, 100, template)  # outside the region
+    assert trigger.poll(backend) is None
+    assert trigger.matches == 2
+    print("✓ Matches found at the template centre, once per appearance")
+
+
+def test_back_off():
+    """Test that an unchanged region is not re-checked and slows polling."""
+    print("\nTesting poll back-off...")
+    if not have_numpy():
+        return
+    backend = FakeBackend()
+    trigger = build_trigger({"type": "image", "template": make_template(1), "region": [0, 0, 100, 100],
+                             "poll": 0.01})
+    for _ in range(20):
+        trigger.poll(backend)
+    assert trigger.checks == 1 and trigger.interval == MAX_POLL_S, trigger.stats()
+    backend.fill(10, 10, 1, 1, (1, 2, 3))
+    trigger.poll(backend)
+    assert trigger.checks == 2 and trigger.interval == 0.01
+    print(f"✓ 20 polls, 1 check; interval backed off to {MAX_POLL_S * 1000:.0f} ms and reset on change")
+
+
+def test_engine():
+    """Test that an attached trigger fires its clicker instead of the timer."""
+    print("\nTesting engine integration...")
+    if not have_numpy():
+        return
+    backend = FakeBackend()
+    engine = ClickerEngine(lambda: backend)
+    template = make_template(4)
+    engine.add_clicker("Watch", 1)
+    engine.add_clicker("Fixed", 1, x=5, y=6, mode=MODE_FIXED)
+    engine.attach_trigger(0, ImageTrigger(template, (0, 0, 200, 200), min_interval=0.002))
+    engine.attach_trigger(1, ImageTrigger(template, (300, 300, 100, 100), min_interval=0.002))
+    try:
+        engine.start(0)
+        engine.start(1)
+        time.sleep(0.05)
+        assert not backend.clicks()
+        paste(backend, 50, 60, template)
+        paste(backend, 320, 330, template)
+        deadline = time.monotonic() + 2
+        while len(backend.clicks()) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        time.sleep(0.05)
+    finally:
+        engine.shutdown()
+    assert sorted((x, y) for _, x, y, _ in backend.clicks()) == [(5, 6), (56, 65)], backend.clicks()
+    rows = [engine.table.row(i) for i in range(2)]
+    assert [row["fires"] for row in rows] == [1, 1]
+    assert all(0 <= row["max_lateness_ms"] < 50 for row in rows), rows
+    print(f"✓ Clicked on detection; detection-to-click {rows[0]['max_lateness_ms']:.3f} ms")
+
+
+def test_throughput():
+    """Test checks per second on a changing 200x150 region."""
+    print("\nTesting check throughput...")
+    if not have_numpy():
+        return
+    rng = np.random.default_rng(5)
+    frames = [rng.integers(0, 256, (150, 200, 4), dtype=np.uint8).tobytes() for _ in range(2)]
+    trigger = ImageTrigger(make_template(6, 24, 24), (0, 0, 200, 150))
+
+    class Frames:
+        i = 0
+
+        def grab(self, x, y, width, height):
+            self.i += 1
+            return width, height, frames[self.i % 2]
+
+    backend = Frames()
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.5:
+        trigger.poll(backend)
+    rate = trigger.checks / (time.perf_counter() - start)
+    assert rate >= 30, f"{rate:.0f} checks/s"
+    print(f"✓ {rate:.0f} checks/s, {trigger.stats()['mean_check_ms']:.2f} ms per check")
+
+
+class CountingBackend(FakeBackend):
+    """Fake backend that counts grab requests."""
+
+    grabs = 0
+
+    def grab(self, x, y, width, height):
+        self.grabs += 1
+        return FakeBackend.grab(self, x, y, width, height)
+
+
+def test_pixel_watch():
+    """Test pixel and box colour conditions, read with one grab per poll."""
+    print("\nTesting pixel watch...")
+    backend = CountingBackend()
+    trigger = PixelTrigger([(10, 10), (14, 12), (20, 10, 4, 4)], "#00ff00", tolerance=10)
+    assert trigger.region == (10, 10, 14, 4)
+    assert trigger.poll(backend) is None
+    backend.fill(14, 12, 1, 1, (5, 250, 0))
+    assert trigger.poll(backend)[:2] == (14, 12)
+    assert trigger.poll(backend) is None  # still green: no new edge
+    backend.fill(14, 12, 1, 1, (0, 0, 0))
+    backend.fill(20, 10, 4, 2, (0, 255, 0))  # half the box: mean is not green
+    assert trigger.poll(backend) is None
+    backend.fill(20, 12, 4, 2, (0, 255, 0))
+    assert trigger.poll(backend)[:2] == (22, 12)
+    assert backend.grabs == trigger.polls == 5
+
+    every = build_trigger({"type": "pixel", "pixels": [[10, 10], [14, 12]], "color": [0, 255, 0],
+                           "match": "all"})
+    backend.fill(10, 10, 1, 1, (0, 255, 0))
+    assert every.poll(backend) is None
+    backend.fill(14, 12, 1, 1, (0, 255, 0))
+    assert every.poll(backend)[:2] == (10, 10)
+    for spec, error in (({"pixels": [[1, 2]], "color": "green"}, "Invalid colour"),
+                        ({"pixels": [[1, 2]], "color": "#00ff00", "match": "most"}, "Invalid match mode"),
+                        ({"pixels": [], "color": "#00ff00"}, "Pixels must be")):
+        try:
+            build_trigger(dict(spec, type="pixel"))
+        except ValueError as e:
+            assert error in str(e), e
+        else:
+            raise AssertionError(f"{spec} should have been rejected")
+    print("✓ Three watches read with one grab per poll; any/all and box means honoured")
+
+
+def test_pixel_latency():
+    """Test detection-to-click latency of a pixel-triggered clicker."""
+    print("\nTesting pixel trigger latency...")
+    backend = FakeBackend()
+    engine = ClickerEngine(lambda: backend)
+    engine.add_clicker("Watch", 1)
+    engine.attach_trigger(0, PixelTrigger([(100, 100)], "#ff0000", min_interval=0.001))
+    changes = []
+    try:
+        engine.start(0)
+        for _ in range(20):
+            time.sleep(0.01)
+            changes.append(time.monotonic_ns())
+            backend.fill(100, 100, 1, 1, (255, 0, 0))
+            deadline = time.monotonic() + 1
+            while len(backend.clicks()) < len(changes) and time.monotonic() < deadline:
+                time.sleep(0.0005)
+            backend.fill(100, 100, 1, 1, (0, 0, 0))
+    finally:
+        engine.shutdown()
+    clicks = backend.clicks()
+    assert len(clicks) == 20, len(clicks)
+    row = engine.table.row(0)
+    to_click = sorted((t - changed) / 1e6 for (t, _, _, _), changed in zip(clicks, changes))
+    assert row["max_lateness_ms"] < to_click[-1], (row, to_click)
+    print(f"✓ Detection-to-click mean {row['mean_lateness_ms']:.3f} ms; "
+          f"change-to-click median {to_click[10]:.2f} ms")
+
+
+def main():
+    """Run all tests."""
+    print("=== Trigger Test Suite ===")
+    try:
+        test_match_and_edges()
+        test_back_off()
+        test_engine()
+        test_throughput()
+        test_pixel_watch()
+        test_pixel_latency()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for simulated time.
+Runs long schedules and playbacks on a VirtualClock against the fake
+backend; no mouse, display or real waiting is required.
+"""
+
+import time
+
+from autoclicker import run_headless
+from click_backends import FakeBackend
+from clicker_engine import MODE_FIXED
+from playback import SequencePlayer
+from scheduler import NS_PER_SECOND, VirtualClock
+from virtual_engine import virtual_engine
+
+DAY_NS = 24 * 3600 * NS_PER_SECOND
+
+
+def test_day_schedule():
+    """Test a 24-hour, multi-clicker schedule against exact click counts."""
+    print("Testing 24-hour schedule...")
+    engine, backend, clock = virtual_engine()
+    intervals = (1, 7, 60, 3600)
+    for i, interval in enumerate(intervals):
+        engine.add_clicker(f"clicker{i}", interval, offset=0.5 if i == 1 else 0, x=i, y=i, mode=MODE_FIXED)
+        engine.start(i)
+    wall = time.perf_counter()
+    fired = engine.scheduler.run_until(DAY_NS)
+    wall = time.perf_counter() - wall
+
+    # A clicker first fires one interval (plus offset) after the start
+    expected = [86400, (86400 - 0.5) // 7, 1440, 24]
+    assert [engine.table.fires[i] for i in range(len(intervals))] == expected
+    assert fired == len(backend.clicks()) == sum(expected)
+    assert all(engine.table.max_lateness_ns[i] == 0 for i in range(len(intervals)))
+    last = [e for e in backend.clicks() if e[1] == 3][-1]
+    assert last[0] == DAY_NS, f"Hourly clicker last fired at {last[0]}"
+    print(f"✓ {fired} clicks over 24 h simulated in {wall:.2f} s")
+
+
+def test_long_playback():
+    """Test that a 100k-click playback lands every click on its offset."""
+    print("\nTesting 100k-click playback...")
+    sequence = [(i * 3_000_000, i % 640, i % 480, 1) for i in range(100_000)]
+    clock = VirtualClock(start_ns=5 * NS_PER_SECOND)
+    backend = FakeBackend(clock)
+    player = SequencePlayer(sequence, lambda x, y, button: backend.click(x, y, "left"),
+                            speed=2, repeat=2, repeat_interval=1, clock=clock)
+    wall = time.perf_counter()
+    reports = player.run()
+    wall = time.perf_counter() - wall
+
+    clicks = backend.clicks()
+    assert len(clicks) == 200_000 and len(reports) == 2
+    replay_ns = 99_999 * 1_500_000
+    for replay in range(2):
+        start = 5 * NS_PER_SECOND + replay * (replay_ns + NS_PER_SECOND)
+        for i in (0, 1, 50_000, 99_999):
+            t_ns, x, y, _ = clicks[replay * 100_000 + i]
+            assert (t_ns, x, y) == (start + i * 1_500_000, i % 640, i % 480), clicks[replay * 100_000 + i]
+    assert all(report.max_lateness_ns == 0 for report in reports)
+    print(f"✓ 200000 clicks played exactly in {wall:.2f} s")
+
+
+def test_headless_virtual():
+    """Test that headless mode runs its whole duration on a virtual clock."""
+    print("\nTesting headless mode on a virtual clock...")
+    clock = VirtualClock()
+    backend = FakeBackend(clock, position=(7, 8))
+    config = {"clickers": [{"interval": 2}, {"interval": 0.01, "x": 5, "y": 5}],
+              "duration": 3600, "quiet": True}
+    summary = run_headless(config, backend=backend, clock=clock)
+    fires = [c["fires"] for c in summary["clickers"]]
+    # Both clickers fire immediately, then once per interval
+    assert fires == [1801, 360_001], f"Unexpected fires {fires}"
+    assert summary["first_click_ms"] == 0
+    assert backend.clicks()[0] == (0, 7, 8, "left")
+    print(f"✓ One simulated hour: {fires[0]} + {fires[1]} clicks")
+
+
+def main():
+    """Run all tests."""
+    print("=== Virtual Time Test Suite ===")
+    try:
+        test_day_schedule()
+        test_long_playback()
+        test_headless_virtual()
+        print("\n=== All Tests Passed! ===")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Screen Triggers
+Clickers that fire when something appears on screen instead of on a timer.
+
+A trigger polls a small screen region through the click backend's grab()
+on its own thread, so the click scheduler never waits on the display. It
+reports rising edges only (a match after a poll without one) and adapts
+its poll rate: while the region's pixels do not change the check is
+skipped and the interval backs off towards max_interval; any change
+brings it straight back to min_interval.
+
+ImageTrigger needs NumPy, which is imported when one is created;
+PixelTrigger reads a few bytes of the grab and needs nothing extra.
+"""
+
+import threading
+import time
+
+# Poll interval bounds (seconds) and back-off factor while the region is unchanged
+MIN_POLL_S = 1 / 60
+MAX_POLL_S = 0.2
+POLL_BACKOFF = 1.5
+
+# Pixel triggers grab a few bytes, so they poll faster and back off less
+PIXEL_POLL_S = 0.005
+PIXEL_MAX_POLL_S = 0.02
+
+# Template pixels compared at every candidate position before a full check
+PROBE_PIXELS = 12
+# Candidates that survive the probes and get a full comparison
+MAX_VERIFY = 64
+
+
+class Trigger:
+    """Polls a screen region and calls on_match(x, y, detected_ns) on each rising edge.
+
+    region is (x, y, width, height) in screen pixels. Subclasses implement
+    check(width, height, data), returning the screen (x, y) to click or
+    None.
+    """
+
+    kind = "base"
+
+    def __init__(self, region, min_interval=MIN_POLL_S, max_interval=MAX_POLL_S, clock=time.monotonic_ns):
+        self.region = tuple(int(v) for v in region)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.clock = clock
+        self.interval = min_interval
+        self.checks = 0
+        self.polls = 0
+        self.matches = 0
+        self.check_ns = 0
+        self._last_data = None
+        self._last_result = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def check(self, width, height, data):
+        """Return the screen (x, y) to click when the grabbed region matches, else None."""
+        raise NotImplementedError
+
+    def poll(self, backend):
+        """Grab and check once; returns (x, y, detected_ns) on a rising edge, else None."""
+        self.polls += 1
+        width, height, data = backend.grab(*self.region)
+        if data == self._last_data:
+            # Nothing changed, so neither did the result
+            self.interval = min(self.interval * POLL_BACKOFF, self.max_interval)
+            return None
+        self.interval = self.min_interval
+        start = time.perf_counter_ns()
+        result = self.check(width, height, data)
+        self.check_ns += time.perf_counter_ns() - start
+        self.checks += 1
+        was_matched = self._last_result is not None
+        self._last_data, self._last_result = data, result
+        if result is None or was_matched:
+            return None
+        self.matches += 1
+        return result[0], result[1], self.clock()
+
+    def reset(self):
+        """Forget the last frame so the next match fires again."""
+        self._last_data = self._last_result = None
+        self.interval = self.min_interval
+
+    def start(self, get_backend, on_match):
+        """Start polling on a background thread."""
+        self.stop()
+        self.reset()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(get_backend, on_match, self._stop_event),
+                                        name=f"{self.kind}-trigger", daemon=True)
+        self._thread.start()
+
+    def is_running(self):
+        """True while the polling thread runs."""
+        return self._thread is not None
+
+    def stop(self):
+        """Stop polling without waiting: the thread exits at its next wait.
+
+        A check in progress finishes but no longer calls on_match.
+        """
+        self._stop_event.set()
+        self._thread = None
+
+    def _run(self, get_backend, on_match, stop_event):
+        backend = get_backend()
+        next_poll = time.monotonic()
+        while not stop_event.is_set():
+            try:
+                match = self.poll(backend)
+                if match is not None and not stop_event.is_set():
+                    on_match(*match)
+            except Exception as e:
+                print(f"{self.kind} trigger failed: {e}")
+                self.interval = self.max_interval
+            # Poll on a fixed grid so slow checks do not stretch the interval
+            next_poll += self.interval
+            now = time.monotonic()
+            if next_poll < now:
+                next_poll = now
+            stop_event.wait(next_poll - now)
+
+    def stats(self):
+        """Poll, check and match counts with the mean check time."""
+        return {
+            "kind": self.kind,
+            "polls": self.polls,
+            "checks": self.checks,
+            "matches": self.matches,
+            "mean_check_ms": self.check_ns / self.checks / 1e6 if self.checks else 0.0,
+            "interval_ms": self.interval * 1000,
+        }
+
+
+def bgr_frame(np, width, height, data):
+    """View BGRX bytes as a (height, width, 3) uint8 BGR array without copying."""
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)[:, :, :3]
+
+
+def load_template(np, template):
+    """A template as an (h, w, 3) BGR uint8 array.
+
+    Accepts an RGB array, a .npy file of one, or any image file Pillow
+    can read.
+    """
+    if isinstance(template, str):
+        if template.endswith(".npy"):
+            template = np.load(template)
+        else:
+            from PIL import Image
+            with Image.open(template) as image:
+                template = np.asarray(image.convert("RGB"))
+    template = np.asarray(template, dtype=np.uint8)
+    if template.ndim != 3 or template.shape[2] < 3:
+        raise ValueError("Template must be an RGB image")
+    return np.ascontiguousarray(template[:, :, 2::-1])
+
+
+class ImageTrigger(Trigger):
+    """Fires when a template image appears inside the region; clicks its centre.
+
+    The template is prepared once: a few of its most distinctive pixels
+    are picked as probes. Each check tests every candidate position
+    against one probe at a time with whole-array NumPy comparisons and
+    stops as soon as no candidate is left, so frames without the
+    template are rejected after one or two probes. Surviving positions
+    get a full comparison: a match needs every probe channel within
+    `tolerance` and a mean absolute difference of at most tolerance / 2.
+    """
+
+    kind = "image"
+
+    def __init__(self, template, region, tolerance=24, **options):
+        import numpy as np
+        Trigger.__init__(self, region, **options)
+        self._np = np
+        self.template = load_template(np, template)
+        self.tolerance = tolerance
+        h, w = self.template.shape[:2]
+        if h > self.region[3] or w > self.region[2]:
+            raise ValueError("Template is larger than the trigger region")
+        self._template16 = self.template.astype(np.int16)
+        # Probes: the pixels that differ most from the template's mean colour
+        deviation = np.abs(self._template16 - self._template16.reshape(-1, 3).mean(axis=0)).sum(axis=2)
+        order = np.argsort(deviation, axis=None)[::-1][:PROBE_PIXELS]
+        self._probes = [(int(i // w), int(i % w), self._template16[i // w, i % w]) for i in order]
+
+    def find(self, frame):
+        """Best (x, y) of the template inside a BGR frame, relative to the frame, or None."""
+        np = self._np
+        h, w = self.template.shape[:2]
+        rows, cols = frame.shape[0] - h + 1, frame.shape[1] - w + 1
+        if rows <= 0 or cols <= 0:
+            return None
+        frame16 = frame.astype(np.int16)
+        tolerance = self.tolerance
+        candidates = None
+        for py, px, color in self._probes:
+            close = (np.abs(frame16[py:py + rows, px:px + cols] - color) <= tolerance).all(axis=2)
+            candidates = close if candidates is None else candidates & close
+            if not candidates.any():
+                return None
+        best, best_score = None, tolerance / 2
+        ys, xs = np.nonzero(candidates)
+        for y, x in zip(ys[:MAX_VERIFY], xs[:MAX_VERIFY]):
+            score = np.abs(frame16[y:y + h, x:x + w] - self._template16).mean()
+            if score <= best_score:
+                best, best_score = (int(x), int(y)), score
+        return best
+
+    def check(self, width, height, data):
+        """Screen coordinates of the template's centre when it is visible."""
+        found = self.find(bgr_frame(self._np, width, height, data))
+        if found is None:
+            return None
+        h, w = self.template.shape[:2]
+        return self.region[0] + found[0] + w // 2, self.region[1] + found[1] + h // 2
+
+
+def parse_color(color):
+    """An (r, g, b) tuple from "#rrggbb" or a sequence of three ints."""
+    if isinstance(color, str):
+        text = color.lstrip("#")
+        if len(text) != 6:
+            raise ValueError(f"Invalid colour: {color!r}")
+        try:
+            return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+        except ValueError:
+            raise ValueError(f"Invalid colour: {color!r}") from None
+    rgb = tuple(int(v) for v in color)
+    if len(rgb) != 3 or not all(0 <= v <= 255 for v in rgb):
+        raise ValueError(f"Invalid colour: {color!r}")
+    return rgb
+
+
+class PixelTrigger(Trigger):
+    """Fires when watched pixels or small boxes turn a colour.
+
+    Each watch is (x, y) or a box (x, y, width, height); a box compares
+    its mean colour. Every poll grabs the bounding box of all watches in
+    one request, so keep the watches close together. match is "any"
+    (click the first watch that matches) or "all" (click the first watch
+    once every one matches). A channel may differ by up to `tolerance`.
+    """
+
+    kind = "pixel"
+
+    def __init__(self, pixels, color, tolerance=16, match="any",
+                 min_interval=PIXEL_POLL_S, max_interval=PIXEL_MAX_POLL_S, **options):
+        if match not in ("any", "all"):
+            raise ValueError(f"Invalid match mode: {match!r} (choose from any, all)")
+        watches = [tuple(int(v) for v in pixel) + (1, 1) if len(pixel) == 2 else tuple(int(v) for v in pixel)
+                   for pixel in pixels]
+        if not watches or any(len(w) != 4 or w[2] < 1 or w[3] < 1 for w in watches):
+            raise ValueError("Pixels must be (x, y) or (x, y, width, height)")
+        left, top = min(w[0] for w in watches), min(w[1] for w in watches)
+        right = max(w[0] + w[2] for w in watches)
+        bottom = max(w[1] + w[3] for w in watches)
+        Trigger.__init__(self, (left, top, right - left, bottom - top),
+                         min_interval=min_interval, max_interval=max_interval, **options)
+        self.watches = watches
+        self.color = parse_color(color)
+        self.tolerance = tolerance
+        self.match = match
+        # Per watch: byte offsets of its rows in the grab, its row length in
+        # bytes, its pixel count and where to click
+        stride = self.region[2] * 4
+        self._layout = [([(y - top + row) * stride + (x - left) * 4 for row in range(h)], w * 4, w * h,
+                         (x + w // 2, y + h // 2))
+                        for x, y, w, h in watches]
+
+    def _matches(self, data, rows, row_bytes, count):
+        r, g, b = self.color
+        tolerance = self.tolerance
+        if count == 1:
+            o = rows[0]
+            return (abs(data[o + 2] - r) <= tolerance and abs(data[o + 1] - g) <= tolerance
+                    and abs(data[o] - b) <= tolerance)
+        sums = [0, 0, 0]
+        for o in rows:
+            for channel in range(3):
+                sums[channel] += sum(data[o + channel:o + row_bytes:4])
+        return (abs(sums[2] / count - r) <= tolerance and abs(sums[1] / count - g) <= tolerance
+                and abs(sums[0] / count - b) <= tolerance)
+
+    def check(self, width, height, data):
+        """Screen coordinates of the watch to click when the colour condition holds."""
+        target = None
+        for rows, row_bytes, count, centre in self._layout:
+            if self._matches(data, rows, row_bytes, count):
+                if self.match == "any":
+                    return centre
+                target = target or centre
+            elif self.match == "all":
+                return None
+        return target
+
+
+TRIGGERS = {
+    "image": ImageTrigger,
+    "pixel": PixelTrigger,
+}
+
+
+def build_trigger(spec):
+    """Create a trigger from a config dict such as
+    {"type": "image", "template": "ok.png", "region": [x, y, w, h]} or
+    {"type": "pixel", "pixels": [[x, y]], "color": "#00ff00"}.
+    """
+    spec = dict(spec)
+    kind = spec.pop("type", None)
+    if kind not in TRIGGERS:
+        raise ValueError(f"Unknown trigger type: {kind!r} (choose from {', '.join(TRIGGERS)})")
+    if "poll" in spec:
+        spec["min_interval"] = spec.pop("poll")
+    return TRIGGERS[kind](**spec)
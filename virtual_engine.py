@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Virtual Engine
+A ClickerEngine on a manual scheduler, a VirtualClock and a fake backend,
+for tests that simulate clicking without a display. Nothing fires until
+engine.scheduler.run_until() moves the clock.
+"""
+
+from click_backends import FakeBackend
+from clicker_engine import ClickerEngine
+from scheduler import ClickScheduler, VirtualClock
+
+
+def virtual_engine(on_click=None, backend_class=FakeBackend, **backend_options):
+    """(engine, backend, clock) sharing one VirtualClock."""
+    clock = VirtualClock()
+    backend = backend_class(clock, **backend_options)
+    engine = ClickerEngine(lambda: backend, on_click=on_click,
+                           scheduler=ClickScheduler(clock=clock, manual=True))
+    return engine, backend, clock